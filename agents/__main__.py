@@ -38,6 +38,20 @@ async def run_caller():
     run_server()
 
 
+def run_hub():
+    """Run the shared event hub for co-located agents"""
+    from agents.src.shared.event_hub import run_hub as serve
+    logger.info("📡 Starting event hub...")
+    serve()
+
+
+def run_indexer():
+    """Run the local order-book indexer"""
+    from agents.src.shared.indexer import run_indexer as serve
+    logger.info("📚 Starting order-book indexer...")
+    serve()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Archive Protocol Agent Runner",
@@ -47,13 +61,15 @@ Examples:
   python -m agents manager   # Run Manager Agent
   python -m agents scraper   # Run Scraper Agent  
   python -m agents caller    # Run Caller Agent
+  python -m agents hub       # Run the shared event hub (agents opt in with EVENT_SOURCE=hub)
+  python -m agents indexer   # Run the local SQLite order-book indexer
   python -m agents all       # Run all agents (requires multiple processes)
         """
     )
     
     parser.add_argument(
         "agent",
-        choices=["manager", "scraper", "caller", "all"],
+        choices=["manager", "scraper", "caller", "hub", "indexer", "all"],
         help="Which agent to run"
     )
     
@@ -81,10 +97,20 @@ Examples:
         asyncio.run(run_scraper())
     elif args.agent == "caller":
         asyncio.run(run_caller())
+    elif args.agent == "hub":
+        run_hub()
+    elif args.agent == "indexer":
+        run_indexer()
     elif args.agent == "all":
         print("""
 To run all agents, use separate terminal windows:
 
+Terminal 0 (optional, one RPC poller for all agents with EVENT_SOURCE=hub):
+  python -m agents hub
+
+Terminal 0b (optional, local order-book queries instead of RPC reads):
+  python -m agents indexer
+
 Terminal 1:
   python -m agents manager
 
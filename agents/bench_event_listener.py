@@ -0,0 +1,217 @@
+"""
+Event Listener Latency Benchmark
+
+Measures A2A endpoint latency (p50/p99) while the event listener is busy
+polling a slow RPC node, comparing the AsyncWeb3 listener against the old
+blocking Web3(HTTPProvider) polling style.
+
+Both the A2A server and the listener share one event loop, exactly like the
+agent servers in src/*/server.py. A local fake JSON-RPC node adds a fixed
+delay to every call so the effect of blocking RPC is visible.
+
+Usage:
+    python bench_event_listener.py --requests 200 --rpc-delay 0.2
+"""
+
+import os
+import sys
+import time
+import json
+import socket
+import asyncio
+import argparse
+import threading
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from web3 import Web3
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ==============================================================================
+# FAKE RPC NODE
+# ==============================================================================
+
+def build_fake_rpc(delay: float) -> FastAPI:
+    """JSON-RPC node that answers after `delay` seconds and mines a block per call"""
+    app = FastAPI()
+    state = {"block": 1000}
+
+    @app.post("/")
+    async def rpc(request: Request):
+        body = await request.json()
+        await asyncio.sleep(delay)
+        method = body.get("method")
+        if method == "eth_blockNumber":
+            state["block"] += 1
+            result = hex(state["block"])
+        elif method == "eth_getBlockByNumber":
+            if body["params"][0] == "latest":
+                state["block"] += 1
+                number = state["block"]
+            else:
+                number = int(body["params"][0], 16)
+            result = {
+                "number": hex(number),
+                "hash": "0x" + number.to_bytes(32, "big").hex(),
+                "parentHash": "0x" + (number - 1).to_bytes(32, "big").hex(),
+            }
+        elif method == "eth_chainId":
+            result = hex(12227332)
+        elif method == "eth_getLogs":
+            result = []
+        else:
+            result = None
+        return {"jsonrpc": "2.0", "id": body.get("id"), "result": result}
+
+    return app
+
+
+def run_in_thread(app: FastAPI, port: int) -> uvicorn.Server:
+    """Run a uvicorn server on its own thread and event loop"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+# ==============================================================================
+# A2A SERVER
+# ==============================================================================
+
+def build_a2a_app() -> FastAPI:
+    """Minimal A2A server answering PING like the agent servers do"""
+    from agents.src.shared.a2a import A2AMessage, A2AMethod, create_success_response
+
+    app = FastAPI()
+
+    @app.post("/v1/rpc")
+    async def handle(request: Request):
+        message = A2AMessage(**(await request.json()))
+        if message.method == A2AMethod.PING.value:
+            return create_success_response(message.id, {"status": "ok", "agent": "bench"})
+        return create_success_response(message.id, {})
+
+    return app
+
+
+class BlockingPoller:
+    """The previous listener style: synchronous Web3 calls inside a coroutine"""
+
+    def __init__(self, rpc_url: str, order_book: str, poll_interval: float):
+        self._w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self._order_book = order_book
+        self.poll_interval = poll_interval
+        self._running = False
+
+    async def start(self):
+        self._running = True
+        while self._running:
+            current_block = self._w3.eth.block_number
+            for _ in range(4):  # one get_logs per event type
+                self._w3.eth.get_logs({
+                    "address": self._order_book,
+                    "fromBlock": current_block,
+                    "toBlock": current_block,
+                })
+            await asyncio.sleep(self.poll_interval)
+
+    def stop(self):
+        self._running = False
+
+
+def measure(url: str, count: int) -> list[float]:
+    """Send sequential PINGs and return per-request latency in milliseconds"""
+    latencies = []
+    with httpx.Client(timeout=30.0) as client:
+        for i in range(count):
+            payload = {"jsonrpc": "2.0", "id": i, "method": "ping", "params": {}}
+            start = time.perf_counter()
+            client.post(url, content=json.dumps(payload), headers={"Content-Type": "application/json"})
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(mode: str, rpc_url: str, count: int, poll_interval: float) -> list[float]:
+    """Serve A2A and run one listener flavour on the same loop, then load it"""
+    from agents.src.shared.events import EventListener
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(build_a2a_app(), host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    listener = None
+    if mode == "async":
+        listener = EventListener(poll_interval=poll_interval, confirmations=0)
+        for register in (
+            listener.on_job_posted,
+            listener.on_bid_placed,
+            listener.on_bid_accepted,
+            listener.on_delivery_submitted,
+        ):
+            register(_noop)
+    elif mode == "blocking":
+        listener = BlockingPoller(rpc_url, os.environ["ORDERBOOK_ADDRESS"], poll_interval)
+
+    listener_task = asyncio.create_task(listener.start()) if listener else None
+    await asyncio.sleep(0.5)
+
+    latencies = await asyncio.to_thread(measure, f"http://127.0.0.1:{port}/v1/rpc", count)
+
+    if listener:
+        listener.stop()
+        listener_task.cancel()
+    server.should_exit = True
+    await server_task
+    return latencies
+
+
+async def _noop(_event):
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A2A latency while the event listener polls")
+    parser.add_argument("--requests", type=int, default=200, help="PING requests per mode")
+    parser.add_argument("--rpc-delay", type=float, default=0.2, help="Seconds the fake RPC takes per call")
+    parser.add_argument("--poll-interval", type=float, default=0.0, help="Listener sleep between polls")
+    args = parser.parse_args()
+
+    rpc_port = _free_port()
+    run_in_thread(build_fake_rpc(args.rpc_delay), rpc_port)
+    rpc_url = f"http://127.0.0.1:{rpc_port}"
+
+    # Config reads these at import time
+    os.environ["NEOX_RPC_URL"] = rpc_url
+    os.environ.setdefault("ORDERBOOK_ADDRESS", "0x" + "11" * 20)
+
+    print(f"📊 A2A PING latency, {args.requests} requests, RPC delay {args.rpc_delay * 1000:.0f} ms")
+    print(f"{'listener':<10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10}")
+    for mode in ("idle", "async", "blocking"):
+        latencies = asyncio.run(run_mode(mode, rpc_url, args.requests, args.poll_interval))
+        print(
+            f"{mode:<10} {statistics.median(latencies):>10.1f} "
+            f"{percentile(latencies, 99):>10.1f} {max(latencies):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,7 @@ except ImportError as e:
     SlotFiller = None
 
 from agents.src.shared.contracts import get_contracts, approve_usdc, post_job, get_bids_for_job, accept_bid, ContractInstances
+from agents.src.shared.indexer import get_order_book_index
 from neofs_helper import upload_object, download_object_json, parse_neofs_uri
 
 load_dotenv()
@@ -338,7 +339,7 @@ class ButlerCLI:
         
         while time.time() - start_time < timeout:
             try:
-                bids = get_bids_for_job(self.contracts, self.current_job_id)
+                bids = self._fetch_bids()
                 
                 if len(bids) > last_bid_count:
                     print(f"💰 Received {len(bids)} bid(s)...")
@@ -351,26 +352,42 @@ class ButlerCLI:
                 
         # Final check
         try:
-            bids = get_bids_for_job(self.contracts, self.current_job_id)
+            bids = self._fetch_bids()
             print(f"\n📊 Total bids received: {len(bids)}")
-            
-            formatted_bids = []
-            for bid in bids:
-                # Bid struct: (id, jobId, bidder, price, deliveryTime, reputation, metadataURI, responseURI, accepted, createdAt)
-                formatted_bids.append({
-                    "id": bid[0],
-                    "bidder": bid[2],
-                    "price": bid[3],
-                    "delivery_time": bid[4],
-                    "reputation": bid[5],
-                    "metadata_uri": bid[6]
-                })
-                
-            return formatted_bids
+            return bids
             
         except Exception as e:
             print(f"❌ Failed to fetch bids: {e}")
             return []
+    
+    def _fetch_bids(self) -> List[Dict[str, Any]]:
+        """Bids on the current job, from the local index when it is current"""
+        index = get_order_book_index()
+        if index:
+            return [
+                {
+                    "id": bid["bid_id"],
+                    "bidder": bid["bidder"],
+                    "price": bid["price"],
+                    "delivery_time": bid["delivery_time"],
+                    "reputation": bid["reputation"],
+                    "metadata_uri": bid["metadata_uri"]
+                }
+                for bid in index.bids_for_job(self.current_job_id)
+            ]
+        
+        # Bid struct: (id, jobId, bidder, price, deliveryTime, reputation, metadataURI, responseURI, accepted, createdAt)
+        return [
+            {
+                "id": bid[0],
+                "bidder": bid[2],
+                "price": bid[3],
+                "delivery_time": bid[4],
+                "reputation": bid[5],
+                "metadata_uri": bid[6]
+            }
+            for bid in get_bids_for_job(self.contracts, self.current_job_id)
+        ]
             
     def display_bids(self, bids: List[Dict[str, Any]]):
         """Display bids in a nice format"""
@@ -6,12 +6,17 @@ Includes job metadata handling and delivery verification.
 """
 
 import os
+import sys
 import json
 import hashlib
 import requests
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.src.shared.neofs_cache import get_neofs_cache
+
 load_dotenv()
 
 # NeoFS Configuration
@@ -95,28 +100,37 @@ def upload_object(
         return None
 
 
-def download_object(object_id: str) -> Optional[str]:
+def download_object(object_id: str, container_id: Optional[str] = None) -> Optional[str]:
     """
-    Download an object from NeoFS container.
+    Download an object from NeoFS container (served from the local cache when present).
     
     Args:
         object_id: The NeoFS object ID
+        container_id: Container holding the object (defaults to NEOFS_CONTAINER_ID)
         
     Returns:
         Object content as string, None if failed
     """
+    container_id = container_id or CONTAINER_ID
+    cache = get_neofs_cache()
+    cached = cache.get(container_id, object_id) if cache else None
+    if cached is not None:
+        return cached.decode("utf-8")
+    
     try:
         print(f"📥 Downloading from NeoFS: {object_id}")
         
         # Download object
         response = requests.get(
-            f"{NEOFS_REST_GATEWAY}/objects/{CONTAINER_ID}/{object_id}",
+            f"{NEOFS_REST_GATEWAY}/objects/{container_id}/{object_id}",
             timeout=30
         )
         
         if response.status_code == 200:
             content = response.text
             print(f"✅ Downloaded successfully! ({len(content)} bytes)")
+            if cache:
+                cache.put(container_id, object_id, response.content)
             return content
         else:
             print(f"❌ Download failed: HTTP {response.status_code}")
@@ -128,17 +142,18 @@ def download_object(object_id: str) -> Optional[str]:
         return None
 
 
-def download_object_json(object_id: str) -> Optional[Dict[str, Any]]:
+def download_object_json(object_id: str, container_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Download and parse JSON object from NeoFS.
     
     Args:
         object_id: The NeoFS object ID
+        container_id: Container holding the object (defaults to NEOFS_CONTAINER_ID)
         
     Returns:
         Parsed JSON dict, None if failed
     """
-    content = download_object(object_id)
+    content = download_object(object_id, container_id)
     if content:
         try:
             return json.loads(content)
@@ -302,7 +317,7 @@ def download_job_metadata(metadata_uri: str) -> Optional[Dict[str, Any]]:
         return None
     
     container_id, object_id = parsed
-    return download_object_json(object_id)
+    return download_object_json(object_id, container_id)
 
 
 def download_job_delivery(delivery_uri: str) -> Optional[Dict[str, Any]]:
@@ -321,7 +336,7 @@ def download_job_delivery(delivery_uri: str) -> Optional[Dict[str, Any]]:
         return None
     
     container_id, object_id = parsed
-    return download_object_json(object_id)
+    return download_object_json(object_id, container_id)
 
 
 # Test function
@@ -25,7 +25,8 @@ from agents.src.shared.contracts import (
     accept_bid,
     ContractInstances,
 )
-from agents.src.shared.neofs import NeoFSClient, NeoFSConfig, ObjectAttribute
+from agents.src.shared.neofs import NeoFSClient, ObjectAttribute, get_neofs_client, close_neofs_client
+from agents.src.shared.neofs_queue import start_upload_queue, stop_upload_queue
 from qdrant_client import QdrantClient
 from mem0 import MemoryClient
 
@@ -135,14 +136,20 @@ async def startup_event():
         if not neofs_container:
             print("⚠️ NEOFS_CONTAINER_ID not set. NeoFS uploads will be disabled.")
         else:
-            neofs_client = NeoFSClient(
-                NeoFSConfig(gateway_url=neofs_gateway, container_id=neofs_container)
-            )
+            neofs_client = get_neofs_client(neofs_gateway, neofs_container)
+            start_upload_queue()
             print(f"✅ NeoFS client ready (gateway {neofs_gateway}, container {neofs_container})")
     except Exception as e:
         print(f"⚠️ NeoFS client init failed: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Drain queued NeoFS uploads and release pooled connections."""
+    await stop_upload_queue()
+    await close_neofs_client()
+
+
 @app.get("/")
 async def root():
     return {"status": "Spoonos Butler API is running"}
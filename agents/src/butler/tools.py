@@ -19,8 +19,8 @@ from spoon_ai.tools.base import BaseTool
 from spoon_ai.tools import ToolManager
 
 # Import shared tools
-from ..shared.contracts import get_contracts, post_job, get_bids_for_job, accept_bid, get_job_status
-from ..shared.neofs import get_neofs_client
+from ..shared.contracts import get_contracts, post_job, get_bids_for_jobs, accept_bid, get_job_status, call_async
+from ..shared.neofs import ObjectAttribute, get_neofs_client
 from ..shared.slot_questioning import SlotFiller
 
 
@@ -258,26 +258,21 @@ class PostJobTool(BaseTool):
                 }
             }
             
-            # 2. Upload to NeoFS
+            # 2. Upload through the NeoFS queue; the URI goes on-chain, so wait for the real object ID
             print(f"📤 Uploading job metadata to NeoFS...")
-            metadata_json = json.dumps(metadata, indent=2)
-            
-            # Use NeoFS client to upload
-            from ..shared.neofs import upload_object
-            object_id = upload_object(
-                content=metadata_json,
-                attributes={
-                    "type": "job_metadata",
-                    "tool": tool,
-                    "poster": contracts.account.address
-                },
-                filename=f"job_{int(time.time())}.json"
+            queued = await neofs.upload_json(
+                metadata,
+                filename=f"job_{int(time.time())}.json",
+                additional_attributes=[
+                    ObjectAttribute(key="type", value="job_metadata"),
+                    ObjectAttribute(key="tool", value=tool),
+                    ObjectAttribute(key="poster", value=contracts.account.address),
+                ],
+                defer=True,
             )
+            upload = await queued.result()
             
-            if not object_id:
-                return json.dumps({"error": "Failed to upload metadata to NeoFS"})
-            
-            metadata_uri = f"neofs://{os.getenv('NEOFS_CONTAINER_ID')}/{object_id}"
+            metadata_uri = f"neofs://{upload.container_id}/{upload.object_id}"
             print(f"✅ Metadata uploaded: {metadata_uri}")
             
             # 3. Post to blockchain
@@ -316,6 +311,7 @@ class GetBidsTool(BaseTool):
     Retrieve all bids for a specific job.
     
     Use after posting a job to see which agents have bid.
+    Pass job_ids to poll several open jobs at once (one batched chain read).
     Returns: List of bids with prices, agents, and delivery times.
     """
     parameters: dict = {
@@ -324,39 +320,60 @@ class GetBidsTool(BaseTool):
             "job_id": {
                 "type": "integer",
                 "description": "The job ID"
+            },
+            "job_ids": {
+                "type": "array",
+                "items": {"type": "integer"},
+                "description": "Several job IDs to poll together"
             }
         },
-        "required": ["job_id"]
+        "required": []
     }
     
-    async def execute(self, job_id: int) -> str:
-        """Get bids for job"""
+    async def execute(self, job_id: Optional[int] = None, job_ids: Optional[List[int]] = None) -> str:
+        """Get bids for one or more jobs"""
         try:
-            contracts = get_contracts(os.getenv("NEOX_PRIVATE_KEY"))
-            bids = get_bids_for_job(contracts, job_id)
+            ids = list(job_ids or [])
+            if job_id is not None and job_id not in ids:
+                ids.insert(0, job_id)
+            if not ids:
+                return json.dumps({"error": "job_id or job_ids is required"})
             
-            formatted_bids = []
-            for bid in bids:
-                # Bid: (id, jobId, bidder, price, deliveryTime, reputation, metadataURI, responseURI, accepted, createdAt)
-                formatted_bids.append({
-                    "bid_id": bid[0],
-                    "bidder": bid[2],
-                    "price_usdc": bid[3] / 1e6,  # Convert from micro USDC
-                    "delivery_time_hours": bid[4] / 3600,
-                    "reputation": bid[5],
-                    "accepted": bid[8]
+            contracts = get_contracts(os.getenv("NEOX_PRIVATE_KEY"))
+            bids_by_job = await call_async(get_bids_for_jobs, contracts, ids)
+            
+            results = []
+            for jid in ids:
+                if jid not in bids_by_job:
+                    results.append({"job_id": jid, "error": "Failed to get bids: job could not be read"})
+                    continue
+                formatted_bids = []
+                for bid in bids_by_job[jid]:
+                    # Bid: (id, jobId, bidder, price, deliveryTime, reputation, metadataURI, responseURI, accepted, createdAt)
+                    formatted_bids.append({
+                        "bid_id": bid[0],
+                        "bidder": bid[2],
+                        "price_usdc": bid[3] / 1e6,  # Convert from micro USDC
+                        "delivery_time_hours": bid[4] / 3600,
+                        "reputation": bid[5],
+                        "accepted": bid[8]
+                    })
+                
+                # Sort by price
+                formatted_bids.sort(key=lambda x: x["price_usdc"])
+                results.append({
+                    "job_id": jid,
+                    "total_bids": len(formatted_bids),
+                    "bids": formatted_bids,
+                    "best_bid": formatted_bids[0] if formatted_bids else None,
                 })
             
-            # Sort by price
-            formatted_bids.sort(key=lambda x: x["price_usdc"])
-            
-            return json.dumps({
-                "job_id": job_id,
-                "total_bids": len(formatted_bids),
-                "bids": formatted_bids,
-                "best_bid": formatted_bids[0] if formatted_bids else None,
-                "instruction": "Present these bids to the user. Ask which one they want to accept (or if they want to wait). STOP."
-            }, indent=2)
+            instruction = "Present these bids to the user. Ask which one they want to accept (or if they want to wait). STOP."
+            if len(results) == 1:
+                if "error" in results[0]:
+                    return json.dumps({"error": results[0]["error"]})
+                return json.dumps({**results[0], "instruction": instruction}, indent=2)
+            return json.dumps({"jobs": results, "instruction": instruction}, indent=2)
             
         except Exception as e:
             return json.dumps({"error": f"Failed to get bids: {str(e)}"})
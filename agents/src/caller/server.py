@@ -30,9 +30,10 @@ from ..shared.a2a import (
 )
 
 from .agent import CallerAgent, create_caller_agent
-from ..shared.neofs import get_neofs_client
+from ..shared.neofs import get_neofs_client, close_neofs_client
+from ..shared.neofs_queue import start_upload_queue, stop_upload_queue
 from ..shared import neofs as neofs_module
-from ..shared.contracts import submit_delivery
+from ..shared.contracts import send_submit_delivery, send_async
 from ..shared.base_agent import ActiveJob
 
 # Configure logging
@@ -53,12 +54,15 @@ async def lifespan(app: FastAPI):
     # Initialize and start agent
     agent = await create_caller_agent()
     await agent.start()
+    start_upload_queue()
     
     yield
     
     # Cleanup
     if agent:
         agent.stop()
+    await stop_upload_queue()
+    await close_neofs_client()
     logger.info("👋 Caller Agent stopped")
 
 
@@ -205,8 +209,8 @@ async def elevenlabs_webhook(request: Request):
             call_result,
             job_id=str(job_id),
             phone_number=to_number or "unknown",
+            defer=True,
         )
-        await client.close()
         neofs_uri = f"neofs://{upload.container_id}/{upload.object_id}"
     except Exception as e:
         logger.warning(f"⚠️ Failed to upload call summary to NeoFS: {e}")
@@ -278,7 +282,9 @@ async def confirmation_webhook(payload: ConfirmationPayload):
     proof_bytes = payload.confirmation_number.encode("utf-8")
 
     try:
-        tx_hash = submit_delivery(agent._contracts, job_id, proof_bytes)
+        pending = await send_async(send_submit_delivery, agent._contracts, job_id, proof_bytes)
+        await pending.wait()
+        tx_hash = pending.tx_hash
         active.status = "completed"
         return {
             "submitted": True,
@@ -307,8 +307,6 @@ class UploadCallResultTool(BaseTool):
                 phone_number
             )
             
-            await neofs.close()
-            
             return json.dumps({
                 "success": True,
                 "object_id": result.object_id,
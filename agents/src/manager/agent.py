@@ -13,6 +13,7 @@ The Manager does NOT bid on jobs - it creates them.
 
 import asyncio
 import hashlib
+import json
 import logging
 from typing import Optional
 from dataclasses import dataclass, field
@@ -24,15 +25,19 @@ from spoon_ai.chat import ChatBot
 
 from ..shared.config import JobType, JOB_TYPE_LABELS
 from ..shared.wallet import AgentWallet, create_wallet_from_env
-from ..shared.events import EventListener, JobPostedEvent, BidPlacedEvent, DeliverySubmittedEvent
+from ..shared.events import (
+    EventListener, JobPostedEvent, BidPlacedEvent, DeliverySubmittedEvent, apply_job_metadata,
+)
+from ..shared.checkpoint import get_checkpoint_store
+from ..shared.keyed_executor import KeyedExecutor
 from ..shared.wallet_tools import get_wallet_tools
 from ..shared.booking import analyze_slots
 from ..shared.bevec import BeVecClient, VectorRecord, create_bevec_client
 from ..shared.embedding import embed_text
-from ..shared.contracts import get_contracts, post_job
-from ..shared.neofs import upload_job_metadata
+from ..shared.contracts import get_contracts, send_post_job, send_async
+from ..shared.neofs import get_neofs_client, upload_job_metadata
 
-from .tools import get_manager_tools
+from .tools import get_manager_tools, sent_transaction
 
 logger = logging.getLogger(__name__)
 
@@ -111,7 +116,7 @@ class TrackedJob:
     """A job being managed by this agent"""
     job_id: int
     description: str
-    job_type: int
+    job_type: Optional[int]
     budget: int
     status: str = "posted"  # posted, bidding, assigned, in_progress, delivered, completed, failed
     sub_tasks: list = field(default_factory=list)
@@ -135,6 +140,7 @@ class ManagerAgent:
     
     agent_type: str = "manager"
     agent_name: str = "Archive Manager"
+    handler_concurrency: int = 8
     
     def __init__(self):
         """Initialize the Manager Agent"""
@@ -147,6 +153,9 @@ class ManagerAgent:
         # Track jobs we're managing
         self.tracked_jobs: dict[int, TrackedJob] = {}
         
+        # Per-job ordered, cross-job parallel handling of job events
+        self._job_executor = KeyedExecutor(self.handler_concurrency, name="manager-jobs")
+        
         self._running = False
     
     async def initialize(self):
@@ -162,8 +171,14 @@ class ManagerAgent:
         else:
             logger.warning(f"  No wallet configured for {self.agent_type}")
         
-        # Initialize event listener
-        self.event_listener = EventListener()
+        # Initialize event listener (durable cursor so restarts resume exactly)
+        checkpoint = None
+        try:
+            checkpoint = get_checkpoint_store(self.agent_type)
+        except Exception as e:
+            logger.warning(f"  Event checkpoints disabled: {e}")
+        # Callbacks wait for their job handler, so give each queue one consumer per handler slot
+        self.event_listener = EventListener(checkpoint=checkpoint, queue_consumers=self.handler_concurrency)
         self.event_listener.on_job_posted(self._on_job_posted)
         self.event_listener.on_bid_submitted(self._on_bid_submitted)
         self.event_listener.on_delivery_submitted(self._on_delivery_submitted)
@@ -226,8 +241,9 @@ class ManagerAgent:
         self._running = False
         
         if self.event_listener:
-            await self.event_listener.stop()
+            self.event_listener.stop()
             logger.info("Event listener stopped")
+        self._job_executor.stop()
 
         if self.vector_client:
             try:
@@ -241,12 +257,13 @@ class ManagerAgent:
     
     async def _on_job_posted(self, event: JobPostedEvent):
         """Handle JobPosted events - track jobs we care about"""
-        logger.info(f"📋 Job posted: ID={event.job_id}, Type={JOB_TYPE_LABELS.get(event.job_type, 'UNKNOWN')}")
+        logger.info(f"📋 Job posted: ID={event.job_id}")
         
         # Check if this job was posted by us (or if we should manage it)
         # event.client is the job poster address
         if self.wallet and event.client.lower() == self.wallet.address.lower():
             logger.info(f"   This is our job - tracking it")
+            # Track it before any await, so a BidPlaced handled meanwhile finds the job
             self.tracked_jobs[event.job_id] = TrackedJob(
                 job_id=event.job_id,
                 description=event.description,
@@ -254,9 +271,11 @@ class ManagerAgent:
                 budget=event.budget,
                 status="posted"
             )
+            if self.event_listener:
+                self.event_listener.watch_job(event.job_id)
             
-            # Trigger job decomposition
-            asyncio.create_task(self._process_new_job(event))
+            # Trigger job decomposition (its terms are loaded there, ahead of later events)
+            await self._job_executor.submit(event.job_id, self._process_new_job, event)
     
     async def _on_bid_submitted(self, event: BidPlacedEvent):
         """Handle BidSubmitted events for jobs we're managing"""
@@ -269,7 +288,7 @@ class ManagerAgent:
                 job.status = "bidding"
             
             # Trigger bid evaluation
-            asyncio.create_task(self._evaluate_bid(event))
+            await self._job_executor.submit(event.job_id, self._evaluate_bid, event)
     
     async def _on_delivery_submitted(self, event: DeliverySubmittedEvent):
         """Handle DeliverySubmitted events for jobs we're managing"""
@@ -285,7 +304,18 @@ class ManagerAgent:
             })
             
             # Trigger delivery review
-            asyncio.create_task(self._review_delivery(event))
+            await self._job_executor.submit(event.job_id, self._review_delivery, event)
+    
+    async def _load_job_terms(self, event: JobPostedEvent):
+        """Fill the event's job type and budget from its neofs:// metadata document"""
+        if not event.metadata_uri.startswith("neofs://"):
+            return
+        try:
+            container_id, object_id = event.metadata_uri.removeprefix("neofs://").split("/", 1)
+            data = await get_neofs_client().download_object(object_id, container_id)
+            apply_job_metadata(event, json.loads(data.decode("utf-8")))
+        except Exception as e:
+            logger.warning(f"Could not load metadata for job {event.job_id}: {e}")
     
     # ==========================================================================
     # JOB PROCESSING
@@ -293,6 +323,12 @@ class ManagerAgent:
     
     async def _process_new_job(self, event: JobPostedEvent):
         """Process a newly posted job"""
+        # Job type and budget live in the metadata document we uploaded, not the log
+        await self._load_job_terms(event)
+        job = self.tracked_jobs.get(event.job_id)
+        if job:
+            job.job_type, job.budget = event.job_type, event.budget
+        
         if not self.llm_agent:
             logger.error("LLM agent not initialized")
             return
@@ -317,6 +353,7 @@ class ManagerAgent:
             logger.info(f"✅ Job {event.job_id} decomposed: {response[:200]}...")
         except Exception as e:
             logger.error(f"❌ Error processing job {event.job_id}: {e}")
+            raise
     
     async def _evaluate_bid(self, event: BidPlacedEvent):
         """Evaluate incoming bids and decide whether to accept"""
@@ -329,6 +366,9 @@ class ManagerAgent:
         job = self.tracked_jobs.get(event.job_id)
         if not job or job.status == "assigned":
             return  # Already handled
+        if sent_transaction("accept_bid", event.job_id):
+            job.status = "assigned"  # an earlier attempt got as far as accepting a bid
+            return
         
         prompt = f"""
         Bids have come in for job {event.job_id}.
@@ -345,6 +385,10 @@ class ManagerAgent:
             logger.info(f"✅ Bid accepted for job {event.job_id}")
         except Exception as e:
             logger.error(f"❌ Error evaluating bids for job {event.job_id}: {e}")
+            # Retry only if no acceptBid went out; a second one would be a duplicate
+            if not sent_transaction("accept_bid", event.job_id):
+                raise
+            job.status = "assigned"
     
     async def _review_delivery(self, event: DeliverySubmittedEvent):
         """Review a delivery and decide whether to approve"""
@@ -354,6 +398,8 @@ class ManagerAgent:
         job = self.tracked_jobs.get(event.job_id)
         if not job:
             return
+        if sent_transaction("approve_delivery", event.job_id):
+            return  # an earlier attempt already approved it
         
         prompt = f"""
         A worker has submitted a delivery for job {event.job_id}.
@@ -371,9 +417,13 @@ class ManagerAgent:
         try:
             response = await self.llm_agent.run(prompt)
             job.status = "completed"
+            if self.event_listener:
+                self.event_listener.unwatch_job(event.job_id)
             logger.info(f"✅ Job {event.job_id} completed")
         except Exception as e:
             logger.error(f"❌ Error reviewing delivery for job {event.job_id}: {e}")
+            if not sent_transaction("approve_delivery", event.job_id):
+                raise
     
     # ==========================================================================
     # PUBLIC API
@@ -472,8 +522,6 @@ class ManagerAgent:
         neofs_uri = None
         if raw_payload:
             try:
-                from ..shared.neofs import get_neofs_client
-
                 client = get_neofs_client()
                 result = await client.upload_json(raw_payload, filename="booking-result.json")
                 neofs_uri = f"neofs://{result.container_id}/{result.object_id}"
@@ -541,12 +589,17 @@ class ManagerAgent:
         }
 
         try:
-            metadata_uri = await upload_job_metadata(metadata_payload, normalized_tags)
+            metadata_uri = await upload_job_metadata(metadata_payload, normalized_tags, defer=True)
         except Exception as e:
             return {"success": False, "error": f"NeoFS upload failed: {e}"}
 
         try:
-            job_id = post_job(self._contracts, description, metadata_uri, normalized_tags, deadline)
+            pending = await send_async(
+                send_post_job, self._contracts, description, metadata_uri, normalized_tags, deadline
+            )
+            job_id = await pending.wait()
+            if self.event_listener and job_id is not None:
+                self.event_listener.watch_job(job_id)
             return {
                 "success": True,
                 "job_id": job_id,
@@ -27,6 +27,12 @@ from ..shared.a2a import (
     create_success_response,
 )
 from ..shared.config import JobType
+from ..shared.view_cache import view_cache
+from ..shared.rpc_pool import get_rpc_pool
+from ..shared.neofs_cache import neofs_cache_metrics
+from ..shared.neofs_index import upload_index_metrics
+from ..shared.neofs import close_neofs_client
+from ..shared.neofs_queue import start_upload_queue, stop_upload_queue, upload_queue_metrics
 
 from .agent import ManagerAgent, create_manager_agent
 
@@ -60,6 +66,7 @@ async def lifespan(app: FastAPI):
     try:
         agent = await create_manager_agent()
         await agent.start()
+        start_upload_queue()
         logger.info("✅ Manager Agent initialized and running")
     except Exception as e:
         logger.error(f"❌ Failed to initialize Manager Agent: {e}")
@@ -71,6 +78,8 @@ async def lifespan(app: FastAPI):
     logger.info("👋 Shutting down Manager Agent...")
     if agent:
         await agent.stop()
+    await stop_upload_queue()
+    await close_neofs_client()
     logger.info("Manager Agent stopped")
 
 
@@ -208,7 +217,14 @@ async def handle_a2a_request(request: Request):
             "status": "active",
             "wallet_address": agent.wallet.address if agent and agent.wallet else None,
             "tracked_jobs": len(agent.tracked_jobs) if agent else 0,
-            "event_listener_running": agent._running if agent else False
+            "event_listener_running": agent._running if agent else False,
+            "event_queues": agent.event_listener.metrics() if agent and agent.event_listener else {},
+            "event_polling": agent.event_listener.poll_metrics() if agent and agent.event_listener else {},
+            "view_cache": view_cache.metrics(),
+            "rpc_pool": get_rpc_pool().metrics(),
+            "neofs_cache": neofs_cache_metrics(),
+            "neofs_dedup": upload_index_metrics(),
+            "neofs_queue": upload_queue_metrics(),
         })
     
     elif message.method == A2AMethod.SUBMIT_RESULT.value:
@@ -20,11 +20,22 @@ from spoon_ai.tools.base import BaseTool
 from ..shared.config import JobType, JOB_TYPE_LABELS, get_agent_endpoints
 from ..shared.wallet import AgentWallet
 from ..shared.a2a import A2AMessage, A2AMethod, sign_message
-from ..shared.contracts import get_contracts, post_job
+from ..shared.contracts import get_contracts, send_post_job, send_async, call_async, PendingTransaction
 from ..shared.booking import analyze_slots
 from ..shared.bevec import BeVecClient, VectorRecord
 from ..shared.embedding import embed_text
 from ..shared.neofs import get_neofs_client, upload_job_metadata
+from ..shared.indexer import get_order_book_index
+
+
+# acceptBid / approveDelivery transactions already broadcast, by (tool name, job ID).
+# The manager retries failed event handlers; a retried LLM run must not send them twice.
+_sent_txs: dict[tuple[str, int], PendingTransaction] = {}
+
+
+def sent_transaction(tool: str, job_id: int) -> Optional[PendingTransaction]:
+    """The transaction a tool ("accept_bid", "approve_delivery") already sent for a job"""
+    return _sent_txs.get((tool, job_id))
 
 
 # ==============================================================================
@@ -414,7 +425,10 @@ class PostJobTool(BaseTool):
             return json.dumps({"success": False, "error": f"NeoFS upload failed: {e}"})
 
         try:
-            job_id = post_job(contracts, description, metadata_uri, normalized_tags, deadline)
+            pending = await send_async(
+                send_post_job, contracts, description, metadata_uri, normalized_tags, deadline
+            )
+            job_id = await pending.wait()
         except Exception as e:
             return json.dumps({"success": False, "error": str(e)})
 
@@ -428,6 +442,44 @@ class PostJobTool(BaseTool):
             "tags": normalized_tags,
         }, indent=2)
 
+def _format_bid(bid_id: int, bidder: str, price: int, delivery_time: int, metadata_uri: str) -> dict:
+    """Bid as shown to the LLM (USDC and hours instead of raw units)"""
+    return {
+        "bid_id": bid_id,
+        "bidder": bidder,
+        "amount_usdc": price / 1_000_000,  # Convert from micro-units
+        "estimated_time_hours": delivery_time / 3600,
+        "metadata_uri": metadata_uri
+    }
+
+
+async def _load_bids(job_ids: list[int], private_key: Optional[str] = None) -> dict[int, list[dict]]:
+    """
+    Formatted bids per job: from the local order-book index when it is
+    current, otherwise one batched chain read. Unreadable jobs are omitted.
+    """
+    index = get_order_book_index()
+    if index:
+        return {
+            jid: [
+                _format_bid(b["bid_id"], b["bidder"], int(b["price"]), b["delivery_time"], b["metadata_uri"])
+                for b in index.bids_for_job(jid)
+            ]
+            for jid in job_ids
+            if index.job(jid)
+        }
+    
+    from ..shared.contracts import get_bids_for_jobs
+    
+    contracts = get_contracts(private_key)
+    bids_by_job = await call_async(get_bids_for_jobs, contracts, job_ids)
+    # Bid tuple: (id, jobId, bidder, price, deliveryTime, reputation, metadataURI, ...)
+    return {
+        jid: [_format_bid(b[0], b[2], b[3], b[4], b[6]) for b in bids]
+        for jid, bids in bids_by_job.items()
+    }
+
+
 class GetBidsForJobTool(BaseTool):
     """
     Get all bids for a specific job.
@@ -436,6 +488,7 @@ class GetBidsForJobTool(BaseTool):
     description: str = """
     Retrieve all bids submitted by worker agents for a specific job.
     Returns bid details including bidder address, amount, estimated time, and metadata.
+    Pass job_ids to check several jobs at once (one batched chain read).
     """
     parameters: dict = {
         "type": "object",
@@ -443,40 +496,46 @@ class GetBidsForJobTool(BaseTool):
             "job_id": {
                 "type": "integer",
                 "description": "The job ID to get bids for"
+            },
+            "job_ids": {
+                "type": "array",
+                "items": {"type": "integer"},
+                "description": "Several job IDs to get bids for in one call"
             }
         },
-        "required": ["job_id"]
+        "required": []
     }
     
     def __init__(self, wallet: AgentWallet):
         super().__init__()
         self._wallet = wallet
     
-    async def execute(self, job_id: int) -> str:
-        """Get bids for a job from the OrderBook contract"""
+    async def execute(self, job_id: Optional[int] = None, job_ids: Optional[list[int]] = None) -> str:
+        """Get bids for one or more jobs from the OrderBook contract"""
         try:
-            from ..shared.contracts import get_contracts, get_bids_for_job
+            ids = list(job_ids or [])
+            if job_id is not None and job_id not in ids:
+                ids.insert(0, job_id)
+            if not ids:
+                return json.dumps({"success": False, "error": "job_id or job_ids is required"})
             
-            contracts = get_contracts(self._wallet.private_key)
-            bids = get_bids_for_job(contracts, job_id)
+            bids_by_job = await _load_bids(ids, self._wallet.private_key)
             
-            formatted_bids = []
-            for bid in bids:
-                bid_id, bidder, amount, estimated_time, metadata_uri = bid[:5]
-                formatted_bids.append({
-                    "bid_id": bid_id,
-                    "bidder": bidder,
-                    "amount_usdc": amount / 1_000_000,  # Convert from micro-units
-                    "estimated_time_hours": estimated_time / 3600,
-                    "metadata_uri": metadata_uri
+            results = []
+            for jid in ids:
+                if jid not in bids_by_job:
+                    results.append({"job_id": jid, "error": "Could not read job"})
+                    continue
+                formatted_bids = bids_by_job[jid]
+                results.append({
+                    "job_id": jid,
+                    "bids": formatted_bids,
+                    "total_bids": len(formatted_bids)
                 })
             
-            return json.dumps({
-                "success": True,
-                "job_id": job_id,
-                "bids": formatted_bids,
-                "total_bids": len(formatted_bids)
-            }, indent=2)
+            if len(results) == 1:
+                return json.dumps({"success": "error" not in results[0], **results[0]}, indent=2)
+            return json.dumps({"success": True, "jobs": results}, indent=2)
             
         except Exception as e:
             return json.dumps({
@@ -507,7 +566,7 @@ class SelectBestBidTool(BaseTool):
             },
             "bids": {
                 "type": "array",
-                "description": "List of bids to analyze (from get_bids_for_job)",
+                "description": "List of bids to analyze (from get_bids_for_job); omit to load the job's current bids",
                 "items": {"type": "object"}
             },
             "priority": {
@@ -516,16 +575,21 @@ class SelectBestBidTool(BaseTool):
                 "description": "Selection priority (default: balanced)"
             }
         },
-        "required": ["job_id", "bids"]
+        "required": ["job_id"]
     }
     
     async def execute(
         self, 
         job_id: int, 
-        bids: list,
+        bids: Optional[list] = None,
         priority: str = "balanced"
     ) -> str:
         """Analyze and select the best bid"""
+        if bids is None:
+            try:
+                bids = (await _load_bids([job_id])).get(job_id, [])
+            except Exception as e:
+                return json.dumps({"success": False, "error": f"Could not load bids: {e}"})
         if not bids:
             return json.dumps({
                 "success": False,
@@ -601,17 +665,23 @@ class AcceptBidTool(BaseTool):
     async def execute(self, job_id: int, bid_id: int) -> str:
         """Accept a bid on-chain"""
         try:
-            from ..shared.contracts import get_contracts, accept_bid
+            from ..shared.contracts import send_accept_bid
             
             contracts = get_contracts(self._wallet.private_key)
             
-            # Accept the bid
-            tx_hash = accept_bid(
-                contracts,
-                job_id,
-                bid_id,
-                f"ipfs://manager-acceptance-{job_id}-{bid_id}"
-            )
+            # Accept the bid, unless an earlier run already did
+            pending = sent_transaction(self.name, job_id)
+            if pending is None:
+                pending = await send_async(
+                    send_accept_bid,
+                    contracts,
+                    job_id,
+                    bid_id,
+                    f"ipfs://manager-acceptance-{job_id}-{bid_id}"
+                )
+                _sent_txs[(self.name, job_id)] = pending
+            await pending.wait()
+            tx_hash = pending.tx_hash
             
             return json.dumps({
                 "success": True,
@@ -872,10 +942,15 @@ class ApproveDeliveryTool(BaseTool):
     async def execute(self, job_id: int, approval_notes: str = "") -> str:
         """Approve delivery and release payment"""
         try:
-            from ..shared.contracts import get_contracts, approve_delivery
+            from ..shared.contracts import send_approve_delivery
             
             contracts = get_contracts(self._wallet.private_key)
-            tx_hash = approve_delivery(contracts, job_id)
+            pending = sent_transaction(self.name, job_id)
+            if pending is None:
+                pending = await send_async(send_approve_delivery, contracts, job_id)
+                _sent_txs[(self.name, job_id)] = pending
+            await pending.wait()
+            tx_hash = pending.tx_hash
             
             return json.dumps({
                 "success": True,
@@ -919,10 +994,10 @@ class GetJobDetailsTool(BaseTool):
     async def execute(self, job_id: int) -> str:
         """Get job details from blockchain"""
         try:
-            from ..shared.contracts import get_contracts, get_job
+            from ..shared.contracts import get_job
             
             contracts = get_contracts(self._wallet.private_key)
-            job = get_job(contracts, job_id)
+            job = await call_async(get_job, contracts, job_id)
             
             return json.dumps({
                 "success": True,
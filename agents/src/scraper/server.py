@@ -27,6 +27,8 @@ from ..shared.a2a import (
     create_success_response,
 )
 
+from ..shared.neofs import close_neofs_client
+from ..shared.neofs_queue import start_upload_queue, stop_upload_queue
 from .agent import ScraperAgent, create_scraper_agent
 
 # Configure logging
@@ -47,12 +49,15 @@ async def lifespan(app: FastAPI):
     # Initialize and start agent
     agent = await create_scraper_agent()
     await agent.start()
+    start_upload_queue()
     
     yield
     
     # Cleanup
     if agent:
         agent.stop()
+    await stop_upload_queue()
+    await close_neofs_client()
     logger.info("👋 Scraper Agent stopped")
 
 
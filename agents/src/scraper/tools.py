@@ -404,8 +404,6 @@ class UploadToNeoFSTool(BaseTool):
                 source
             )
             
-            await neofs.close()
-            
             return json.dumps({
                 "success": True,
                 "object_id": result.object_id,
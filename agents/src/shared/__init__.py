@@ -5,20 +5,70 @@ Provides common functionality used across all agents:
 - config: Network settings, contract addresses, environment config
 - contracts: Smart contract interaction (OrderBook, AgentRegistry, etc.)
 - a2a: Agent-to-Agent communication protocol
-- neofs: NeoFS storage for decentralized proof-of-work
+- neofs: NeoFS storage for decentralized proof-of-work (one pooled, keep-alive gateway client per process)
+- neofs_cache: Content-addressed, size-capped LRU disk cache of NeoFS downloads
+- neofs_index: Canonical JSON and the content-hash -> object-ID index that deduplicates uploads
+- neofs_queue: Durable write-behind NeoFS upload queue with content-derived URIs
 - wallet: Wallet management and transaction signing
+- nonce: Local per-account nonce allocation for pipelined transactions
+- gas: Learned per-method gas limits and a cached gas-price oracle
+- rpc_pool: Latency-routed RPC endpoint pool with failover and circuit breaking
+- view_cache: Event-invalidated read-through cache for job / registry views
 - events: Blockchain event listening
+- checkpoint: Durable event cursors and exactly-once delivery ledger
+- backfill: Adaptive, parallel chunked eth_getLogs backfill
+- dispatch: Bounded per-event-type queues between ingestion and callbacks
+- keyed_executor: Per-job ordered, cross-job parallel handler execution
+- poll_scheduler: Adaptive, block-time aware poll interval
+- event_hub: Single-poller event fan-out to co-located agents over a Unix socket
+- indexer: Local SQLite order-book index (jobs, bids, deliveries, disputes, reputation) and its query API
 - base_agent: Abstract base class for worker agents
 - wallet_tools: Tools for wallet interactions
 - bidding_tools: Tools for job bidding workflow
 """
 
-from .config import *
-from .contracts import *
-from .a2a import *
-from .neofs import *
-from .wallet import *
-from .events import *
-from .base_agent import *
-from .wallet_tools import *
-from .bidding_tools import *
+import importlib
+
+# Submodules whose public names are re-exported here, as by star imports in
+# this order. They are imported on the first lookup of a name the package
+# doesn't have yet, so importing a self-contained submodule (e.g. neofs_cache
+# from neofs_helper.py) doesn't pull in web3 and spoon_ai.
+_EXPORTING_MODULES = (
+    "config",
+    "contracts",
+    "a2a",
+    "neofs",
+    "neofs_cache",
+    "neofs_index",
+    "neofs_queue",
+    "wallet",
+    "nonce",
+    "gas",
+    "rpc_pool",
+    "view_cache",
+    "events",
+    "checkpoint",
+    "backfill",
+    "dispatch",
+    "keyed_executor",
+    "poll_scheduler",
+    "event_hub",
+    "indexer",
+    "base_agent",
+    "wallet_tools",
+    "bidding_tools",
+)
+
+
+def __getattr__(name: str):
+    if not name.startswith("_"):
+        namespace = globals()
+        for module_name in _EXPORTING_MODULES:
+            module = importlib.import_module(f".{module_name}", __name__)
+            exported = getattr(module, "__all__", None)
+            if exported is None:
+                exported = [key for key in vars(module) if not key.startswith("_")]
+            namespace.update((key, getattr(module, key)) for key in exported)
+        if name in namespace:
+            return namespace[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
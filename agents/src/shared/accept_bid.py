@@ -6,7 +6,8 @@ Meant to be run manually to trigger BidAccepted (and downstream ElevenLabs call)
 import os
 from dotenv import load_dotenv
 from web3 import Web3
-from agents.src.shared.contracts import load_abi
+from agents.src.shared.contracts import load_abi, get_http_provider
+from agents.src.shared.nonce import get_nonce_manager
 
 load_dotenv()
 
@@ -21,25 +22,27 @@ def accept_bid(job_id: int, bid_id: int, response_uri: str = "archive://response
     if not orderbook_addr:
         raise ValueError("ORDERBOOK_ADDRESS not set")
 
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = Web3(get_http_provider(rpc_url))
     acct = w3.eth.account.from_key(private_key)
 
     abi = load_abi("OrderBook")
     ob = w3.eth.contract(address=Web3.to_checksum_address(orderbook_addr), abi=abi)
 
-    nonce = w3.eth.get_transaction_count(acct.address)
-    tx = ob.functions.acceptBid(job_id, bid_id, response_uri).build_transaction(
-        {
-            "from": acct.address,
-            "nonce": nonce,
-            "gas": 800_000,
-            "gasPrice": w3.eth.gas_price,
-            "chainId": w3.eth.chain_id,
-        }
-    )
-    signed = w3.eth.account.sign_transaction(tx, private_key)
-    raw_tx = signed.raw_transaction if hasattr(signed, "raw_transaction") else signed.rawTransaction
-    tx_hash = w3.eth.send_raw_transaction(raw_tx)
+    def sign_and_send(nonce: int):
+        tx = ob.functions.acceptBid(job_id, bid_id, response_uri).build_transaction(
+            {
+                "from": acct.address,
+                "nonce": nonce,
+                "gas": 800_000,
+                "gasPrice": w3.eth.gas_price,
+                "chainId": w3.eth.chain_id,
+            }
+        )
+        signed = w3.eth.account.sign_transaction(tx, private_key)
+        raw_tx = signed.raw_transaction if hasattr(signed, "raw_transaction") else signed.rawTransaction
+        return w3.eth.send_raw_transaction(raw_tx)
+
+    tx_hash = get_nonce_manager(w3, acct.address).submit(sign_and_send)
     rec = w3.eth.wait_for_transaction_receipt(tx_hash)
     if rec.status != 1:
         raise RuntimeError(f"Transaction failed: {tx_hash.hex()}")
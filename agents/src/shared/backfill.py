@@ -0,0 +1,153 @@
+"""
+Chunked Log Backfill for Archive Agents
+
+Splits large eth_getLogs block ranges into chunks, fetches several chunks
+concurrently and hands results back strictly in block order. Chunk size
+adapts to the provider: it grows while responses stay small, shrinks when
+responses are large, and a chunk the provider rejects as too large (block
+range or response size limit) is split in half and retried. Rate limits are
+retried with backoff; any other error is raised at once, so a dead or
+misconfigured node surfaces immediately instead of stalling the poll.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+ChunkFetcher = Callable[[int, int], Awaitable[list[Any]]]
+ChunkHandler = Callable[[int, int, list[Any]], Awaitable[None]]
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Best-effort detection of provider throttling errors"""
+    text = str(error).lower()
+    return "429" in text or "rate limit" in text or "too many requests" in text
+
+
+# Provider messages for an eth_getLogs range or response that is too large
+_RANGE_ERROR_HINTS = (
+    "block range",
+    "range too large",
+    "range is too large",
+    "range too wide",
+    "query returned more than",
+    "response size",
+    "response too large",
+    "too many results",
+    "is limited to",
+    "max results",
+)
+
+
+def is_range_too_large(error: Exception) -> bool:
+    """Best-effort detection of eth_getLogs block-range / response-size limits"""
+    text = str(error).lower()
+    return any(hint in text for hint in _RANGE_ERROR_HINTS)
+
+
+class LogBackfiller:
+    """
+    Adaptive, parallel, ordered block-range fetcher.
+
+    Usage:
+        backfiller = LogBackfiller(fetch_logs)
+        await backfiller.run(0, head, handle_chunk)
+    """
+
+    def __init__(
+        self,
+        fetch: ChunkFetcher,
+        chunk_size: int = 2_000,
+        min_chunk_size: int = 1,
+        max_chunk_size: int = 50_000,
+        max_concurrency: int = 4,
+        target_logs: int = 1_000,
+        max_retries: int = 5,
+    ):
+        """
+        Initialize the backfiller.
+
+        Args:
+            fetch: Async function returning the logs for an inclusive block range
+            chunk_size: Initial blocks per request
+            min_chunk_size: Smallest chunk a failing range is split into
+            max_chunk_size: Largest chunk the size may grow to
+            max_concurrency: Chunks in flight at once
+            target_logs: Logs per response the chunk size is tuned towards
+            max_retries: Rate-limit retries per chunk before giving up
+        """
+        self._fetch = fetch
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.max_concurrency = max_concurrency
+        self.target_logs = target_logs
+        self.max_retries = max_retries
+
+    def _adapt(self, blocks: int, log_count: int):
+        """Resize future chunks from one successful response"""
+        if log_count > self.target_logs:
+            self.chunk_size = max(self.min_chunk_size, blocks // 2)
+        elif log_count < self.target_logs // 4 and blocks >= self.chunk_size:
+            self.chunk_size = min(self.max_chunk_size, self.chunk_size * 2)
+
+    async def _fetch_chunk(self, start: int, end: int) -> list[Any]:
+        """Fetch one chunk: split it on range/size limits, back off on rate limits, raise otherwise"""
+        attempt = 0
+        while True:
+            try:
+                logs = await self._fetch(start, end)
+                self._adapt(end - start + 1, len(logs))
+                return logs
+            except Exception as e:
+                blocks = end - start + 1
+                if is_rate_limited(e):
+                    attempt += 1
+                    if attempt > self.max_retries:
+                        raise
+                    delay = min(30.0, 0.5 * 2 ** attempt)
+                    logger.debug(f"Rate limited on blocks {start}-{end}; retrying in {delay:.1f}s: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                if not is_range_too_large(e) or blocks <= self.min_chunk_size:
+                    raise
+
+                self.chunk_size = max(self.min_chunk_size, blocks // 2)
+                mid = start + blocks // 2 - 1
+                logger.debug(f"Splitting blocks {start}-{end} at {mid}: {e}")
+                left = await self._fetch_chunk(start, mid)
+                right = await self._fetch_chunk(mid + 1, end)
+                return left + right
+
+    async def run(self, from_block: int, to_block: int, on_chunk: ChunkHandler):
+        """
+        Fetch an inclusive block range and deliver it chunk by chunk.
+
+        Chunks are fetched up to max_concurrency at a time, but on_chunk is
+        always awaited in ascending block order, one chunk at a time.
+
+        Args:
+            from_block: First block
+            to_block: Last block
+            on_chunk: Async handler called with (start, end, logs) per chunk
+        """
+        pending: deque[tuple[int, int, asyncio.Task]] = deque()
+        next_block = from_block
+        try:
+            while next_block <= to_block or pending:
+                while next_block <= to_block and len(pending) < self.max_concurrency:
+                    end = min(to_block, next_block + self.chunk_size - 1)
+                    task = asyncio.create_task(self._fetch_chunk(next_block, end))
+                    pending.append((next_block, end, task))
+                    next_block = end + 1
+
+                start, end, task = pending.popleft()
+                logs = await task
+                await on_chunk(start, end, logs)
+        finally:
+            for _, _, task in pending:
+                task.cancel()
@@ -27,11 +27,21 @@ from spoon_ai.chat import ChatBot
 
 from .config import JobType, JOB_TYPE_LABELS, get_contract_addresses
 from .wallet import AgentWallet, create_wallet_from_env
-from .events import EventListener, JobPostedEvent, BidAcceptedEvent
-from .contracts import get_contracts, place_bid, get_job
+from .events import (
+    EventListener, EventType, JobPostedEvent, BidPlacedEvent, BidAcceptedEvent, RetractedEvent, apply_job_metadata,
+)
+from .checkpoint import get_checkpoint_store
+from .keyed_executor import KeyedExecutor
+from .view_cache import view_cache
+from .rpc_pool import get_rpc_pool
+from .neofs_cache import neofs_cache_metrics
+from .neofs_index import upload_index_metrics
+from .neofs_queue import upload_queue_metrics
+from .contracts import (
+    get_contracts, send_place_bid, get_job, get_job_records, get_registry_job, send_async, call_async, PendingTransaction,
+)
 from .elevenlabs import ElevenLabsClient
-from .neofs import get_neofs_client
-import httpx
+from .neofs import get_neofs_client, shared_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -89,13 +99,29 @@ class BaseArchiveAgent(ABC):
     min_profit_margin: float = 0.1  # 10%
     max_concurrent_jobs: int = 5
     auto_bid_enabled: bool = True
+    # Pay above the cached gas price so bids land ahead of competitors
+    priority_bids: bool = os.getenv("BID_PRIORITY_GAS", "false").lower() == "true"
+    
+    # Event handlers run in order per job, in parallel across up to this many jobs
+    handler_concurrency: int = 8
+    
+    # Bid on new jobs quickly, but only start work once the acceptance is deep enough
+    event_confirmations: dict[EventType, int] = {
+        EventType.JOB_POSTED: 1,
+        EventType.BID_ACCEPTED: 3,
+    }
     
     def __init__(self):
         """Initialize the base agent"""
         self.wallet: Optional[AgentWallet] = None
         self.event_listener: Optional[EventListener] = None
         self.active_jobs: dict[int, ActiveJob] = {}
+        # JobPosted payloads of jobs we bid on, so acceptance needs no registry read
+        self._bid_jobs: dict[int, JobPostedEvent] = {}
+        # placeBid transactions already broadcast, so a retried handler never bids twice
+        self._bid_txs: dict[int, PendingTransaction] = {}
         self.llm_agent: Optional[ToolCallAgent] = None
+        self._job_executor = KeyedExecutor(self.handler_concurrency, name=f"{self.agent_type}-jobs")
         
         self._running = False
         self._contracts = None
@@ -125,10 +151,22 @@ class BaseArchiveAgent(ABC):
             except Exception as e:
                 logger.warning(f"  Could not connect to contracts: {e}")
         
-        # Initialize event listener
-        self.event_listener = EventListener()
+        # Initialize event listener (durable cursor so restarts resume exactly)
+        checkpoint = None
+        try:
+            checkpoint = get_checkpoint_store(self.agent_type)
+        except Exception as e:
+            logger.warning(f"  Event checkpoints disabled: {e}")
+        # Callbacks wait for their job handler, so give each queue one consumer per handler slot
+        self.event_listener = EventListener(
+            confirmations=self.event_confirmations,
+            checkpoint=checkpoint,
+            queue_consumers=self.handler_concurrency,
+        )
         self.event_listener.on_job_posted(self._on_job_posted)
         self.event_listener.on_bid_accepted(self._on_bid_accepted)
+        self.event_listener.on_bid_placed(self._on_bid_placed)
+        self.event_listener.on_retracted(self._on_event_retracted)
         logger.info("  Event listener configured")
         
         # Initialize LLM agent with tools
@@ -163,13 +201,25 @@ class BaseArchiveAgent(ABC):
         """
         pass
     
-    def can_handle_job_type(self, job_type: int) -> bool:
-        """Check if this agent can handle a job type"""
-        return JobType(job_type) in self.supported_job_types
+    def can_handle_job_type(self, job_type: Optional[int]) -> bool:
+        """Check if this agent can handle a job type (None: unknown, never handled)"""
+        try:
+            return job_type is not None and JobType(job_type) in self.supported_job_types
+        except ValueError:
+            return False
     
     async def _on_job_posted(self, event: JobPostedEvent):
         """Handle JobPosted event"""
-        logger.info(f"📋 New job posted: #{event.job_id} - {JOB_TYPE_LABELS.get(JobType(event.job_type), 'Unknown')}")
+        # Submit before any await so later events for this job queue behind it; the
+        # event only counts as handled, and is checkpointed, once the bid attempt finishes
+        await self._job_executor.submit(event.job_id, self._handle_job_posted, event)
+    
+    async def _handle_job_posted(self, event: JobPostedEvent):
+        """Load a posted job's terms and bid on it if we can take it"""
+        # Job type and budget live in the metadata document, not the log
+        metadata_uri = event.metadata_uri or await self._resolve_job_metadata_uri(None, event.job_id)
+        apply_job_metadata(event, await self._fetch_job_metadata(metadata_uri))
+        logger.info(f"📋 New job posted: #{event.job_id} - {JOB_TYPE_LABELS.get(event.job_type, 'Unknown')}")
         
         # Check if we can handle this job type
         if not self.can_handle_job_type(event.job_type):
@@ -181,7 +231,10 @@ class BaseArchiveAgent(ABC):
             logger.warning(f"  Skipping job #{event.job_id} - at capacity")
             return
         
-        # Evaluate and potentially bid
+        # Evaluate and potentially bid (unless an earlier attempt already sent the bid)
+        if event.job_id in self._bid_txs:
+            logger.info(f"  Bid for job #{event.job_id} already sent (tx={self._bid_txs[event.job_id].tx_hash})")
+            return
         if self.auto_bid_enabled:
             await self._evaluate_and_bid(event)
     
@@ -202,7 +255,7 @@ class BaseArchiveAgent(ABC):
                 decision = self._heuristic_bid_decision(job)
         except Exception as e:
             logger.error(f"Error evaluating job #{job.job_id}: {e}")
-            return
+            raise
         
         logger.info(f"  Decision: {'BID' if decision.should_bid else 'SKIP'}")
         logger.info(f"  Reasoning: {decision.reasoning}")
@@ -270,14 +323,30 @@ class BaseArchiveAgent(ABC):
         logger.info(f"   Est. Time: {decision.estimated_time / 3600:.1f} hours")
         
         metadata_uri = f"ipfs://{self.agent_type}-bid-{job.job_id}"
+        pending = self._bid_txs.get(job.job_id)
+        if pending is None:
+            try:
+                pending = await send_async(
+                    send_place_bid,
+                    self._contracts,
+                    job.job_id,
+                    decision.proposed_amount,
+                    decision.estimated_time,
+                    metadata_uri,
+                    priority=self.priority_bids,
+                )
+            except Exception as e:
+                # Nothing was broadcast, so the dispatcher may safely retry
+                logger.error(f"❌ Failed to place bid: {e}")
+                raise
+            self._bid_txs[job.job_id] = pending
+            self._bid_jobs[job.job_id] = job
+        
+        # Poll tightly until the bid is accepted (or the watch expires)
+        if self.event_listener:
+            self.event_listener.watch_job(job.job_id)
         try:
-            bid_id = place_bid(
-                self._contracts,
-                job.job_id,
-                decision.proposed_amount,
-                decision.estimated_time,
-                metadata_uri
-            )
+            bid_id = await pending.wait()
             logger.info(
                 "📨 Bid created | job_id=%s bid_id=%s amount=%.2f USDC eta=%.1f h metadata=%s",
                 job.job_id,
@@ -287,21 +356,52 @@ class BaseArchiveAgent(ABC):
                 metadata_uri,
             )
         except Exception as e:
-            logger.error(f"❌ Failed to place bid: {e}")
+            # Already broadcast: a retry would send a second placeBid, so don't raise
+            if self.event_listener:
+                self.event_listener.unwatch_job(job.job_id)
+            logger.error(f"❌ Bid tx {pending.tx_hash} for job #{job.job_id} failed: {e}")
+    
+    async def _on_bid_placed(self, event: BidPlacedEvent):
+        """
+        Handle BidPlaced event.
+        
+        Nothing to do here: subscribing makes the listener fetch BidPlaced,
+        and accepting one drops the job's cached bid list (view_cache).
+        """
     
     async def _on_bid_accepted(self, event: BidAcceptedEvent):
         """Handle BidAccepted event"""
+        if self.event_listener:
+            self.event_listener.unwatch_job(event.job_id)
+        
         # Check if this is our bid (by comparing worker address)
         if not self.wallet or event.worker.lower() != self.wallet.address.lower():
+            self._bid_jobs.pop(event.job_id, None)
+            self._bid_txs.pop(event.job_id, None)
             return
         
+        # Runs after any bid evaluation still in flight for this job
+        await self._job_executor.submit(event.job_id, self._handle_bid_accepted, event)
+    
+    async def _handle_bid_accepted(self, event: BidAcceptedEvent):
+        """Track and start a job whose bid we won"""
         logger.info(f"🎉 Our bid was accepted! Job #{event.job_id}")
         
-        # Get full job details
+        # The JobPosted payload we bid on has description, deadline and metadata URI;
+        # the registry record is only needed when it is missing (older OrderBook)
+        posted = self._bid_jobs.pop(event.job_id, None)
+        self._bid_txs.pop(event.job_id, None)
         job_details = None
+        registry_job = None
         if self._contracts:
             try:
-                job_details = get_job(self._contracts, event.job_id)
+                if posted and posted.metadata_uri:
+                    job_details = await call_async(get_job, self._contracts, event.job_id)
+                else:
+                    records = await call_async(get_job_records, self._contracts, [event.job_id])
+                    job_details, registry_job = records[event.job_id]
+                if job_details is None:
+                    logger.error(f"Could not fetch job details for job #{event.job_id}")
             except Exception as e:
                 logger.error(f"Could not fetch job details: {e}")
         
@@ -309,14 +409,22 @@ class BaseArchiveAgent(ABC):
         job_state = job_details[0] if job_details and len(job_details) > 0 else None
         bids = job_details[1] if job_details and len(job_details) > 1 else []
 
-        job_type_val = job_state[2] if job_state and len(job_state) > 2 else 0
-        job_description = job_state[1] if job_state and len(job_state) > 1 else ""
-        job_deadline = job_state[4] if job_state and len(job_state) > 4 else 0
+        if posted:
+            job_type_val = posted.job_type
+            job_description = posted.description
+            job_deadline = posted.deadline
+        else:
+            job_type_val = job_state[2] if job_state and len(job_state) > 2 else 0
+            job_description = job_state[1] if job_state and len(job_state) > 1 else ""
+            job_deadline = job_state[4] if job_state and len(job_state) > 4 else 0
 
-        # Resolve job metadata URI with fallback to JobRegistry when OrderBook value is missing
-        job_metadata_uri = self._resolve_job_metadata_uri(job_state, event.job_id)
+        # Resolve job metadata URI with fallback to JobRegistry when the event lacked it
+        if posted and posted.metadata_uri:
+            job_metadata_uri = posted.metadata_uri
+        else:
+            job_metadata_uri = await self._resolve_job_metadata_uri(job_state, event.job_id, registry_job)
 
-        # Track the active job
+        # Track the active job (BidAccepted carries the accepted price)
         active_job = ActiveJob(
             job_id=event.job_id,
             bid_id=event.bid_id,
@@ -335,6 +443,16 @@ class BaseArchiveAgent(ABC):
         # Start executing the job
         asyncio.create_task(self._execute_job_task(active_job))
     
+    async def _on_event_retracted(self, event: RetractedEvent):
+        """Handle an event orphaned by a chain reorg"""
+        job_id = getattr(event.event, "job_id", None)
+        logger.warning(f"⚠️ {event.event_type.value} for job #{job_id} was reorged out (block {event.block_number})")
+        
+        # An acceptance that vanished: drop the job unless work already started
+        job = self.active_jobs.get(job_id)
+        if event.event_type == EventType.BID_ACCEPTED and job and job.status == "accepted":
+            self.active_jobs.pop(job_id, None)
+    
     async def _execute_job_task(self, job: ActiveJob):
         """Execute job in background task"""
         logger.info(f"🔄 Starting execution of job #{job.job_id}")
@@ -377,6 +495,7 @@ class BaseArchiveAgent(ABC):
         self._running = False
         if self.event_listener:
             self.event_listener.stop()
+        self._job_executor.stop()
         logger.info(f"👋 {self.agent_name} stopped")
     
     def get_status(self) -> dict:
@@ -391,6 +510,14 @@ class BaseArchiveAgent(ABC):
             "max_concurrent_jobs": self.max_concurrent_jobs,
             "auto_bid_enabled": self.auto_bid_enabled,
             "running": self._running,
+            "event_queues": self.event_listener.metrics() if self.event_listener else {},
+            "job_executor": self._job_executor.metrics(),
+            "event_polling": self.event_listener.poll_metrics() if self.event_listener else {},
+            "view_cache": view_cache.metrics(),
+            "rpc_pool": get_rpc_pool().metrics(),
+            "neofs_cache": neofs_cache_metrics(),
+            "neofs_dedup": upload_index_metrics(),
+            "neofs_queue": upload_queue_metrics(),
         }
 
     async def _fetch_job_metadata(self, metadata_uri: str) -> dict:
@@ -407,27 +534,23 @@ class BaseArchiveAgent(ABC):
                 if len(parts) != 2:
                     return {}
                 container_id, object_id = parts
-                client = get_neofs_client()
-                try:
-                    data = await client.download_object(object_id, container_id)
-                    import json as _json
-                    return _json.loads(data.decode("utf-8"))
-                finally:
-                    await client.close()
+                data = await get_neofs_client().download_object(object_id, container_id)
+                import json as _json
+                return _json.loads(data.decode("utf-8"))
             elif metadata_uri.startswith("http://") or metadata_uri.startswith("https://"):
-                async with httpx.AsyncClient(timeout=15.0) as client:
-                    resp = await client.get(metadata_uri)
-                    resp.raise_for_status()
-                    return resp.json()
+                resp = await shared_http_client().get(metadata_uri, timeout=15.0)
+                resp.raise_for_status()
+                return resp.json()
         except Exception as e:
             logger.warning(f"Failed to fetch job metadata from {metadata_uri}: {e}")
         return {}
 
-    def _resolve_job_metadata_uri(self, job_state: Any, job_id: int) -> str:
+    async def _resolve_job_metadata_uri(self, job_state: Any, job_id: int, registry_job: Any = None) -> str:
         """
         Resolve job metadata URI.
         Priority:
           1) JobRegistry.getJob(job_id) -> metadata.metadataURI
+             (registry_job, if the caller already batched that read)
           2) Fallback to agent-generated NeoFS metadata if tracked locally
         Note: OrderBook.JobState does NOT contain metadataURI; avoid using it.
         """
@@ -442,7 +565,7 @@ class BaseArchiveAgent(ABC):
         # Primary: JobRegistry.getJob(job_id)
         if self._contracts and getattr(self._contracts, "job_registry", None):
             try:
-                jr_job = self._contracts.job_registry.functions.getJob(job_id).call()
+                jr_job = registry_job or await call_async(get_registry_job, self._contracts, job_id)
                 stored_job = jr_job[0] if jr_job else None  # (StoredJob)
                 metadata = stored_job[0] if stored_job and len(stored_job) > 0 else None  # (JobMetadata)
                 uri_from_registry = _decode_uri(metadata[3] if metadata and len(metadata) > 3 else "")
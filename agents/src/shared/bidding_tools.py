@@ -10,7 +10,10 @@ from typing import Optional, Any
 from pydantic import Field
 from spoon_ai.tools.base import BaseTool
 
-from .contracts import ContractInstances, place_bid, get_job, get_bids_for_job, submit_delivery
+from .contracts import (
+    ContractInstances, send_place_bid, get_job, get_bids_for_job, send_submit_delivery,
+    send_async, call_async,
+)
 from .config import JobType, JOB_TYPE_LABELS
 
 
@@ -43,7 +46,7 @@ class GetJobDetailsTool(BaseTool):
             return json.dumps({"error": "Contracts not configured"})
         
         try:
-            job = get_job(self._contracts, job_id)
+            job = await call_async(get_job, self._contracts, job_id)
             
             # Parse job tuple (structure depends on contract)
             return json.dumps({
@@ -91,7 +94,7 @@ class ListJobBidsTool(BaseTool):
             return json.dumps({"error": "Contracts not configured"})
         
         try:
-            bids = get_bids_for_job(self._contracts, job_id)
+            bids = await call_async(get_bids_for_job, self._contracts, job_id)
             
             parsed_bids = []
             for i, bid in enumerate(bids):
@@ -177,13 +180,15 @@ class PlaceBidTool(BaseTool):
             if proposal_notes:
                 metadata_uri += f"?notes={proposal_notes[:100]}"
             
-            bid_id = place_bid(
+            pending = await send_async(
+                send_place_bid,
                 self._contracts,
                 job_id,
                 amount_raw,
                 estimated_seconds,
                 metadata_uri
             )
+            bid_id = await pending.wait()
             
             return json.dumps({
                 "success": True,
@@ -237,7 +242,9 @@ class SubmitDeliveryTool(BaseTool):
                 proof_hash = proof_hash[2:]
             proof_bytes = bytes.fromhex(proof_hash)
             
-            tx_hash = submit_delivery(self._contracts, job_id, proof_bytes)
+            pending = await send_async(send_submit_delivery, self._contracts, job_id, proof_bytes)
+            await pending.wait()
+            tx_hash = pending.tx_hash
             
             return json.dumps({
                 "success": True,
@@ -0,0 +1,134 @@
+"""
+Durable Event Checkpoints for Archive Agents
+
+SQLite-backed block cursors (per contract and event type) plus a ledger of
+handled logs keyed by (tx_hash, log_index). The EventListener resumes from
+the stored cursor after a restart and skips logs that were already handled,
+so callbacks such as bidding never fire twice for the same event.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Ledger rows this far below the lowest cursor can never be re-fetched
+LEDGER_RETENTION_BLOCKS = 10_000
+
+
+class CheckpointStore:
+    """
+    Persistent cursor + processed-event ledger.
+
+    Cursors are committed after the callbacks for a block range have run;
+    ledger rows are written as each event's callbacks succeed.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Open (or create) a checkpoint database.
+
+        Args:
+            path: SQLite file path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cursors (
+                contract TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                block INTEGER NOT NULL,
+                PRIMARY KEY (contract, event_type)
+            );
+            CREATE TABLE IF NOT EXISTS processed (
+                tx_hash TEXT NOT NULL,
+                log_index INTEGER NOT NULL,
+                block INTEGER NOT NULL,
+                PRIMARY KEY (tx_hash, log_index)
+            );
+            CREATE INDEX IF NOT EXISTS processed_block ON processed (block);
+            """
+        )
+        self._conn.commit()
+
+    def get_cursor(self, contract: str, event_type: str) -> Optional[int]:
+        """Last fully handled block for a contract/event type, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT block FROM cursors WHERE contract = ? AND event_type = ?",
+                (contract.lower(), event_type),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_cursors(self, contract: str, event_types: Iterable[str], block: int):
+        """Commit the cursor for several event types at once"""
+        contract = contract.lower()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO cursors (contract, event_type, block) VALUES (?, ?, ?) "
+                "ON CONFLICT (contract, event_type) DO UPDATE SET block = excluded.block",
+                [(contract, event_type, block) for event_type in event_types],
+            )
+            self._conn.execute(
+                "DELETE FROM processed WHERE block < ?",
+                (block - LEDGER_RETENTION_BLOCKS,),
+            )
+            self._conn.commit()
+
+    def rewind(self, contract: str, block: int):
+        """
+        Roll back after a chain reorg.
+
+        Cursors above `block` are lowered to it and ledger rows for later
+        blocks are dropped, so the orphaned range is fetched and handled again.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE cursors SET block = ? WHERE contract = ? AND block > ?",
+                (block, contract.lower(), block),
+            )
+            self._conn.execute("DELETE FROM processed WHERE block > ?", (block,))
+            self._conn.commit()
+
+    def is_processed(self, tx_hash: str, log_index: int) -> bool:
+        """Whether a log's callbacks already completed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM processed WHERE tx_hash = ? AND log_index = ?",
+                (tx_hash.lower(), log_index),
+            ).fetchone()
+        return row is not None
+
+    def mark_processed(self, tx_hash: str, log_index: int, block: int):
+        """Record that a log's callbacks completed"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO processed (tx_hash, log_index, block) VALUES (?, ?, ?)",
+                (tx_hash.lower(), log_index, block),
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+def get_checkpoint_store(name: str) -> CheckpointStore:
+    """
+    Get the checkpoint store for an agent.
+
+    Args:
+        name: Consumer name (usually the agent type); one database per consumer
+    """
+    base_dir = Path(os.getenv("EVENT_CHECKPOINT_DIR", "~/.archive-agents")).expanduser()
+    return CheckpointStore(base_dir / f"events-{name}.sqlite")
@@ -4,7 +4,7 @@ Configuration management for Archive Agents
 
 import os
 from enum import IntEnum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -17,6 +17,12 @@ class NetworkConfig:
     rpc_url: str
     chain_id: int
     explorer_url: str
+    ws_url: Optional[str] = None  # eth_subscribe endpoint for real-time events
+    rpc_urls: list[str] = field(default_factory=list)  # RPC pool (rpc_url first)
+
+    def __post_init__(self):
+        if not self.rpc_urls:
+            self.rpc_urls = [self.rpc_url]
 
 
 @dataclass
@@ -38,11 +44,21 @@ class AgentEndpoints:
     caller: str
 
 
+# NEOX_RPC_URL may list several endpoints, comma-separated (empty means the default)
+_DEFAULT_TESTNET_RPC_URL = "https://testnet.rpc.banelabs.org"
+_testnet_rpc_urls = [
+    url.strip()
+    for url in os.getenv("NEOX_RPC_URL", _DEFAULT_TESTNET_RPC_URL).split(",")
+    if url.strip()
+] or [_DEFAULT_TESTNET_RPC_URL]
+
 # Network configurations
 NEOX_TESTNET = NetworkConfig(
-    rpc_url=os.getenv("NEOX_RPC_URL", "https://testnet.rpc.banelabs.org"),
+    rpc_url=_testnet_rpc_urls[0],
+    rpc_urls=_testnet_rpc_urls,
     chain_id=12227332,
     explorer_url="https://xt4scan.ngd.network",
+    ws_url=os.getenv("NEOX_WS_URL"),
 )
 
 NEOX_MAINNET = NetworkConfig(
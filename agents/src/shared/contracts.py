@@ -2,10 +2,33 @@
 Web3 Contract Interactions for Archive Agents
 
 Connects to deployed contracts on NeoX blockchain.
+
+ABIs are parsed once per process, the RPC endpoint list gets one shared HTTP
+provider (routed across endpoints by rpc_pool.py, with keep-alive sessions),
+and ContractInstances are cached per signing key, so repeated get_contracts()
+calls on tool hot paths cost a dict lookup.
+
+Nonces come from a per-account NonceManager and receipts are awaited on a
+background pool, so send_place_bid() / send_accept_bid() /
+send_submit_delivery() can put many transactions in flight back-to-back.
+Gas limits are learned per contract method from receipts and the gas price
+is cached for a few blocks (see gas.py); pass priority=True to outbid the
+node's price for time-critical transactions. Async agent code uses
+send_async() / call_async() so RPC and mining never block the event loop.
+Reads of many jobs, bids or registry records go out as one JSON-RPC batch
+(get_jobs(), get_bids_for_jobs(), get_job_records()), with job reads folded
+into OrderBook.getJobs calls, and are served from an event-invalidated cache
+(see view_cache.py). get_open_jobs() / get_bids_page() page through the open
+market and a job's bids without knowing job ids up front.
 """
 
 import os
 import json
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Optional, Any, Callable
 from dataclasses import dataclass
@@ -16,11 +39,18 @@ from eth_account import Account
 from eth_account.signers.local import LocalAccount
 
 from .config import get_network, get_contract_addresses, ContractAddresses
+from .nonce import get_nonce_manager, is_already_known
+from .gas import gas_estimator, get_gas_price_oracle
+from .rpc_pool import PooledHTTPProvider, get_rpc_pool, split_rpc_urls
+from .view_cache import view_cache, JOB, REGISTRY
+
+logger = logging.getLogger(__name__)
 
 
 # Load ABIs from contracts directory
+@lru_cache(maxsize=None)
 def load_abi(contract_name: str) -> list:
-    """Load ABI from the contracts integrations folder"""
+    """Load ABI from the contracts integrations folder (parsed once per process)"""
     abi_path = Path(__file__).parent.parent.parent.parent / "contracts" / "integrations" / "spoon" / "abi" / f"{contract_name}.json"
     if abi_path.exists():
         with open(abi_path, "r") as f:
@@ -34,6 +64,35 @@ def load_abi(contract_name: str) -> list:
     raise FileNotFoundError(f"ABI not found: {abi_path}")
 
 
+# Event layouts of OrderBook deployments from before JobPosted carried the job
+# metadata and BidAccepted the price (different topic0). Listeners decode both
+# until every deployment has been upgraded.
+LEGACY_EVENT_ABIS: dict[str, list[dict]] = {
+    "OrderBook": [
+        {
+            "anonymous": False,
+            "type": "event",
+            "name": "JobPosted",
+            "inputs": [
+                {"indexed": True, "internalType": "uint256", "name": "jobId", "type": "uint256"},
+                {"indexed": True, "internalType": "address", "name": "poster", "type": "address"},
+            ],
+        },
+        {
+            "anonymous": False,
+            "type": "event",
+            "name": "BidAccepted",
+            "inputs": [
+                {"indexed": True, "internalType": "uint256", "name": "jobId", "type": "uint256"},
+                {"indexed": True, "internalType": "uint256", "name": "bidId", "type": "uint256"},
+                {"indexed": False, "internalType": "address", "name": "poster", "type": "address"},
+                {"indexed": False, "internalType": "address", "name": "agent", "type": "address"},
+            ],
+        },
+    ],
+}
+
+
 @dataclass
 class ContractInstances:
     """Container for all contract instances"""
@@ -48,17 +107,51 @@ class ContractInstances:
     addresses: ContractAddresses
 
 
+# Process-wide caches, keyed by RPC URL and (private key, RPC URL)
+_contracts_cache: dict[tuple[Optional[str], str], ContractInstances] = {}
+_contracts_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_http_provider(rpc_url: str) -> Web3.HTTPProvider:
+    """Shared HTTP provider for an RPC URL or comma-separated endpoint list,
+    routed through the list's RpcPool (see rpc_pool.py)"""
+    return PooledHTTPProvider(get_rpc_pool(split_rpc_urls(rpc_url)))
+
+
 def get_contracts(private_key: Optional[str] = None) -> ContractInstances:
     """
     Get contract instances for the specified network.
     
+    Instances are cached per private key and RPC URL; every key shares the
+    URL's HTTP provider but gets its own Web3 (default account).
+    
     Args:
         private_key: Optional private key for signing transactions
         
     Returns:
         ContractInstances with all contract connections
     """
-    network = get_network()
+    rpc_url = ",".join(get_network().rpc_urls)
+    key = (private_key, rpc_url)
+    cached = _contracts_cache.get(key)
+    if cached:
+        return cached
+    
+    with _contracts_lock:
+        if key not in _contracts_cache:
+            _contracts_cache[key] = _build_contracts(private_key, rpc_url)
+        return _contracts_cache[key]
+
+
+def clear_contracts_cache():
+    """Drop cached ContractInstances (e.g. after contract addresses change)"""
+    with _contracts_lock:
+        _contracts_cache.clear()
+
+
+def _build_contracts(private_key: Optional[str], rpc_url: str) -> ContractInstances:
+    """Connect to every contract for one signing key"""
     addresses = get_contract_addresses()
     
     # Validate addresses
@@ -68,8 +161,8 @@ def get_contracts(private_key: Optional[str] = None) -> ContractInstances:
             "Please deploy contracts first and set environment variables."
         )
     
-    # Create Web3 instance
-    w3 = Web3(Web3.HTTPProvider(network.rpc_url))
+    # Create Web3 instance on the shared provider
+    w3 = Web3(get_http_provider(rpc_url))
     
     # Set up account if private key provided
     account = None
@@ -128,30 +221,52 @@ def send_transaction(
     contracts: ContractInstances,
     contract_func: Any,
     *args,
+    priority: bool = False,
     **kwargs
 ) -> str:
     """
     Build, sign, and send a transaction.
     
+    The nonce is allocated locally by the account's NonceManager, so this
+    returns as soon as the node accepts the transaction.
+    
     Returns:
         Transaction hash
     """
+    tx_hash, _ = _send(contracts, contract_func(*args, **kwargs), priority)
+    return tx_hash
+
+
+def _send(contracts: ContractInstances, call: Any, priority: bool) -> tuple[str, int]:
+    """Send a bound contract call; returns (tx hash, gas limit used)"""
     if not contracts.account:
         raise ValueError("No account configured for signing transactions")
     
-    # Build transaction
-    tx = contract_func(*args, **kwargs).build_transaction({
-        'from': contracts.account.address,
-        'nonce': contracts.w3.eth.get_transaction_count(contracts.account.address),
-        'gas': 500000,
-        'gasPrice': contracts.w3.eth.gas_price,
-    })
+    account = contracts.account
+    w3 = contracts.w3
+    
+    # Price and limit are settled before taking the account's nonce lock
+    gas_limit = gas_estimator.estimate(call, account.address)
+    gas_price = get_gas_price_oracle(w3).gas_price(priority=priority)
     
-    # Sign and send
-    signed_tx = contracts.w3.eth.account.sign_transaction(tx, contracts.account.key)
-    tx_hash = contracts.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    def sign_and_send(nonce: int) -> str:
+        tx = call.build_transaction({
+            'from': account.address,
+            'nonce': nonce,
+            'gas': gas_limit,
+            'gasPrice': gas_price,
+        })
+        signed_tx = w3.eth.account.sign_transaction(tx, account.key)
+        try:
+            tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            # A retried send of a transaction the node already has
+            if not is_already_known(e):
+                raise
+            tx_hash = signed_tx.hash
+        return tx_hash.hex()
     
-    return tx_hash.hex()
+    return get_nonce_manager(w3, account.address).submit(sign_and_send), gas_limit
 
 
 def wait_for_receipt(contracts: ContractInstances, tx_hash: str, timeout: int = 120):
@@ -159,6 +274,83 @@ def wait_for_receipt(contracts: ContractInstances, tx_hash: str, timeout: int =
     return contracts.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
 
 
+# Background receipt tracking for pipelined sends
+_receipt_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="receipts")
+
+
+class PendingTransaction:
+    """
+    A sent transaction whose receipt is awaited in the background.
+    
+    Usage:
+        pending = send_place_bid(contracts, job_id, amount, eta, uri)
+        ...                       # send more transactions meanwhile
+        bid_id = pending.result()  # blocks until mined
+        bid_id = await pending.wait()  # or, from async code
+    """
+    
+    def __init__(self, tx_hash: str, future: Future):
+        self.tx_hash = tx_hash
+        self.future = future
+    
+    def done(self) -> bool:
+        """Whether the receipt has arrived (or waiting failed)"""
+        return self.future.done()
+    
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """Block until mined; returns the parsed result (or the receipt)"""
+        return self.future.result(timeout)
+    
+    async def wait(self) -> Any:
+        """Await mining without blocking the event loop"""
+        return await asyncio.wrap_future(self.future)
+    
+    def __repr__(self) -> str:
+        return f"PendingTransaction({self.tx_hash[:10]}..., done={self.done()})"
+
+
+def submit_transaction(
+    contracts: ContractInstances,
+    contract_func: Any,
+    *args,
+    parse: Optional[Callable[[Any], Any]] = None,
+    timeout: int = 120,
+    priority: bool = False,
+) -> PendingTransaction:
+    """
+    Send a transaction and track its receipt in the background.
+    
+    Args:
+        contracts: Contract instances with a signing account
+        contract_func: Contract function to call (e.g. order_book.functions.placeBid)
+        *args: Arguments for the contract function
+        parse: Optional receipt -> result function run once mined
+        timeout: Seconds to wait for the receipt
+        priority: Pay above the cached gas price to get mined sooner
+    
+    Returns:
+        PendingTransaction resolving to parse(receipt), or the receipt
+    """
+    call = contract_func(*args)
+    tx_hash, gas_limit = _send(contracts, call, priority)
+    
+    def track():
+        try:
+            receipt = wait_for_receipt(contracts, tx_hash, timeout=timeout)
+        except Exception:
+            # Possibly dropped; don't keep building on a nonce the node may not have
+            logger.warning(f"No receipt for {tx_hash}; resyncing nonce")
+            get_nonce_manager(contracts.w3, contracts.account.address).resync()
+            raise
+        gas_estimator.record(call, receipt, gas_limit)
+        # OrderBook writes take the job ID first; don't serve our own stale reads
+        if call.address == contracts.order_book.address and args and isinstance(args[0], int):
+            view_cache.invalidate(args[0])
+        return parse(receipt) if parse else receipt
+    
+    return PendingTransaction(tx_hash, _receipt_executor.submit(track))
+
+
 # High-level contract operations
 
 def approve_usdc(
@@ -167,119 +359,183 @@ def approve_usdc(
     amount: int
 ) -> str:
     """Approve spender to spend USDC"""
-    tx_hash = send_transaction(
+    pending = submit_transaction(
         contracts,
         contracts.usdc.functions.approve,
         Web3.to_checksum_address(spender),
         amount
     )
-    wait_for_receipt(contracts, tx_hash)
-    return tx_hash
+    pending.result()
+    return pending.tx_hash
 
 
-def post_job(
+def send_post_job(
     contracts: ContractInstances,
     description: str,
     metadata_uri: str,
     tags: list[str],
     deadline: int
-) -> int:
+) -> PendingTransaction:
     """
-    Post a new job to the OrderBook.
+    Post a job without waiting for it to be mined.
     
     Returns:
-        Job ID
+        PendingTransaction resolving to the job ID
     """
-    tx_hash = send_transaction(
+    def parse(receipt) -> int:
+        logs = contracts.order_book.events.JobPosted().process_receipt(receipt)
+        if logs:
+            return logs[0]['args']['jobId']
+        raise ValueError("JobPosted event not found in receipt")
+    
+    return submit_transaction(
         contracts,
         contracts.order_book.functions.postJob,
         description,
         metadata_uri,
         tags,
-        deadline
+        deadline,
+        parse=parse,
     )
-    receipt = wait_for_receipt(contracts, tx_hash)
+
+
+def post_job(
+    contracts: ContractInstances,
+    description: str,
+    metadata_uri: str,
+    tags: list[str],
+    deadline: int
+) -> int:
+    """
+    Post a new job to the OrderBook.
     
-    # Parse JobPosted event
-    logs = contracts.order_book.events.JobPosted().process_receipt(receipt)
-    if logs:
-        return logs[0]['args']['jobId']
-    raise ValueError("JobPosted event not found in receipt")
+    Returns:
+        Job ID
+    """
+    return send_post_job(contracts, description, metadata_uri, tags, deadline).result()
 
 
-def place_bid(
+def send_place_bid(
     contracts: ContractInstances,
     job_id: int,
     amount: int,
     estimated_time: int,
-    metadata_uri: str
-) -> int:
+    metadata_uri: str,
+    priority: bool = False
+) -> PendingTransaction:
     """
-    Place a bid on a job.
+    Send a bid without waiting for it to be mined.
+    
+    Set priority for time-critical bids: the gas price is raised by
+    GAS_PRIORITY_MULTIPLIER over the cached node price.
     
     Returns:
-        Bid ID
+        PendingTransaction resolving to the bid ID
     """
-    tx_hash = send_transaction(
+    def parse(receipt) -> int:
+        logs = contracts.order_book.events.BidPlaced().process_receipt(receipt)
+        if logs:
+            return logs[0]['args']['bidId']
+        raise ValueError("BidPlaced event not found in receipt")
+    
+    return submit_transaction(
         contracts,
         contracts.order_book.functions.placeBid,
         job_id,
         amount,
         estimated_time,
-        metadata_uri
+        metadata_uri,
+        parse=parse,
+        priority=priority,
     )
-    receipt = wait_for_receipt(contracts, tx_hash)
+
+
+def place_bid(
+    contracts: ContractInstances,
+    job_id: int,
+    amount: int,
+    estimated_time: int,
+    metadata_uri: str,
+    priority: bool = False
+) -> int:
+    """
+    Place a bid on a job.
     
-    # Parse BidPlaced event
-    logs = contracts.order_book.events.BidPlaced().process_receipt(receipt)
-    if logs:
-        return logs[0]['args']['bidId']
-    raise ValueError("BidPlaced event not found in receipt")
+    Returns:
+        Bid ID
+    """
+    return send_place_bid(
+        contracts, job_id, amount, estimated_time, metadata_uri, priority=priority
+    ).result()
 
 
-def accept_bid(
+def send_accept_bid(
     contracts: ContractInstances,
     job_id: int,
     bid_id: int,
     response_uri: str
-) -> str:
-    """Accept a bid and start work"""
-    tx_hash = send_transaction(
+) -> PendingTransaction:
+    """Send an acceptBid without waiting for it to be mined"""
+    return submit_transaction(
         contracts,
         contracts.order_book.functions.acceptBid,
         job_id,
         bid_id,
         response_uri
     )
-    wait_for_receipt(contracts, tx_hash)
-    return tx_hash
 
 
-def submit_delivery(
+def accept_bid(
     contracts: ContractInstances,
     job_id: int,
-    proof_hash: bytes
+    bid_id: int,
+    response_uri: str
 ) -> str:
-    """Submit delivery proof"""
-    tx_hash = send_transaction(
+    """Accept a bid and start work"""
+    pending = send_accept_bid(contracts, job_id, bid_id, response_uri)
+    pending.result()
+    return pending.tx_hash
+
+
+def send_submit_delivery(
+    contracts: ContractInstances,
+    job_id: int,
+    proof_hash: bytes
+) -> PendingTransaction:
+    """Send a delivery proof without waiting for it to be mined"""
+    return submit_transaction(
         contracts,
         contracts.order_book.functions.submitDelivery,
         job_id,
         proof_hash
     )
-    wait_for_receipt(contracts, tx_hash)
-    return tx_hash
 
 
-def approve_delivery(contracts: ContractInstances, job_id: int) -> str:
-    """Approve delivery and release payment"""
-    tx_hash = send_transaction(
+def submit_delivery(
+    contracts: ContractInstances,
+    job_id: int,
+    proof_hash: bytes
+) -> str:
+    """Submit delivery proof"""
+    pending = send_submit_delivery(contracts, job_id, proof_hash)
+    pending.result()
+    return pending.tx_hash
+
+
+def send_approve_delivery(contracts: ContractInstances, job_id: int) -> PendingTransaction:
+    """Send a delivery approval without waiting for it to be mined"""
+    return submit_transaction(
         contracts,
         contracts.order_book.functions.approveDelivery,
         job_id
     )
-    wait_for_receipt(contracts, tx_hash)
-    return tx_hash
+
+
+def approve_delivery(contracts: ContractInstances, job_id: int) -> str:
+    """Approve delivery and release payment"""
+    pending = send_approve_delivery(contracts, job_id)
+    pending.result()
+    return pending.tx_hash
 
 
 def register_agent(
@@ -289,15 +545,15 @@ def register_agent(
     capabilities: list[str]
 ) -> str:
     """Register as an agent"""
-    tx_hash = send_transaction(
+    pending = submit_transaction(
         contracts,
         contracts.agent_registry.functions.registerAgent,
         name,
         endpoint,
         capabilities
     )
-    wait_for_receipt(contracts, tx_hash)
-    return tx_hash
+    pending.result()
+    return pending.tx_hash
 
 
 def is_agent_active(contracts: ContractInstances, address: str) -> bool:
@@ -308,15 +564,275 @@ def is_agent_active(contracts: ContractInstances, address: str) -> bool:
 
 
 def get_job(contracts: ContractInstances, job_id: int) -> dict:
-    """Get job details"""
-    return contracts.order_book.functions.getJob(job_id).call()
+    """Get job details (served from the view cache when fresh)"""
+    return view_cache.get(JOB, job_id, lambda: contracts.order_book.functions.getJob(job_id).call())
 
 
 def get_bids_for_job(contracts: ContractInstances, job_id: int) -> list:
     """Get all bids for a job"""
     # OrderBook.getJob returns (JobState, Bid[])
-    result = contracts.order_book.functions.getJob(job_id).call()
-    return result[1]  # Return the bids array
+    return get_job(contracts, job_id)[1]  # Return the bids array
+
+
+def get_registry_job(contracts: ContractInstances, job_id: int) -> Any:
+    """JobRegistry record (metadata URI, tags, ...) for a job, via the view cache"""
+    return view_cache.get(REGISTRY, job_id, lambda: contracts.job_registry.functions.getJob(job_id).call())
+
+
+# Batched reads
+#
+# Many view calls go out as one JSON-RPC batch instead of one round trip
+# each. Batching flips a flag on the provider, so batches run on a
+# per-thread provider rather than the process-wide one; nodes that reject
+# batches (or a batch with a reverting item) fall back to sequential calls.
+
+RPC_BATCH_SIZE = int(os.getenv("RPC_BATCH_SIZE", "50"))
+_batch_local = threading.local()
+
+
+def _batch_contract(contracts: ContractInstances, contract: Contract) -> Contract:
+    """The same contract bound to this thread's batching Web3"""
+    rpc_url = getattr(contracts.w3.provider, "endpoint_uri", None) or ",".join(get_network().rpc_urls)
+    state = vars(_batch_local)
+    web3s = state.setdefault("web3s", {})
+    bound = state.setdefault("contracts", {})
+    key = (rpc_url, contract.address)
+    if key not in bound:
+        if rpc_url not in web3s:
+            # Own provider, shared pool: batches still route and fail over
+            web3s[rpc_url] = Web3(PooledHTTPProvider(get_rpc_pool(split_rpc_urls(rpc_url))))
+        bound[key] = web3s[rpc_url].eth.contract(address=contract.address, abi=contract.abi)
+    return bound[key]
+
+
+def batch_call(
+    contracts: ContractInstances,
+    calls: list[tuple[Contract, str, tuple]],
+) -> list[Any]:
+    """
+    Run many view calls in as few JSON-RPC requests as possible.
+    
+    Args:
+        contracts: Contract instances (for the RPC endpoint)
+        calls: (contract, function name, args) triples
+    
+    Returns:
+        Results in call order; a call that failed yields its exception
+    """
+    results: list[Any] = []
+    for start in range(0, len(calls), RPC_BATCH_SIZE):
+        chunk = calls[start:start + RPC_BATCH_SIZE]
+        try:
+            w3 = _batch_contract(contracts, chunk[0][0]).w3
+            with w3.batch_requests() as batch:
+                for contract, fn_name, args in chunk:
+                    batch.add(_batch_contract(contracts, contract).functions[fn_name](*args))
+                results.extend(batch.execute())
+            continue
+        except Exception as e:
+            logger.debug(f"Batch of {len(chunk)} calls failed ({e}); calling one by one")
+        for contract, fn_name, args in chunk:
+            try:
+                results.append(contract.functions[fn_name](*args).call())
+            except Exception as e:
+                results.append(e)
+    return results
+
+
+def _view_calls(contracts: ContractInstances) -> dict[str, tuple[Contract, str]]:
+    """Contract function behind each cached view kind"""
+    return {
+        JOB: (contracts.order_book, "getJob"),
+        REGISTRY: (contracts.job_registry, "getJob"),
+    }
+
+
+def _has_function(contract: Contract, name: str) -> bool:
+    """Whether the contract's ABI declares a function"""
+    return any(item.get("type") == "function" and item.get("name") == name for item in contract.abi)
+
+
+def _load_views(contracts: ContractInstances, views: list[tuple[str, int]]) -> list[Any]:
+    """
+    Fetch views from the chain in one JSON-RPC batch.
+    
+    Job views go out as OrderBook.getJobs calls of up to RPC_BATCH_SIZE ids
+    each rather than one getJob per job. A getJobs call that fails (e.g. an
+    OrderBook deployed before the batch views) is retried as single getJob
+    calls.
+    
+    Returns:
+        Results in view order; a read that failed yields its exception
+    """
+    calls = _view_calls(contracts)
+    job_slots = [i for i, (kind, _) in enumerate(views) if kind == JOB]
+    if len(job_slots) < 2 or not _has_function(contracts.order_book, "getJobs"):
+        job_slots = []
+    chunks = [job_slots[start:start + RPC_BATCH_SIZE] for start in range(0, len(job_slots), RPC_BATCH_SIZE)]
+    batched = set(job_slots)
+    singles = [i for i in range(len(views)) if i not in batched]
+    
+    loaded = batch_call(
+        contracts,
+        [(contracts.order_book, "getJobs", ([views[i][1] for i in chunk],)) for chunk in chunks]
+        + [(*calls[views[i][0]], (views[i][1],)) for i in singles],
+    )
+    results: list[Any] = [None] * len(views)
+    for i, value in zip(singles, loaded[len(chunks):]):
+        results[i] = value
+    for chunk, value in zip(chunks, loaded):
+        if isinstance(value, Exception):
+            logger.debug(f"getJobs for {len(chunk)} jobs failed ({value}); falling back to getJob")
+            value = batch_call(contracts, [(*calls[JOB], (views[i][1],)) for i in chunk])
+            for i, job in zip(chunk, value):
+                results[i] = job
+            continue
+        # getJobs returns (JobState[], Bid[][]); split it back into getJob's (JobState, Bid[])
+        states, bids = value
+        for i, state, job_bids in zip(chunk, states, bids):
+            results[i] = [state, job_bids]
+    return results
+
+
+def _get_views(contracts: ContractInstances, views: list[tuple[str, int]]) -> list[Any]:
+    """Cached views, with every miss fetched in one batch; failed reads are None"""
+    results: list[Any] = [None] * len(views)
+    misses: list[tuple[int, int]] = []  # (index, generation)
+    for i, (kind, job_id) in enumerate(views):
+        found, value, generation = view_cache.lookup(kind, job_id)
+        if found:
+            results[i] = value
+        else:
+            misses.append((i, generation))
+    
+    if misses:
+        loaded = _load_views(contracts, [views[i] for i, _ in misses])
+        for (i, generation), value in zip(misses, loaded):
+            if isinstance(value, Exception):
+                continue
+            kind, job_id = views[i]
+            view_cache.store(kind, job_id, value, generation)
+            results[i] = value
+    return results
+
+
+def get_jobs(contracts: ContractInstances, job_ids: list[int]) -> dict[int, Any]:
+    """OrderBook.getJob results for many jobs in one request; unreadable jobs are omitted"""
+    results = _get_views(contracts, [(JOB, job_id) for job_id in job_ids])
+    return {
+        job_id: result for job_id, result in zip(job_ids, results)
+        if result is not None
+    }
+
+
+def get_bids_for_jobs(contracts: ContractInstances, job_ids: list[int]) -> dict[int, list]:
+    """Bids of many jobs in one batch"""
+    return {job_id: job[1] for job_id, job in get_jobs(contracts, job_ids).items()}
+
+
+def get_job_records(
+    contracts: ContractInstances,
+    job_ids: list[int]
+) -> dict[int, tuple[Any, Any]]:
+    """
+    OrderBook and JobRegistry records for many jobs in one batch.
+    
+    Returns:
+        job_id -> (OrderBook.getJob, JobRegistry.getJob); either side is
+        None if that read failed
+    """
+    views = [(kind, job_id) for job_id in job_ids for kind in (JOB, REGISTRY)]
+    results = _get_views(contracts, views)
+    return {
+        job_id: (results[2 * i], results[2 * i + 1])
+        for i, job_id in enumerate(job_ids)
+    }
+
+
+def get_open_jobs(
+    contracts: ContractInstances,
+    offset: int = 0,
+    limit: int = 100,
+) -> tuple[list[tuple[int, Any]], int]:
+    """
+    A page of OPEN jobs from OrderBook.getOpenJobs.
+    
+    Accepting a bid moves the last open job into the accepted job's slot, so
+    paging while bids are accepted may skip or repeat a job.
+    
+    Args:
+        contracts: Contract instances
+        offset: Index of the first open job to return
+        limit: Maximum number of jobs to return
+    
+    Returns:
+        ([(job_id, JobState), ...], total number of open jobs)
+    """
+    job_ids, states, total = contracts.order_book.functions.getOpenJobs(offset, limit).call()
+    return list(zip(job_ids, states)), total
+
+
+def get_all_open_jobs(contracts: ContractInstances, page_size: int = 100) -> list[tuple[int, Any]]:
+    """Every OPEN job, one getOpenJobs call per page_size jobs"""
+    jobs, total = get_open_jobs(contracts, 0, page_size)
+    while len(jobs) < total:
+        page, total = get_open_jobs(contracts, len(jobs), page_size)
+        if not page:
+            break
+        jobs.extend(page)
+    return jobs
+
+
+def get_bids_page(
+    contracts: ContractInstances,
+    job_id: int,
+    offset: int = 0,
+    limit: int = 50,
+) -> tuple[list, int]:
+    """
+    A page of a job's bids (in placement order) from OrderBook.getBidsPage.
+    
+    Returns:
+        (bids, total number of bids on the job)
+    """
+    bids, total = contracts.order_book.functions.getBidsPage(job_id, offset, limit).call()
+    return list(bids), total
+
+
+# Async contract operations
+#
+# Every helper above does blocking RPC. From async agent code, run them on
+# the contracts executor instead of the event loop:
+#
+#     pending = await send_async(send_place_bid, contracts, job_id, ...)
+#     bid_id = await pending.wait()
+#     job = await call_async(get_job, contracts, job_id)
+
+_contracts_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="contracts")
+
+
+async def call_async(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking contracts helper (read or write) off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_contracts_executor, partial(fn, *args, **kwargs))
+
+
+async def send_async(
+    send_fn: Callable[..., PendingTransaction],
+    *args,
+    **kwargs
+) -> PendingTransaction:
+    """
+    Send a transaction off the event loop.
+    
+    Resolves once the node has accepted the transaction (tx hash known);
+    await the returned PendingTransaction's wait() for the mined result.
+    
+    Args:
+        send_fn: A send_* helper (send_place_bid, send_post_job, ...)
+        *args: Its arguments, starting with the ContractInstances
+    """
+    return await call_async(send_fn, *args, **kwargs)
 
 
 def setup_event_listener(
@@ -0,0 +1,434 @@
+"""
+Bounded Event Dispatch for Archive Agents
+
+Decouples event ingestion from event handling. The EventListener parses
+logs and enqueues them here; a pool of consumer tasks per event type runs
+the agent callbacks. A slow callback (e.g. an LLM-driven bid decision)
+therefore no longer stalls polling, and queue depth / handler latency are
+tracked so backpressure is visible.
+
+When a queue is full the overflow policy decides what happens:
+- block: ingestion waits for room (no event is lost)
+- drop_oldest: the oldest queued event is discarded
+- spill: events overflow to a JSON-lines file and are read back in order
+
+Events can also be ordered by a key (the listener uses the job ID). Their
+turn is taken when they are put, which happens in chain order, so a
+BidAccepted never reaches its callbacks before the JobPosted for the same
+job, even though the two sit in different queues with several consumers.
+
+A failed handler is retried with exponential backoff. Once its attempts
+are used up the event is held: it stays pending, so the low watermark (and
+with it the listener's cursor) never moves past it and a restart delivers
+it again. Spill files left by a previous run are replayed on startup and
+only truncated once every event read from them has been handled.
+"""
+
+import json
+import time
+import asyncio
+import logging
+from collections import Counter, deque
+from dataclasses import dataclass, asdict, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(str, Enum):
+    """What to do when an event type's queue is full"""
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    SPILL = "spill"
+
+
+@dataclass
+class QueuedEvent:
+    """A parsed event waiting for its callbacks"""
+    event_type: str
+    payload: Any
+    tx_hash: str
+    log_index: int
+    block_number: int
+    block_hash: str = ""
+    # Read back from the spill file (not persisted)
+    from_spill: bool = field(default=False, compare=False)
+
+
+# Called with a queued event; returns True if every callback succeeded
+EventHandler = Callable[[QueuedEvent], Awaitable[bool]]
+
+# Events with the same key are handled one at a time, in the order they were put
+OrderKey = Callable[[QueuedEvent], Optional[Hashable]]
+
+
+class _KeyOrder:
+    """Per-key turns, handed out in the order events were put"""
+
+    def __init__(self, key: OrderKey):
+        self._key = key
+        self._lanes: dict[Hashable, deque[tuple[str, int]]] = {}
+        self._changed: dict[Hashable, asyncio.Event] = {}
+
+    def reserve(self, item: QueuedEvent):
+        key = self._key(item)
+        if key is not None:
+            self._lanes.setdefault(key, deque()).append((item.tx_hash, item.log_index))
+
+    async def wait(self, item: QueuedEvent):
+        """Wait until every event put before this one with the same key is done"""
+        key = self._key(item)
+        ident = (item.tx_hash, item.log_index)
+        # Spill entries replayed from a previous run hold no turn
+        while (lane := self._lanes.get(key)) and ident in lane and lane[0] != ident:
+            await self._changed.setdefault(key, asyncio.Event()).wait()
+
+    def release(self, item: QueuedEvent):
+        key = self._key(item)
+        lane = self._lanes.get(key)
+        if not lane:
+            return
+        try:
+            lane.remove((item.tx_hash, item.log_index))
+        except ValueError:
+            return
+        if not lane:
+            del self._lanes[key]
+        changed = self._changed.pop(key, None)
+        if changed:
+            changed.set()
+
+
+class _EventQueue:
+    """Bounded queue, consumer pool and metrics for one event type"""
+
+    def __init__(
+        self,
+        name: str,
+        handler: EventHandler,
+        decode: Callable[[dict], Any],
+        maxsize: int,
+        consumers: int,
+        overflow: OverflowPolicy,
+        spill_path: Optional[Path],
+        latency_window: int,
+        max_attempts: int,
+        retry_delay: float,
+        order: Optional[_KeyOrder] = None,
+    ):
+        self.name = name
+        self._handler = handler
+        self._decode = decode
+        self._queue: asyncio.Queue[QueuedEvent] = asyncio.Queue(maxsize=maxsize)
+        self._consumers = consumers
+        self._overflow = overflow
+        self._spill_path = spill_path
+        self._spill_offset = 0
+        self._max_attempts = max(1, max_attempts)
+        self._retry_delay = retry_delay
+        self._order = order
+        self._tasks: list[asyncio.Task] = []
+
+        # Blocks of events enqueued (or spilled) but not yet handled
+        self._pending_blocks: Counter[int] = Counter()
+        # Events read back from the spill file and not yet handled
+        self._unspilled = 0
+        # Events whose handler kept failing; pending until a restart redelivers them
+        self._held: list[QueuedEvent] = []
+
+        # Metrics
+        self.spilled = 0
+        self.dropped = 0
+        self.handled = 0
+        self.failed = 0
+        self.retried = 0
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+        if self._spill_path:
+            self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._replay_spill()
+
+    def _replay_spill(self):
+        """Pick up events a previous run spilled but never handled"""
+        if not self._spill_path.exists():
+            return
+        with self._spill_path.open() as f:
+            for line in f:
+                if line.strip():
+                    self._pending_blocks[json.loads(line)["block_number"]] += 1
+                    self.spilled += 1
+        if self.spilled:
+            logger.info(f"{self.name}: replaying {self.spilled} spilled events from {self._spill_path}")
+
+    def _ensure_consumers(self):
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._consume(), name=f"{self.name}-consumer-{i}")
+            for i in range(self._consumers)
+        ]
+
+    async def put(self, item: QueuedEvent):
+        self._ensure_consumers()
+        self._pending_blocks[item.block_number] += 1
+
+        if self._overflow == OverflowPolicy.SPILL and self._spill_path:
+            # Once spilling has started, keep FIFO order by appending behind it
+            if self.spilled or self._queue.full():
+                self._spill(item)
+                if self._queue.empty():
+                    self._refill()  # consumers may be idle on an empty queue
+                return
+            self._queue.put_nowait(item)
+            return
+
+        if self._overflow == OverflowPolicy.DROP_OLDEST:
+            while self._queue.full():
+                dropped = self._queue.get_nowait()
+                self._queue.task_done()
+                self._done(dropped)
+                self.dropped += 1
+                logger.warning(
+                    f"{self.name} queue full; dropped event from block {dropped.block_number} "
+                    f"tx={dropped.tx_hash}"
+                )
+            self._queue.put_nowait(item)
+            return
+
+        if self._queue.full():
+            logger.debug(f"{self.name} queue full; waiting for consumers")
+        await self._queue.put(item)
+
+    def _spill(self, item: QueuedEvent):
+        record = asdict(item)
+        record.pop("from_spill")
+        with self._spill_path.open("a") as f:
+            f.write(json.dumps(record) + "\n")
+        self.spilled += 1
+
+    def _refill(self):
+        """Move spilled events back into the queue while there is room"""
+        if not self.spilled:
+            return
+        with self._spill_path.open() as f:
+            f.seek(self._spill_offset)
+            while self.spilled and not self._queue.full():
+                line = f.readline()
+                if not line:
+                    break
+                record = json.loads(line)
+                record["payload"] = self._decode(record["payload"])
+                self._queue.put_nowait(QueuedEvent(**record, from_spill=True))
+                self.spilled -= 1
+                self._unspilled += 1
+            self._spill_offset = f.tell()
+
+    def _truncate_spill(self):
+        """Empty the spill file once nothing read from it is still unhandled"""
+        if self._spill_path and self._spill_offset and not self.spilled and not self._unspilled:
+            self._spill_path.write_text("")
+            self._spill_offset = 0
+
+    def _done(self, item: QueuedEvent):
+        if self._order:
+            self._order.release(item)
+        if item.from_spill:
+            self._unspilled -= 1
+            self._truncate_spill()
+        self._pending_blocks[item.block_number] -= 1
+        if self._pending_blocks[item.block_number] <= 0:
+            del self._pending_blocks[item.block_number]
+
+    async def _attempt(self, item: QueuedEvent) -> bool:
+        started = time.perf_counter()
+        try:
+            return await self._handler(item)
+        except Exception as e:
+            logger.error(f"Error handling {self.name} event: {e}")
+            return False
+        finally:
+            self._latencies.append(time.perf_counter() - started)
+
+    async def _consume(self):
+        while True:
+            if self._queue.empty():
+                self._refill()
+            item = await self._queue.get()
+            self._refill()
+            try:
+                if self._order:
+                    await self._order.wait(item)
+                for attempt in range(1, self._max_attempts + 1):
+                    if await self._attempt(item):
+                        self.handled += 1
+                        self._done(item)
+                        break
+                    if attempt < self._max_attempts:
+                        self.retried += 1
+                        await asyncio.sleep(self._retry_delay * 2 ** (attempt - 1))
+                else:
+                    # Keep it pending so the cursor stays below it
+                    self.failed += 1
+                    self._held.append(item)
+                    if self._order:
+                        self._order.release(item)  # later events for its key go ahead
+                    logger.error(
+                        f"{self.name} event from block {item.block_number} tx={item.tx_hash} failed "
+                        f"{self._max_attempts} times; holding the cursor below it until restart"
+                    )
+            finally:
+                self._queue.task_done()
+
+    def low_watermark(self) -> Optional[int]:
+        """Lowest block with an event still waiting to be handled"""
+        return min(self._pending_blocks) if self._pending_blocks else None
+
+    async def join(self):
+        if self.spilled:
+            self._ensure_consumers()
+        # Held events stay pending but will not be retried by this process
+        while self._queue.qsize() or self.spilled or sum(self._pending_blocks.values()) > len(self._held):
+            await self._queue.join()
+            self._refill()
+            await asyncio.sleep(0)
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def metrics(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def pct(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * (len(latencies) - 1)))] * 1000
+
+        return {
+            "depth": self._queue.qsize(),
+            "spilled": self.spilled,
+            "capacity": self._queue.maxsize,
+            "consumers": self._consumers,
+            "handled": self.handled,
+            "failed": self.failed,
+            "retried": self.retried,
+            "held": len(self._held),
+            "dropped": self.dropped,
+            "latency_ms_p50": round(pct(0.50), 2),
+            "latency_ms_p99": round(pct(0.99), 2),
+            "latency_ms_max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+
+
+class EventDispatcher:
+    """
+    Per-event-type bounded queues drained by consumer pools.
+
+    Usage:
+        dispatcher = EventDispatcher(handle_event, maxsize=1000, consumers=2)
+        dispatcher.register("JobPosted", JobPostedEvent)
+        await dispatcher.put(QueuedEvent("JobPosted", parsed, tx_hash, 0, block))
+
+    With order_key, events sharing a key are handled one at a time in put
+    order, across all event types.
+    """
+
+    def __init__(
+        self,
+        handler: EventHandler,
+        maxsize: int = 1_000,
+        consumers: int = 1,
+        overflow: OverflowPolicy | str = OverflowPolicy.BLOCK,
+        spill_dir: Optional[str | Path] = None,
+        latency_window: int = 512,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+        order_key: Optional[OrderKey] = None,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            handler: Async function running the callbacks for one event
+            maxsize: Queue capacity per event type
+            consumers: Consumer tasks per event type (1 keeps events in order)
+            overflow: Policy when a queue is full (block, drop_oldest, spill)
+            spill_dir: Directory for spill files (required for the spill policy)
+            latency_window: Recent handler timings kept for percentiles
+            max_attempts: Handler attempts per event before it is held
+            retry_delay: Seconds before the first retry, doubled on each further one
+            order_key: Key (or None) of an event; same-key events are handled in put order
+        """
+        self._handler = handler
+        self.maxsize = maxsize
+        self.consumers = consumers
+        self.overflow = OverflowPolicy(overflow)
+        self.spill_dir = Path(spill_dir).expanduser() if spill_dir else None
+        self.latency_window = latency_window
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._order = _KeyOrder(order_key) if order_key else None
+        self._queues: dict[str, _EventQueue] = {}
+
+        if self.overflow == OverflowPolicy.SPILL and not self.spill_dir:
+            raise ValueError("spill overflow policy requires spill_dir")
+
+    def register(self, event_type: str, payload_type: Callable[..., Any]):
+        """
+        Create the queue for an event type.
+
+        Args:
+            event_type: Event name
+            payload_type: Dataclass of the parsed event (used to reload spilled events)
+        """
+        if event_type in self._queues:
+            return
+        spill_path = self.spill_dir / f"{event_type}.spill.jsonl" if self.spill_dir else None
+        self._queues[event_type] = _EventQueue(
+            name=event_type,
+            handler=self._handler,
+            decode=lambda payload: payload_type(**payload),
+            maxsize=self.maxsize,
+            consumers=self.consumers,
+            overflow=self.overflow,
+            spill_path=spill_path,
+            latency_window=self.latency_window,
+            max_attempts=self.max_attempts,
+            retry_delay=self.retry_delay,
+            order=self._order,
+        )
+
+    def start(self):
+        """Start consumers for queues that replayed spilled events"""
+        for queue in self._queues.values():
+            if queue.spilled:
+                queue._refill()
+                queue._ensure_consumers()
+
+    async def put(self, item: QueuedEvent):
+        """Enqueue an event, applying the overflow policy if its queue is full"""
+        if self._order:
+            self._order.reserve(item)
+        await self._queues[item.event_type].put(item)
+
+    def low_watermark(self, event_type: str) -> Optional[int]:
+        """Lowest block with an unhandled event of this type, if any"""
+        queue = self._queues.get(event_type)
+        return queue.low_watermark() if queue else None
+
+    async def join(self):
+        """Wait until every queued event has been handled"""
+        for queue in self._queues.values():
+            await queue.join()
+
+    def stop(self):
+        """Cancel all consumer tasks"""
+        for queue in self._queues.values():
+            queue.stop()
+
+    def metrics(self) -> dict[str, dict]:
+        """Queue depth, counters and handler latency per event type"""
+        return {name: queue.metrics() for name, queue in self._queues.items()}
@@ -0,0 +1,244 @@
+"""
+Event Hub for Co-located Archive Agents
+
+One process polls (or subscribes to) the OrderBook and fans decoded events
+out to every local agent over a Unix socket, so RPC load no longer scales
+with the number of agents on a host. Agents opt in with
+EventListener(source="hub") or EVENT_SOURCE=hub; their callback API is
+unchanged.
+
+Protocol (JSON lines):
+- hub -> agent on connect: {"kind": "hello", "oldest_block": N}
+- agent -> hub: {"types": ["JobPosted", ...], "from": {"JobPosted": block, ...}}
+- hub -> agent: {"kind": "event", "event_type", "payload", "tx_hash",
+  "log_index", "block_number", "block_hash"}
+- hub -> agent: {"kind": "progress", "head": block, "blocks": {"JobPosted": block, ...}}
+- hub -> agent: {"kind": "reorg", "fork": block}
+
+The hub keeps a bounded backlog of recent events and replays everything
+after the agent's per-type blocks on connect; older gaps are backfilled by
+the agent itself from RPC. A client that stops reading is disconnected once
+its queue fills, and catches up the same way when it reconnects.
+
+The hub streams events at the shallowest depth any agent uses. Each agent
+holds back events until they are as deep as its own confirmations for that
+event type, measured against the head in progress messages, so per-agent
+depths (e.g. 3 blocks for BidAccepted) still apply in hub mode.
+
+Usage:
+    python -m agents hub
+"""
+
+import os
+import json
+import asyncio
+import logging
+from collections import deque
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from .events import EventListener, EventType, EVENT_PAYLOADS, DEFAULT_CONFIRMATIONS
+from .dispatch import QueuedEvent
+from .checkpoint import get_checkpoint_store
+
+logger = logging.getLogger(__name__)
+
+# Depth the hub streams at; agents wait for their own (deeper) depth themselves
+HUB_CONFIRMATIONS = DEFAULT_CONFIRMATIONS
+
+
+class _HubClient:
+    """Outgoing queue and event filter for one connected agent"""
+
+    def __init__(self, types: set[str], maxsize: int):
+        self.types = types
+        self.queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=maxsize)
+
+    def send(self, line: bytes) -> bool:
+        """Queue a line; False (and a disconnect sentinel) if the client fell behind"""
+        try:
+            self.queue.put_nowait(line)
+            return True
+        except asyncio.QueueFull:
+            self.close()
+            return False
+
+    def close(self):
+        """Drop anything pending and tell the writer to disconnect"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class EventHub(EventListener):
+    """
+    Single RPC consumer that serves decoded events to local agents.
+
+    Usage:
+        hub = EventHub(checkpoint=get_checkpoint_store("hub"))
+        await hub.run()
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        replay_size: int = 10_000,
+        client_queue_size: int = 10_000,
+        **kwargs
+    ):
+        """
+        Initialize the hub.
+
+        Args:
+            socket_path: Unix socket to serve on (EVENT_HUB_SOCKET)
+            replay_size: Recent events kept for agents that (re)connect
+            client_queue_size: Lines buffered per agent before it is dropped
+            **kwargs: Passed to EventListener (poll_interval, ws_url, checkpoint, ...)
+        """
+        kwargs.setdefault("confirmations", HUB_CONFIRMATIONS)
+        super().__init__(source="rpc", hub_socket=socket_path, **kwargs)
+        self.replay_size = replay_size
+        self.client_queue_size = client_queue_size
+        self._backlog: deque[QueuedEvent] = deque()
+        self._head: Optional[int] = None
+        self._replay_from: Optional[int] = None
+        self._clients: set[_HubClient] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # ==========================================================================
+    # LISTENER HOOKS
+    # ==========================================================================
+
+    def _wants(self, event_type: EventType) -> bool:
+        """The hub fetches every parsed event type, whoever is connected"""
+        return event_type in EVENT_PAYLOADS
+
+    def _init_last_blocks(self, safe: dict[EventType, int], blocks_back: int):
+        super()._init_last_blocks(safe, blocks_back)
+        if self._replay_from is None and self._last_blocks:
+            self._replay_from = min(self._last_blocks.values()) + 1
+
+    async def _deliver(self, item: QueuedEvent):
+        """Keep the event for replay and send it to connected agents"""
+        if len(self._backlog) >= self.replay_size:
+            evicted = self._backlog.popleft()
+            self._replay_from = evicted.block_number + 1
+        self._backlog.append(item)
+        self._broadcast({"kind": "event", **asdict(item)}, item.event_type)
+
+    async def _scan(self, head: int, blocks_back: int):
+        self._head = head
+        await super()._scan(head, blocks_back)
+        self._broadcast(self._progress())
+
+    async def _handle_reorg(self, fork: int):
+        await super()._handle_reorg(fork)
+        self._backlog = deque(item for item in self._backlog if item.block_number <= fork)
+        self._broadcast({"kind": "reorg", "fork": fork})
+
+    # ==========================================================================
+    # SOCKET SERVER
+    # ==========================================================================
+
+    def _progress(self) -> dict:
+        return {
+            "kind": "progress",
+            "head": self._head,
+            "blocks": {et.value: block for et, block in self._last_blocks.items()},
+        }
+
+    def _broadcast(self, message: dict, event_type: Optional[str] = None):
+        """Queue a message for every connected agent interested in it"""
+        line = (json.dumps(message) + "\n").encode()
+        for client in list(self._clients):
+            if event_type and event_type not in client.types:
+                continue
+            if not client.send(line):
+                logger.warning("Event hub client fell behind; disconnecting it")
+                self._clients.discard(client)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Replay the backlog to a newly connected agent, then stream live events"""
+        client = None
+        try:
+            writer.write((json.dumps({"kind": "hello", "oldest_block": self._replay_from}) + "\n").encode())
+            await writer.drain()
+            hello = json.loads(await asyncio.wait_for(reader.readline(), timeout=30))
+            floors: dict[str, int] = hello.get("from") or {}
+            client = _HubClient(
+                set(hello.get("types") or [et.value for et in EVENT_PAYLOADS]),
+                self.client_queue_size,
+            )
+
+            # Snapshot and register without yielding, so no event is missed or doubled
+            backlog = [
+                item for item in self._backlog
+                if item.event_type in client.types
+                and item.event_type in floors
+                and item.block_number > floors[item.event_type]
+            ]
+            progress = self._progress()
+            self._clients.add(client)
+            logger.info(f"Event hub client connected ({len(self._clients)} total, replaying {len(backlog)})")
+
+            for item in backlog:
+                writer.write((json.dumps({"kind": "event", **asdict(item)}) + "\n").encode())
+            writer.write((json.dumps(progress) + "\n").encode())
+            await writer.drain()
+
+            while True:
+                line = await client.queue.get()
+                if line is None:
+                    break
+                writer.write(line)
+                await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError, json.JSONDecodeError) as e:
+            logger.debug(f"Event hub client dropped: {e}")
+        finally:
+            if client:
+                self._clients.discard(client)
+            writer.close()
+
+    async def run(self):
+        """Catch up, start serving the socket, then follow the chain"""
+        await self.catch_up()
+
+        path = Path(self.hub_socket)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        self._server = await asyncio.start_unix_server(self._serve_client, path=str(path))
+        os.chmod(path, 0o660)
+        logger.info(f"📡 Event hub serving {path}")
+
+        try:
+            await self.start()
+        finally:
+            self._server.close()
+            if path.exists():
+                path.unlink()
+
+    def stop(self):
+        """Stop polling and disconnect all agents"""
+        super().stop()
+        for client in list(self._clients):
+            client.close()
+        self._clients.clear()
+
+    def metrics(self) -> dict:
+        """Connected agents and replay backlog size"""
+        return {
+            "clients": len(self._clients),
+            "backlog": len(self._backlog),
+            "replay_from": self._replay_from,
+        }
+
+
+def run_hub():
+    """Run the event hub until interrupted"""
+    hub = EventHub(checkpoint=get_checkpoint_store("hub"))
+    try:
+        asyncio.run(hub.run())
+    except KeyboardInterrupt:
+        hub.stop()
@@ -3,21 +3,62 @@ Blockchain Event Listener for Archive Agents
 
 Watches for contract events like JobPosted, BidAccepted, etc.
 Uses WebSocket for real-time updates with polling fallback.
+
+With NEOX_WS_URL set (e.g. ws://127.0.0.1:8545 for a local Hardhat/anvil
+node) the listener subscribes to newHeads and runs the block-range query as
+soon as a head arrives. If the socket drops it keeps polling over HTTP and
+retries the subscription, backfilling the gap through the same range query.
+
+Ingestion and handling are decoupled: parsed events go into bounded
+per-event-type queues (see dispatch.py) and a consumer pool runs the
+callbacks, so a slow agent never delays the poll loop.
+
+Reorgs: recent block hashes (heads and blocks that produced events) are kept
+in a small ring. When a new head's parent hash (or a re-read block hash) no
+longer matches, the listener finds the fork point, fires retraction
+callbacks for events delivered from orphaned blocks, rewinds its cursors and
+replays the range on the new chain. Confirmation depth can be set per event
+type, e.g. {EventType.JOB_POSTED: 1, EventType.BID_ACCEPTED: 6}.
+
+With source="hub" (or EVENT_SOURCE=hub) the listener reads decoded events
+from a local event hub process (see event_hub.py) over a Unix socket instead
+of polling RPC itself, and polls directly only while the hub is unreachable.
+
+Polling cadence is adaptive (see poll_scheduler.py): polls are timed just
+after the next expected block, tighten while the agent watches one of its
+jobs (watch_job), and back off on idle chains and RPC rate limits.
+
+Every accepted (or retracted) event also drops the cached contract views
+of its job (see view_cache.py) before any handler runs.
+
+HTTP requests go through the shared RPC endpoint pool (see rpc_pool.py), so
+polling follows the fastest healthy node and fails over when one goes down.
 """
 
 import os
 import json
+import time
 import asyncio
 import logging
+from contextlib import nullcontext
+from functools import partial
 from typing import Callable, Awaitable, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
-from web3 import Web3, AsyncWeb3
-from web3.contract import Contract
+from web3 import Web3, AsyncWeb3, WebSocketProvider
+from web3.contract import AsyncContract
+from eth_utils import event_abi_to_log_topic
+from eth_abi import encode
 
 from .config import get_network, get_contract_addresses
-from .contracts import load_abi
+from .contracts import load_abi, LEGACY_EVENT_ABIS
+from .checkpoint import CheckpointStore
+from .backfill import LogBackfiller, is_rate_limited
+from .poll_scheduler import PollScheduler
+from .dispatch import EventDispatcher, OverflowPolicy, QueuedEvent
+from .view_cache import view_cache
+from .rpc_pool import PooledAsyncHTTPProvider, RpcPool, get_rpc_pool
 
 logger = logging.getLogger(__name__)
 
@@ -38,12 +79,15 @@ class JobPostedEvent:
     """Parsed JobPosted event"""
     job_id: int
     client: str
-    job_type: int
-    budget: int
     deadline: int
     description: str
     block_number: int
     tx_hash: str
+    metadata_uri: str = ""
+    tags_hash: str = ""  # keccak256(abi.encode(tags)), see job_tags_hash()
+    # Not in the log; filled from the metadata document (job_type / budget_micro) by agents
+    job_type: Optional[int] = None
+    budget: int = 0
 
 
 @dataclass
@@ -80,9 +124,80 @@ class DeliverySubmittedEvent:
     tx_hash: str
 
 
+@dataclass
+class RetractedEvent:
+    """An already-delivered event whose block was orphaned by a reorg"""
+    event_type: EventType
+    event: Any
+    block_number: int
+    block_hash: str
+    tx_hash: str
+
+
 # Aliases for convenience
 BidSubmittedEvent = BidPlacedEvent
 
+# Payload dataclass per parsed event type
+EVENT_PAYLOADS: dict["EventType", type] = {
+    EventType.JOB_POSTED: JobPostedEvent,
+    EventType.BID_PLACED: BidPlacedEvent,
+    EventType.BID_ACCEPTED: BidAcceptedEvent,
+    EventType.DELIVERY_SUBMITTED: DeliverySubmittedEvent,
+}
+
+def job_tags_hash(tags: list[str]) -> str:
+    """tagsHash a JobPosted event carries for a tag list (keccak256(abi.encode(tags)))"""
+    return "0x" + Web3.keccak(encode(["string[]"], [list(tags)])).hex().removeprefix("0x")
+
+
+def parse_job_posted(event: dict) -> JobPostedEvent:
+    """JobPostedEvent from a decoded JobPosted log"""
+    args = event['args']
+    tags_hash = args.get('tagsHash', b'')
+    parsed = JobPostedEvent(
+        job_id=args.get('jobId', args.get('id', 0)),
+        client=args.get('client', args.get('poster', '')),
+        deadline=args.get('deadline', 0),
+        description=args.get('description', ''),
+        block_number=event['blockNumber'],
+        tx_hash=event['transactionHash'].hex() if event['transactionHash'] else '',
+        metadata_uri=args.get('metadataURI', ''),
+        tags_hash="0x" + bytes(tags_hash).hex() if tags_hash else '',
+    )
+    logger.info("JobPosted evt job_id=%s deadline=%s desc=%s uri=%s tx=%s",
+                parsed.job_id, parsed.deadline, parsed.description, parsed.metadata_uri, parsed.tx_hash)
+    return parsed
+
+
+def apply_job_metadata(job: JobPostedEvent, document: Any) -> JobPostedEvent:
+    """
+    Fill the job terms JobPosted doesn't carry from its metadata document.
+
+    Args:
+        job: Parsed JobPosted event, updated in place
+        document: Decoded metadata JSON (job_type, budget_micro), or anything else to skip
+
+    Returns:
+        The same event
+    """
+    if not isinstance(document, dict):
+        return job
+    try:
+        if job.job_type is None and document.get("job_type") is not None:
+            job.job_type = int(document["job_type"])
+        if not job.budget and document.get("budget_micro"):
+            job.budget = int(document["budget_micro"])
+    except (TypeError, ValueError):
+        logger.debug("Job #%s metadata has malformed terms: %s", job.job_id, document)
+    return job
+
+
+# Confirmation depth for event types missing from a per-type mapping
+DEFAULT_CONFIRMATIONS = 1
+
+# Where agents and the event hub meet
+DEFAULT_HUB_SOCKET = "~/.archive-agents/event-hub.sock"
+
 
 EventCallback = Callable[[Any], Awaitable[None]]
 
@@ -92,40 +207,119 @@ class EventListener:
     Async event listener for Archive Protocol contracts.
     
     Watches for events and triggers callbacks for each agent type.
+    All RPC traffic goes through AsyncWeb3, so polling never blocks the
+    event loop that also serves the agent's A2A/HTTP endpoints.
     """
     
     def __init__(
         self,
         poll_interval: int = 3,
-        confirmations: int = 1
+        confirmations: int | dict[EventType, int] = DEFAULT_CONFIRMATIONS,
+        ws_url: Optional[str] = None,
+        ws_retry_interval: int = 30,
+        checkpoint: Optional[CheckpointStore] = None,
+        backfill_chunk_size: int = 2_000,
+        backfill_concurrency: int = 4,
+        queue_size: Optional[int] = None,
+        queue_consumers: Optional[int] = None,
+        queue_overflow: Optional[OverflowPolicy | str] = None,
+        spill_dir: Optional[str] = None,
+        reorg_window: int = 128,
+        source: Optional[str] = None,
+        hub_socket: Optional[str] = None
     ):
         """
         Initialize event listener.
         
         Args:
-            poll_interval: Seconds between polls
-            confirmations: Block confirmations required
+            poll_interval: Seconds between polls until the block time is learned
+            confirmations: Block confirmations required, globally or per event type
+            ws_url: WebSocket RPC endpoint (defaults to NEOX_WS_URL); polling only if unset
+            ws_retry_interval: Seconds to poll over HTTP before reconnecting the WebSocket
+            checkpoint: Durable cursor/dedupe store; resume and exactly-once delivery if set
+            backfill_chunk_size: Initial blocks per eth_getLogs when catching up
+            backfill_concurrency: Chunk requests in flight while catching up
+            queue_size: Queued events per event type (EVENT_QUEUE_SIZE, default 1000)
+            queue_consumers: Callback tasks per event type (EVENT_QUEUE_CONSUMERS, default 1)
+            queue_overflow: block, drop_oldest or spill when a queue is full (EVENT_QUEUE_OVERFLOW)
+            spill_dir: Spill file directory (defaults to next to the checkpoint database)
+            reorg_window: Recent blocks whose hashes are tracked for reorg detection
+            source: "rpc" to query the node directly, "hub" to read from the local event hub (EVENT_SOURCE)
+            hub_socket: Event hub Unix socket path (EVENT_HUB_SOCKET)
         """
         self.network = get_network()
         self.addresses = get_contract_addresses()
         self.poll_interval = poll_interval
+        self.scheduler = PollScheduler(base_interval=poll_interval, min_interval=min(0.5, poll_interval))
         self.confirmations = confirmations
+        self.ws_url = ws_url or self.network.ws_url
+        self.ws_retry_interval = ws_retry_interval
+        self.checkpoint = checkpoint
+        self.reorg_window = reorg_window
+        self.source = source or os.getenv("EVENT_SOURCE", "rpc")
+        self.hub_socket = os.path.expanduser(
+            hub_socket or os.getenv("EVENT_HUB_SOCKET", DEFAULT_HUB_SOCKET)
+        )
+        self._backfiller = LogBackfiller(
+            self._fetch_events,
+            chunk_size=backfill_chunk_size,
+            max_concurrency=backfill_concurrency,
+        )
+        
+        if spill_dir is None and checkpoint:
+            spill_dir = str(checkpoint.path.with_suffix("")) + "-spill"
+        self._dispatcher = EventDispatcher(
+            self._handle_event,
+            maxsize=queue_size or int(os.getenv("EVENT_QUEUE_SIZE", "1000")),
+            consumers=queue_consumers or int(os.getenv("EVENT_QUEUE_CONSUMERS", "1")),
+            overflow=queue_overflow or os.getenv("EVENT_QUEUE_OVERFLOW", OverflowPolicy.BLOCK.value),
+            spill_dir=spill_dir,
+            max_attempts=int(os.getenv("EVENT_HANDLER_ATTEMPTS", "3")),
+            # Callbacks for one job start in chain order, whatever queue each event is in
+            order_key=lambda item: getattr(item.payload, "job_id", None),
+        )
         
         # Callbacks per event type
         self._callbacks: dict[EventType, list[EventCallback]] = {
             et: [] for et in EventType
         }
         
+        self._retract_callbacks: list[Callable[[RetractedEvent], Awaitable[None]]] = []
+        
         # State
         self._running = False
-        self._last_block: Optional[int] = None
-        self._w3: Optional[Web3] = None
-        self._order_book: Optional[Contract] = None
-        self._agent_registry: Optional[Contract] = None
+        self._last_blocks: dict[EventType, int] = {}  # last scanned block per event type
+        self._ws_retry_at = 0.0
+        self._hub_retry_at = 0.0
+        self._hub_head: Optional[int] = None
+        self._hub_held: list[QueuedEvent] = []  # hub events not yet at our confirmation depth
+        self._accepted = 0  # events accepted since start, for idle detection
+        self._w3: Optional[AsyncWeb3] = None
+        self._rpc_pool: Optional[RpcPool] = None
+        self._order_book: Optional[AsyncContract] = None
+        self._agent_registry: Optional[AsyncContract] = None
+        
+        # Reorg tracking: block number -> hash, and events enqueued per block
+        self._block_hashes: dict[int, str] = {}
+        self._delivered: dict[int, list[QueuedEvent]] = {}
+        self._retracted: dict[tuple[str, int, str], int] = {}
+        
+        # topic0 -> (event type, decoder), built once in _setup_contracts
+        self._decoders: dict[bytes, tuple[EventType, Any]] = {}
+        self._parsers: dict[EventType, Callable[[dict], Any]] = {
+            EventType.JOB_POSTED: self._parse_job_posted,
+            EventType.BID_PLACED: self._parse_bid_placed,
+            EventType.BID_ACCEPTED: self._parse_bid_accepted,
+            EventType.DELIVERY_SUBMITTED: self._parse_delivery_submitted,
+        }
+        for event_type, payload_type in EVENT_PAYLOADS.items():
+            self._dispatcher.register(event_type.value, payload_type)
     
     def _setup_contracts(self):
-        """Initialize Web3 and contract instances"""
-        self._w3 = Web3(Web3.HTTPProvider(self.network.rpc_url))
+        """Initialize AsyncWeb3 and contract instances"""
+        # Same RpcPool as contracts.py / wallet.py: latency routing and failover
+        self._rpc_pool = get_rpc_pool(self.network.rpc_urls)
+        self._w3 = AsyncWeb3(PooledAsyncHTTPProvider(self._rpc_pool))
         
         if self.addresses.order_book:
             order_book_abi = load_abi("OrderBook")
@@ -133,6 +327,15 @@ class EventListener:
                 address=Web3.to_checksum_address(self.addresses.order_book),
                 abi=order_book_abi
             )
+            # Older deployments emit legacy JobPosted/BidAccepted layouts; decode those too
+            legacy = self._w3.eth.contract(address=self._order_book.address, abi=LEGACY_EVENT_ABIS["OrderBook"])
+            self._decoders = {}
+            for contract in (self._order_book, legacy):
+                for event_type in self._parsers:
+                    if not any(item.get("name") == event_type.value for item in contract.abi):
+                        continue
+                    event = getattr(contract.events, event_type.value)()
+                    self._decoders[event_abi_to_log_topic(event.abi)] = (event_type, event)
         
         if self.addresses.agent_registry:
             agent_registry_abi = load_abi("AgentRegistry")
@@ -171,68 +374,70 @@ class EventListener:
         """Register callback for DeliverySubmitted events"""
         self.on_event(EventType.DELIVERY_SUBMITTED, callback)
     
-    async def _process_job_posted(self, event: dict):
-        """Parse and dispatch JobPosted event"""
-        args = event['args']
-        parsed = JobPostedEvent(
-            job_id=args.get('jobId', args.get('id', 0)),
-            client=args.get('client', args.get('poster', '')),
-            job_type=args.get('jobType', 0),
-            budget=args.get('budget', 0),
-            deadline=args.get('deadline', 0),
-            description=args.get('description', ''),
-            block_number=event['blockNumber'],
-            tx_hash=event['transactionHash'].hex() if event['transactionHash'] else ''
-        )
-        logger.info("JobPosted evt job_id=%s type=%s budget=%s deadline=%s desc=%s tx=%s",
-                    parsed.job_id, parsed.job_type, parsed.budget, parsed.deadline, parsed.description, parsed.tx_hash)
-        for callback in self._callbacks[EventType.JOB_POSTED]:
+    def on_retracted(self, callback: Callable[[RetractedEvent], Awaitable[None]]):
+        """
+        Register a callback for events undone by a reorg.
+        
+        Fires for every event enqueued from an orphaned block, whether or not
+        its callbacks had run yet; queued ones are then skipped. Events that
+        are still on the new chain are delivered again by the replay.
+        """
+        self._retract_callbacks.append(callback)
+    
+    def _confirmations_for(self, event_type: EventType) -> int:
+        """Confirmation depth for an event type"""
+        if isinstance(self.confirmations, dict):
+            return self.confirmations.get(event_type, DEFAULT_CONFIRMATIONS)
+        return self.confirmations
+    
+    async def _run_callbacks(self, event_type: EventType, parsed: Any) -> bool:
+        """Run every callback for an event; True if none raised"""
+        ok = True
+        for callback in self._callbacks[event_type]:
             try:
                 await callback(parsed)
             except Exception as e:
-                logger.error(f"Error in JobPosted callback: {e}")
+                ok = False
+                logger.error(f"Error in {event_type.value} callback: {e}")
+        return ok
+    
+    def _parse_job_posted(self, event: dict) -> JobPostedEvent:
+        """Parse JobPosted event"""
+        return parse_job_posted(event)
     
-    async def _process_bid_placed(self, event: dict):
-        """Parse and dispatch BidPlaced event"""
+    def _parse_bid_placed(self, event: dict) -> BidPlacedEvent:
+        """Parse BidPlaced event"""
         args = event['args']
         parsed = BidPlacedEvent(
             job_id=args.get('jobId', 0),
             bid_id=args.get('bidId', 0),
             bidder=args.get('bidder', ''),
-            amount=args.get('amount', 0),
+            amount=args.get('price', args.get('amount', 0)),
             estimated_time=args.get('estimatedTime', 0),
             block_number=event['blockNumber'],
             tx_hash=event['transactionHash'].hex() if event['transactionHash'] else ''
         )
         logger.info("BidPlaced evt job_id=%s bid_id=%s bidder=%s amount=%s tx=%s",
                     parsed.job_id, parsed.bid_id, parsed.bidder, parsed.amount, parsed.tx_hash)
-        for callback in self._callbacks[EventType.BID_PLACED]:
-            try:
-                await callback(parsed)
-            except Exception as e:
-                logger.error(f"Error in BidPlaced callback: {e}")
+        return parsed
     
-    async def _process_bid_accepted(self, event: dict):
-        """Parse and dispatch BidAccepted event"""
+    def _parse_bid_accepted(self, event: dict) -> BidAcceptedEvent:
+        """Parse BidAccepted event"""
         args = event['args']
         parsed = BidAcceptedEvent(
             job_id=args.get('jobId', 0),
             bid_id=args.get('bidId', 0),
             worker=args.get('agent', args.get('worker', args.get('bidder', ''))),
-            amount=args.get('amount', 0),
+            amount=args.get('price', args.get('amount', 0)),
             block_number=event['blockNumber'],
             tx_hash=event['transactionHash'].hex() if event['transactionHash'] else ''
         )
         logger.info("BidAccepted evt job_id=%s bid_id=%s worker=%s amount=%s tx=%s",
                     parsed.job_id, parsed.bid_id, parsed.worker, parsed.amount, parsed.tx_hash)
-        for callback in self._callbacks[EventType.BID_ACCEPTED]:
-            try:
-                await callback(parsed)
-            except Exception as e:
-                logger.error(f"Error in BidAccepted callback: {e}")
+        return parsed
     
-    async def _process_delivery_submitted(self, event: dict):
-        """Parse and dispatch DeliverySubmitted event"""
+    def _parse_delivery_submitted(self, event: dict) -> DeliverySubmittedEvent:
+        """Parse DeliverySubmitted event"""
         args = event['args']
         parsed = DeliverySubmittedEvent(
             job_id=args.get('jobId', 0),
@@ -244,146 +449,540 @@ class EventListener:
         )
         logger.info("DeliverySubmitted evt job_id=%s worker=%s result=%s tx=%s",
                     parsed.job_id, parsed.worker, parsed.result_uri, parsed.tx_hash)
-        for callback in self._callbacks[EventType.DELIVERY_SUBMITTED]:
+        return parsed
+
+    async def _handle_event(self, item: QueuedEvent) -> bool:
+        """Consumer side: run callbacks, then record the log as handled"""
+        if self._retracted.pop((item.tx_hash, item.log_index, item.block_hash), None) is not None:
+            logger.info(f"Skipping {item.event_type} {item.tx_hash}:{item.log_index} from orphaned block")
+            return True
+        # A replayed spill entry may also have been fetched again from the chain
+        if self.checkpoint and self.checkpoint.is_processed(item.tx_hash, item.log_index):
+            return True
+        ok = await self._run_callbacks(EventType(item.event_type), item.payload)
+        if ok and self.checkpoint:
+            self.checkpoint.mark_processed(item.tx_hash, item.log_index, item.block_number)
+        return ok
+
+    async def _enqueue(self, event_type: EventType, event: Any):
+        """Parse an event and hand it to its event type's queue"""
+        item = QueuedEvent(
+            event_type=event_type.value,
+            payload=self._parsers[event_type](event),
+            tx_hash=Web3.to_hex(event['transactionHash']),
+            log_index=event['logIndex'],
+            block_number=event['blockNumber'],
+            block_hash=Web3.to_hex(event['blockHash']) if event.get('blockHash') else '',
+        )
+        await self._accept(item)
+
+    async def _accept(self, item: QueuedEvent):
+        """Remember an event for reorg retraction, then deliver it"""
+        self._accepted += 1
+        self.scheduler.record_event(item.block_number)
+        # Handlers reading this job must not see the pre-event view
+        view_cache.on_event(item.event_type, getattr(item.payload, "job_id", None))
+        if item.block_hash:
+            self._block_hashes.setdefault(item.block_number, item.block_hash)
+            self._delivered.setdefault(item.block_number, []).append(item)
+        await self._deliver(item)
+
+    async def _deliver(self, item: QueuedEvent):
+        """Hand a parsed event to its consumers"""
+        await self._dispatcher.put(item)
+
+    def _subscribed_topics(self, event_types: Optional[list[EventType]] = None) -> list[str]:
+        """topic0 hashes for the given event types (default: those with at least one callback)"""
+        return [
+            Web3.to_hex(topic)
+            for topic, (event_type, _) in self._decoders.items()
+            if (event_type in event_types if event_types is not None else self._wants(event_type))
+        ]
+
+    async def _fetch_events(
+        self,
+        from_block: int,
+        to_block: int,
+        event_types: Optional[list[EventType]] = None
+    ) -> list[tuple[EventType, Any]]:
+        """
+        Fetch all subscribed OrderBook events in a block range with one eth_getLogs.
+        
+        Args:
+            from_block: First block
+            to_block: Last block
+            event_types: Fetch these event types instead of the subscribed ones
+        
+        Returns:
+            Decoded (event type, event) pairs in chain order (block, log index)
+        """
+        topics = self._subscribed_topics(event_types)
+        if not topics:
+            return []
+        
+        logs = await self._w3.eth.get_logs({
+            "address": self._order_book.address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [topics],
+        })
+        
+        decoded = []
+        for log in sorted(logs, key=lambda l: (l["blockNumber"], l["logIndex"])):
+            if not log["topics"]:
+                continue
+            entry = self._decoders.get(bytes(log["topics"][0]))
+            if not entry:
+                continue
+            event_type, decoder = entry
             try:
-                await callback(parsed)
+                decoded.append((event_type, decoder.process_log(log)))
             except Exception as e:
-                logger.error(f"Error in DeliverySubmitted callback: {e}")
+                logger.warning(f"Could not decode {event_type.value} log: {e}")
+        return decoded
+
+    def _wants(self, event_type: EventType) -> bool:
+        """Whether an event type has anyone to deliver to"""
+        return bool(self._callbacks[event_type])
+
+    def _subscribed_types(self) -> list[EventType]:
+        """Event types with a parser and at least one callback"""
+        return [et for et in self._parsers if self._wants(et)]
+
+    def _capped_cursor(self, event_type: EventType, block: int) -> int:
+        """Cap a cursor just below the oldest event of this type still queued"""
+        pending = self._dispatcher.low_watermark(event_type.value)
+        return block if pending is None else min(block, pending - 1)
+
+    async def _dispatch_range(
+        self,
+        from_block: int,
+        to_block: int,
+        safe: Optional[dict[EventType, int]] = None
+    ):
+        """
+        Fetch a block range and enqueue each event in chain order.
+        
+        Large ranges are fetched by the backfiller in adaptive chunks, several
+        at a time, but chunks are still enqueued strictly in block order.
+        Each event type only takes events above its last scanned block and at
+        or below its own safe block, so types with deeper confirmations pick
+        up the rest on a later poll. With a checkpoint store, logs already
+        handled (by tx hash and log index) are skipped. After each chunk a
+        cursor is committed per event type, capped just below the oldest event
+        of that type still waiting in its queue, so a restart replays anything
+        that was enqueued but never handled.
+        """
+        types = self._subscribed_types()
+        safe = safe or {et: to_block for et in types}
+        floors = {et: self._last_blocks.get(et, from_block - 1) for et in types}
+        committed = dict(floors)
+        
+        async def dispatch_chunk(start: int, end: int, events: list[tuple[EventType, Any]]):
+            for event_type, event in events:
+                block = event['blockNumber']
+                if block <= floors[event_type] or block > safe[event_type]:
+                    continue
+                if self.checkpoint:
+                    tx_hash = Web3.to_hex(event['transactionHash'])
+                    if self.checkpoint.is_processed(tx_hash, event['logIndex']):
+                        logger.debug(f"Skipping already handled {event_type.value} {tx_hash}:{event['logIndex']}")
+                        continue
+                await self._enqueue(event_type, event)
+            
+            if self.checkpoint:
+                for et in types:
+                    block = self._capped_cursor(et, min(end, safe[et]))
+                    if block > committed[et]:
+                        self.checkpoint.set_cursors(self._order_book.address, [et.value], block)
+                        committed[et] = block
+        
+        with self._rpc_session():
+            await self._backfiller.run(from_block, to_block, dispatch_chunk)
+
+    async def backfill(
+        self,
+        from_block: int,
+        to_block: int | str,
+        on_chunk: Callable[[int, int, list[tuple[EventType, Any]]], Awaitable[None]],
+        event_types: Optional[list[EventType]] = None
+    ):
+        """
+        Scan a historical block range without touching callbacks or cursors.
+        
+        Chunks are fetched like a catch-up (adaptive size, several in flight),
+        by a backfiller of its own so a long scan doesn't resize the live one's chunks.
+        
+        Args:
+            from_block: First block
+            to_block: Last block, or "latest"
+            on_chunk: Async handler receiving (start, end, [(event type, event), ...]) in block order
+            event_types: Event types to fetch (default: every type the listener decodes)
+        """
+        if not self._w3 or not self._order_book:
+            self._setup_contracts()
+        if to_block == "latest":
+            to_block = await self._w3.eth.block_number
+        backfiller = LogBackfiller(
+            partial(self._fetch_events, event_types=list(event_types or self._parsers)),
+            chunk_size=self._backfiller.chunk_size,
+            max_concurrency=self._backfiller.max_concurrency,
+        )
+        await backfiller.run(from_block, int(to_block), on_chunk)
+
+    def _rpc_session(self):
+        """Pin the reads of one poll to one RPC node, so head and logs agree"""
+        return self._rpc_pool.session() if self._rpc_pool else nullcontext()
 
-    async def _poll_events(self):
-        """Poll for new events"""
+    @staticmethod
+    def _header_fields(header: Any) -> tuple[int, str, str]:
+        """(number, hash, parent hash) from a block or newHeads header"""
+        number = header["number"]
+        if isinstance(number, str):
+            number = int(number, 16)
+        block_hash, parent = header["hash"], header["parentHash"]
+        return (
+            number,
+            block_hash if isinstance(block_hash, str) else Web3.to_hex(block_hash),
+            parent if isinstance(parent, str) else Web3.to_hex(parent),
+        )
+
+    @staticmethod
+    def _header_timestamp(header: Any) -> Optional[int]:
+        """Block timestamp from a block or newHeads header, if present"""
+        timestamp = header.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = int(timestamp, 16)
+        return timestamp
+
+    async def _track_head(self, header: Any) -> int:
+        """
+        Record a new head and handle a reorg if the chain under it changed.
+        
+        Returns:
+            The head block number
+        """
+        number, block_hash, parent = self._header_fields(header)
+        known = self._block_hashes
+        
+        diverged = (
+            known.get(number - 1, parent) != parent
+            or known.get(number, block_hash) != block_hash
+        )
+        if not diverged and known and number - 1 not in known and max(known) < number:
+            # Heads were skipped since the last poll; re-read the newest known block
+            newest = max(known)
+            block = await self._w3.eth.get_block(newest)
+            diverged = Web3.to_hex(block["hash"]) != known[newest]
+        
+        if diverged:
+            await self._handle_reorg(await self._find_fork(number - 1))
+        
+        known[number] = block_hash
+        known.setdefault(number - 1, parent)
+        self._prune(number)
+        return number
+
+    def _prune(self, head: int):
+        """Forget reorg bookkeeping older than the reorg window"""
+        horizon = head - self.reorg_window
+        for n in [n for n in self._block_hashes if n < horizon]:
+            del self._block_hashes[n]
+        for n in [n for n in self._delivered if n < horizon]:
+            del self._delivered[n]
+        self._retracted = {k: n for k, n in self._retracted.items() if n >= horizon}
+
+    async def _find_fork(self, below: int) -> int:
+        """Highest tracked block at or below `below` whose hash is still canonical"""
+        for number in sorted((n for n in self._block_hashes if n <= below), reverse=True):
+            block = await self._w3.eth.get_block(number)
+            if Web3.to_hex(block["hash"]) == self._block_hashes[number]:
+                return number
+        oldest = min(self._block_hashes, default=below + 1)
+        logger.error(f"Reorg deeper than the {self.reorg_window}-block window; replaying from {oldest - 1}")
+        return oldest - 1
+
+    async def _handle_reorg(self, fork: int):
+        """Retract events above the fork point and rewind cursors to replay them"""
+        orphaned = sorted(n for n in self._delivered if n > fork)
+        logger.warning(f"⚠️ Chain reorg detected: blocks after {fork} replaced")
+        
+        for number in orphaned:
+            for item in self._delivered.pop(number):
+                self._retracted[(item.tx_hash, item.log_index, item.block_hash)] = number
+                view_cache.on_event(item.event_type, getattr(item.payload, "job_id", None))
+                retracted = RetractedEvent(
+                    event_type=EventType(item.event_type),
+                    event=item.payload,
+                    block_number=number,
+                    block_hash=item.block_hash,
+                    tx_hash=item.tx_hash,
+                )
+                for callback in self._retract_callbacks:
+                    try:
+                        await callback(retracted)
+                    except Exception as e:
+                        logger.error(f"Error in retraction callback: {e}")
+        
+        for number in [n for n in self._block_hashes if n > fork]:
+            del self._block_hashes[number]
+        for et, last in self._last_blocks.items():
+            self._last_blocks[et] = min(last, fork)
+        if self.checkpoint and self._order_book:
+            self.checkpoint.rewind(self._order_book.address, fork)
+
+    def _init_last_blocks(self, safe: dict[EventType, int], blocks_back: int):
+        """Start event types with no scanned block at their checkpoint, or `blocks_back` below safe"""
+        for et, block in safe.items():
+            if et in self._last_blocks:
+                continue
+            cursor = None
+            if self.checkpoint:
+                cursor = self.checkpoint.get_cursor(self._order_book.address, et.value)
+            self._last_blocks[et] = cursor if cursor is not None else max(-1, block - blocks_back)
+
+    async def _scan(self, head: int, blocks_back: int):
+        """
+        Dispatch every event type up to its own safe block.
+        
+        Args:
+            head: Current head block number
+            blocks_back: Blocks to replay for event types with no cursor yet
+        """
+        types = self._subscribed_types()
+        if not types:
+            return
+        safe = {et: head - self._confirmations_for(et) for et in types}
+        self._init_last_blocks(safe, blocks_back)
+        
+        from_block = min(self._last_blocks[et] for et in types) + 1
+        to_block = max(safe.values())
+        if to_block < from_block:
+            return
+        
+        logger.debug(f"Scanning blocks {from_block} to {to_block}")
+        await self._dispatch_range(from_block, to_block, safe)
+        for et in types:
+            self._last_blocks[et] = max(self._last_blocks[et], safe[et])
+
+    async def _poll_events(self, header: Optional[Any] = None):
+        """
+        Poll for new events.
+        
+        Args:
+            header: Latest block header if already known (e.g. from a newHeads message)
+        """
         if not self._w3 or not self._order_book:
             return
         
         try:
-            current_block = self._w3.eth.block_number
-            safe_block = current_block - self.confirmations
+            with self._rpc_session():
+                if header is None:
+                    header = await self._w3.eth.get_block("latest")
+                head = await self._track_head(header)
+                self.scheduler.observe_head(head, self._header_timestamp(header))
+                accepted = self._accepted
+                await self._scan(head, blocks_back=1)
+            self.scheduler.record_poll(self._accepted - accepted)
+        except Exception as e:
+            if is_rate_limited(e):
+                self.scheduler.on_rate_limited()
+            logger.error(f"Error polling events: {e}")
+    
+    async def _run_subscription(self):
+        """
+        Drive the range query from newHeads until the WebSocket drops.
+        
+        Every head (and the reconnect itself) triggers _poll_events, so any
+        blocks missed while disconnected are backfilled from the last
+        scanned block of each event type.
+        """
+        try:
+            async with AsyncWeb3(WebSocketProvider(self.ws_url)) as ws_w3:
+                await ws_w3.eth.subscribe("newHeads")
+                logger.info(f"Subscribed to newHeads at {self.ws_url}")
+                await self._poll_events()
+                
+                async for message in ws_w3.socket.process_subscriptions():
+                    if not self._running:
+                        break
+                    header = message.get("result")
+                    await self._poll_events(header=header or None)
+        except Exception as e:
+            logger.warning(f"WebSocket subscription lost ({e}); falling back to polling")
+        
+        self._ws_retry_at = time.monotonic() + self.ws_retry_interval
+    
+    async def _run_hub_client(self):
+        """
+        Consume decoded events from the local event hub until it goes away.
+        
+        Blocks the hub can no longer replay (it only keeps a bounded backlog)
+        are first backfilled from RPC, then the hub replays everything after
+        our per-type scanned blocks and streams new events.
+        """
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.hub_socket, limit=2**20)
+        except OSError as e:
+            logger.warning(f"Event hub unavailable at {self.hub_socket} ({e}); polling RPC directly")
+            self._hub_retry_at = time.monotonic() + self.ws_retry_interval
+            return
+        
+        self._hub_head = None
+        self._hub_held = []
+        try:
+            types = self._subscribed_types()
+            hello = json.loads(await reader.readline())
+            oldest = hello.get("oldest_block")
+            floors = [self._last_blocks[et] for et in types if et in self._last_blocks]
+            if floors and oldest is not None and min(floors) < oldest - 1:
+                logger.info(f"Backfilling blocks {min(floors) + 1}-{oldest - 1} before joining the event hub")
+                await self._dispatch_range(min(floors) + 1, oldest - 1, {et: oldest - 1 for et in types})
+                for et in types:
+                    if et in self._last_blocks:
+                        self._last_blocks[et] = max(self._last_blocks[et], oldest - 1)
             
-            if self._last_block is None:
-                self._last_block = safe_block - 1
+            writer.write((json.dumps({
+                "types": [et.value for et in types],
+                "from": {et.value: self._last_blocks[et] for et in types if et in self._last_blocks},
+            }) + "\n").encode())
+            await writer.drain()
+            logger.info(f"Connected to event hub at {self.hub_socket}")
             
-            if safe_block <= self._last_block:
+            while self._running:
+                line = await reader.readline()
+                if not line:
+                    break
+                await self._on_hub_message(json.loads(line))
+        except Exception as e:
+            logger.warning(f"Event hub connection lost ({e}); polling RPC directly")
+        finally:
+            writer.close()
+        
+        self._hub_retry_at = time.monotonic() + self.ws_retry_interval
+
+    def _hub_safe(self, event_type: EventType) -> Optional[int]:
+        """Deepest block of this type we may take from the hub, per our own confirmations"""
+        if self._hub_head is None:
+            return None
+        return self._hub_head - self._confirmations_for(event_type)
+
+    async def _on_hub_message(self, message: dict):
+        """
+        Apply one event, progress or reorg message from the hub.
+        
+        The hub streams at its own (shallow) depth, so events above our safe
+        block are held until a progress message shows they are deep enough.
+        """
+        kind = message.get("kind")
+        if kind == "event":
+            event_type = EventType(message["event_type"])
+            if not self._wants(event_type):
                 return
-            
-            from_block = self._last_block + 1
-            to_block = safe_block
-            
-            logger.debug(f"Polling blocks {from_block} to {to_block}")
-            
-            # Get JobPosted events
-            if self._callbacks[EventType.JOB_POSTED]:
-                try:
-                    events = self._order_book.events.JobPosted.get_logs(
-                        from_block=from_block,
-                        to_block=to_block
-                    )
-                    for event in events:
-                        await self._process_job_posted(event)
-                except Exception as e:
-                    logger.debug(f"No JobPosted events or error: {e}")
-            
-            # Get BidPlaced events
-            if self._callbacks[EventType.BID_PLACED]:
-                try:
-                    events = self._order_book.events.BidPlaced.get_logs(
-                        from_block=from_block,
-                        to_block=to_block
-                    )
-                    for event in events:
-                        await self._process_bid_placed(event)
-                except Exception as e:
-                    logger.debug(f"No BidPlaced events or error: {e}")
-            
-            # Get BidAccepted events
-            if self._callbacks[EventType.BID_ACCEPTED]:
-                try:
-                    events = self._order_book.events.BidAccepted.get_logs(
-                        from_block=from_block,
-                        to_block=to_block
-                    )
-                    for event in events:
-                        await self._process_bid_accepted(event)
-                except Exception as e:
-                    logger.debug(f"No BidAccepted events or error: {e}")
-            
-            # Get DeliverySubmitted events
-            if self._callbacks[EventType.DELIVERY_SUBMITTED]:
-                try:
-                    events = self._order_book.events.DeliverySubmitted.get_logs(
-                        from_block=from_block,
-                        to_block=to_block
+            if message["block_number"] <= self._last_blocks.get(event_type, -1):
+                return
+            if self.checkpoint and self.checkpoint.is_processed(message["tx_hash"], message["log_index"]):
+                return
+            item = QueuedEvent(
+                event_type=event_type.value,
+                payload=EVENT_PAYLOADS[event_type](**message["payload"]),
+                tx_hash=message["tx_hash"],
+                log_index=message["log_index"],
+                block_number=message["block_number"],
+                block_hash=message.get("block_hash", ""),
+            )
+            safe = self._hub_safe(event_type)
+            blocked = any(held.event_type == item.event_type for held in self._hub_held)
+            if safe is None or item.block_number > safe or blocked:
+                self._hub_held.append(item)  # stays behind earlier held events of its type
+            else:
+                await self._accept(item)
+        elif kind == "progress":
+            self._hub_head = message.get("head", self._hub_head)
+            held, self._hub_held = self._hub_held, []
+            for item in held:
+                safe = self._hub_safe(EventType(item.event_type))
+                blocked = any(h.event_type == item.event_type for h in self._hub_held)
+                if safe is not None and item.block_number <= safe and not blocked:
+                    await self._accept(item)
+                else:
+                    self._hub_held.append(item)
+            blocks = {EventType(name): block for name, block in message["blocks"].items()}
+            for et in self._subscribed_types():
+                if et not in blocks:
+                    continue
+                safe = self._hub_safe(et)
+                block = blocks[et] if safe is None else min(blocks[et], safe)
+                self._last_blocks[et] = max(self._last_blocks.get(et, block), block)
+                if self.checkpoint:
+                    self.checkpoint.set_cursors(
+                        self._order_book.address, [et.value], self._capped_cursor(et, self._last_blocks[et])
                     )
-                    for event in events:
-                        await self._process_delivery_submitted(event)
-                except Exception as e:
-                    logger.debug(f"No DeliverySubmitted events or error: {e}")
-            
-            self._last_block = to_block
-            
-        except Exception as e:
-            logger.error(f"Error polling events: {e}")
-    
+            if blocks:
+                self._prune(max(blocks.values()))
+        elif kind == "reorg":
+            self._hub_held = [item for item in self._hub_held if item.block_number <= message["fork"]]
+            await self._handle_reorg(message["fork"])
+
     async def start(self):
         """Start the event listener"""
         logger.info("Starting event listener...")
         self._setup_contracts()
         self._running = True
+        self._dispatcher.start()
         
         while self._running:
+            if self.source == "hub" and time.monotonic() >= self._hub_retry_at:
+                await self._run_hub_client()
+                continue
+            if self.ws_url and time.monotonic() >= self._ws_retry_at:
+                await self._run_subscription()
+                continue
             await self._poll_events()
-            await asyncio.sleep(self.poll_interval)
+            await asyncio.sleep(self.scheduler.next_delay())
     
     def stop(self):
-        """Stop the event listener"""
+        """Stop the event listener and its consumer tasks"""
         logger.info("Stopping event listener...")
         self._running = False
+        self._dispatcher.stop()
 
-    async def catch_up(self, blocks_back: int = 20):
-        """Process recent events immediately (e.g., jobs posted before agent startup)."""
-        if not self._w3 or not self._order_book:
-            self._setup_contracts()
-        try:
-            current_block = self._w3.eth.block_number
-            safe_block = current_block - self.confirmations
-            if safe_block <= 0:
-                return
-            from_block = max(0, safe_block - blocks_back)
-            to_block = safe_block
-            logger.info("Catching up events from block %s to %s", from_block, to_block)
-
-            if self._callbacks[EventType.JOB_POSTED]:
-                events = self._order_book.events.JobPosted.get_logs(
-                    from_block=from_block,
-                    to_block=to_block,
-                )
-                for event in events:
-                    await self._process_job_posted(event)
+    async def drain(self):
+        """Wait until every enqueued event has been handled"""
+        await self._dispatcher.join()
 
-            if self._callbacks[EventType.BID_PLACED]:
-                events = self._order_book.events.BidPlaced.get_logs(
-                    from_block=from_block,
-                    to_block=to_block,
-                )
-                for event in events:
-                    await self._process_bid_placed(event)
+    def metrics(self) -> dict[str, dict]:
+        """Queue depth, drop/spill counters and handler latency per event type"""
+        return self._dispatcher.metrics()
 
-            if self._callbacks[EventType.BID_ACCEPTED]:
-                events = self._order_book.events.BidAccepted.get_logs(
-                    from_block=from_block,
-                    to_block=to_block,
-                )
-                for event in events:
-                    await self._process_bid_accepted(event)
+    def poll_metrics(self) -> dict:
+        """Current poll interval, learned block time and observed event lag"""
+        return self.scheduler.metrics()
 
-            if self._callbacks[EventType.DELIVERY_SUBMITTED]:
-                events = self._order_book.events.DeliverySubmitted.get_logs(
-                    from_block=from_block,
-                    to_block=to_block,
-                )
-                for event in events:
-                    await self._process_delivery_submitted(event)
+    def watch_job(self, job_id: int, ttl: float = 600):
+        """Poll tightly while a job has a pending bid, accept or delivery we care about"""
+        self.scheduler.watch(job_id, ttl)
 
-            self._last_block = to_block
+    def unwatch_job(self, job_id: int):
+        """Stop tightening polls for a job"""
+        self.scheduler.unwatch(job_id)
+
+    async def catch_up(self, blocks_back: int = 20):
+        """
+        Process events missed while the agent was down.
+        
+        Resumes right after each event type's checkpointed block when a
+        checkpoint store is configured; otherwise replays the last
+        `blocks_back` blocks.
+        """
+        if not self._w3 or not self._order_book:
+            self._setup_contracts()
+        try:
+            with self._rpc_session():
+                header = await self._w3.eth.get_block("latest")
+                head = await self._track_head(header)
+                logger.info("Catching up events to head %s", head)
+                await self._scan(head, blocks_back=blocks_back)
         except Exception as e:
             logger.error("Catch-up failed: %s", e)
     
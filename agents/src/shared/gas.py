@@ -0,0 +1,203 @@
+"""
+Gas Limits and Gas Prices for Archive Agents
+
+Replaces the fixed 500k gas limit and the per-transaction eth_gasPrice call:
+- GasEstimator always asks eth_estimateGas (gas use depends on calldata and
+  state), and uses each method's recent maximum from receipts as a floor,
+  or as the limit when the estimate request itself fails (RPC transport
+  errors, timeouts). A reverting estimate is raised, never sent.
+- GasPriceOracle caches the node's gas price for a few blocks, and can bid
+  above it for time-critical transactions (priority mode)
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Optional
+
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+logger = logging.getLogger(__name__)
+
+# Used when a method has no history and eth_estimateGas fails
+DEFAULT_GAS_LIMIT = 500_000
+
+
+def is_revert(error: Exception) -> bool:
+    """Whether an eth_estimateGas / eth_call error means the call itself reverts"""
+    return isinstance(error, ContractLogicError) or "revert" in str(error).lower()
+
+# Node timestamps are not needed to age the price cache; assume NeoX block time
+DEFAULT_BLOCK_TIME = 3.0
+
+
+class GasEstimator:
+    """
+    eth_estimateGas limits with per-method floors learned from receipts.
+
+    Usage:
+        gas = gas_estimator.estimate(call, sender)
+        ... send with gas ...
+        gas_estimator.record(call, receipt, gas)
+    """
+
+    def __init__(
+        self,
+        margin: float = float(os.getenv("GAS_LIMIT_MARGIN", "1.2")),
+        history: int = 20,
+        default_limit: int = DEFAULT_GAS_LIMIT,
+    ):
+        """
+        Initialize the estimator.
+
+        Args:
+            margin: Multiplier applied to the learned or estimated gas use
+            history: Receipts remembered per contract method
+            default_limit: Limit used when nothing better is known
+        """
+        self.margin = margin
+        self.history = history
+        self.default_limit = default_limit
+        self._used: dict[tuple[str, str], deque[int]] = {}
+        self._lock = threading.Lock()
+        self._learned_floors = 0
+        self._learned_fallbacks = 0
+        self._estimates = 0
+        self._fallbacks = 0
+
+    @staticmethod
+    def key(call: Any) -> tuple[str, str]:
+        """(contract address, method name) of a bound contract function"""
+        return (str(getattr(call, "address", "")).lower(), getattr(call, "fn_name", "?"))
+
+    def estimate(self, call: Any, sender: str) -> int:
+        """
+        Gas limit for a bound contract function call.
+
+        Raises:
+            ContractLogicError (or the node's "execution reverted" error):
+                the call would revert, so sending it would only burn gas
+        """
+        key = self.key(call)
+        with self._lock:
+            used = self._used.get(key)
+            learned = max(used) if used else None
+
+        try:
+            estimate = call.estimate_gas({"from": sender})
+        except Exception as e:
+            if is_revert(e):
+                raise
+            # The node could not be asked (transport error, timeout); the call itself may be fine
+            if learned is not None:
+                logger.debug(f"Gas estimate for {key[1]} failed ({e}); using learned {learned}")
+                self._learned_fallbacks += 1
+                return int(learned * self.margin)
+            logger.debug(f"Gas estimate for {key[1]} failed ({e}); using {self.default_limit}")
+            self._fallbacks += 1
+            return self.default_limit
+
+        self._estimates += 1
+        if learned is not None and learned > estimate:
+            self._learned_floors += 1
+            estimate = learned
+        return int(estimate * self.margin)
+
+    def record(self, call: Any, receipt: Any, gas_limit: int):
+        """Learn from a receipt; forget a method's history if it ran out of gas"""
+        key = self.key(call)
+        gas_used = receipt["gasUsed"]
+        with self._lock:
+            if receipt["status"] != 1 and gas_used >= gas_limit * 0.99:
+                logger.warning(f"{key[1]} ran out of gas at {gas_limit}; re-estimating next time")
+                self._used.pop(key, None)
+            elif receipt["status"] == 1:
+                self._used.setdefault(key, deque(maxlen=self.history)).append(gas_used)
+
+    def metrics(self) -> dict:
+        """Learned methods and how limits were chosen"""
+        return {
+            "learned_methods": len(self._used),
+            "estimates": self._estimates,
+            "learned_floors": self._learned_floors,
+            "learned_fallbacks": self._learned_fallbacks,
+            "fallbacks": self._fallbacks,
+        }
+
+
+class GasPriceOracle:
+    """
+    eth_gasPrice cached for a few blocks, with an opt-in priority premium.
+
+    Usage:
+        oracle = get_gas_price_oracle(w3)
+        gas_price = oracle.gas_price(priority=True)
+    """
+
+    def __init__(
+        self,
+        w3: Web3,
+        cache_blocks: int = int(os.getenv("GAS_PRICE_CACHE_BLOCKS", "3")),
+        block_time: float = DEFAULT_BLOCK_TIME,
+        priority_multiplier: float = float(os.getenv("GAS_PRIORITY_MULTIPLIER", "1.25")),
+    ):
+        """
+        Initialize the oracle.
+
+        Args:
+            w3: Web3 instance to read the gas price from
+            cache_blocks: Blocks a fetched price stays valid
+            block_time: Seconds per block, to turn cache_blocks into a TTL
+            priority_multiplier: Premium over the node price in priority mode
+        """
+        self.w3 = w3
+        self.ttl = cache_blocks * block_time
+        self.priority_multiplier = priority_multiplier
+        self._price: Optional[int] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def gas_price(self, priority: bool = False) -> int:
+        """Current gas price in wei (raised by the priority multiplier if asked)"""
+        with self._lock:
+            if self._price is None or time.monotonic() - self._fetched_at >= self.ttl:
+                self._price = self.w3.eth.gas_price
+                self._fetched_at = time.monotonic()
+                self._misses += 1
+            else:
+                self._hits += 1
+            price = self._price
+        return int(price * self.priority_multiplier) if priority else price
+
+    def invalidate(self):
+        """Refetch on next use (e.g. after an underpriced rejection)"""
+        with self._lock:
+            self._price = None
+
+    def metrics(self) -> dict:
+        """Cached price and cache hit/miss counts"""
+        return {
+            "gas_price": self._price,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+
+# Process-wide instances: one estimator, one price oracle per RPC endpoint
+gas_estimator = GasEstimator()
+_price_oracles: dict[str, GasPriceOracle] = {}
+_price_oracles_lock = threading.Lock()
+
+
+def get_gas_price_oracle(w3: Web3) -> GasPriceOracle:
+    """Shared GasPriceOracle for a Web3 instance's RPC endpoint"""
+    key = str(getattr(w3.provider, "endpoint_uri", id(w3.provider)))
+    with _price_oracles_lock:
+        if key not in _price_oracles:
+            _price_oracles[key] = GasPriceOracle(w3)
+        return _price_oracles[key]
@@ -0,0 +1,648 @@
+"""
+Local Order-Book Index for Archive Agents
+
+An indexer process ingests OrderBook, JobRegistry, Escrow and
+ReputationToken logs into SQLite tables (jobs, job_tags, bids, deliveries,
+disputes, escrows, reputation) and keeps them current block by block.
+Agents then answer "open jobs tagged X", "bids on job N" or "lowest bid"
+with a local query instead of an RPC round trip.
+
+Ingestion:
+- logs of all four contracts come from one eth_getLogs per chunk (adaptive
+  chunking via LogBackfiller), staying `confirmations` blocks behind head
+- deliveries, disputes, escrows and reputation are written from event args
+- jobs and bids touched by an event are re-read with one batched
+  OrderBook/JobRegistry view call (events do not carry tags, description or
+  delivery time); each event first drops the job's cached views
+- a chunk's rows and the block cursor commit in one transaction, so a
+  restart resumes exactly where the last chunk ended
+
+Readers in other processes open the same file (WAL mode) through
+get_order_book_index(), which returns None while the index is missing or
+lagging, so callers fall back to RPC.
+
+Usage:
+    python -m agents indexer
+"""
+
+import os
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from web3 import Web3, AsyncWeb3
+from eth_utils import event_abi_to_log_topic
+
+from .config import JobType, get_network, get_contract_addresses
+from .contracts import (
+    ContractInstances, get_contracts, get_job_records, load_abi, call_async, RPC_BATCH_SIZE, LEGACY_EVENT_ABIS,
+)
+from .backfill import LogBackfiller
+from .rpc_pool import PooledAsyncHTTPProvider, get_rpc_pool
+from .view_cache import view_cache
+
+logger = logging.getLogger(__name__)
+
+# JobTypes.JobStatus
+JOB_OPEN = 0
+
+# Contract name -> events the indexer applies
+INDEXED_EVENTS: dict[str, tuple[str, ...]] = {
+    "OrderBook": (
+        "JobPosted", "BidPlaced", "BidAccepted", "BidResponseSubmitted",
+        "DeliverySubmitted", "JobApproved", "DisputeRaised",
+        "EvidenceSubmitted", "DisputeResolved",
+    ),
+    "JobRegistry": ("JobIndexed", "BidIndexed", "DeliveryIndexed"),
+    "Escrow": ("EscrowCreated", "PaymentReleased", "PaymentRefunded"),
+    "ReputationToken": ("ReputationUpdated",),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY,
+    poster TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    description TEXT,
+    metadata_uri TEXT,
+    deadline INTEGER,
+    created_at INTEGER,
+    accepted_bid_id INTEGER,
+    delivery_proof TEXT,
+    has_dispute INTEGER NOT NULL DEFAULT 0,
+    updated_block INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, job_id);
+CREATE INDEX IF NOT EXISTS jobs_poster ON jobs (poster, job_id);
+CREATE TABLE IF NOT EXISTS job_tags (
+    job_id INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (job_id, tag)
+);
+CREATE INDEX IF NOT EXISTS job_tags_tag ON job_tags (tag, job_id);
+CREATE TABLE IF NOT EXISTS bids (
+    bid_id INTEGER PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    bidder TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    delivery_time INTEGER,
+    reputation INTEGER,
+    metadata_uri TEXT,
+    response_uri TEXT,
+    accepted INTEGER NOT NULL DEFAULT 0,
+    created_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS bids_job_price ON bids (job_id, price);
+CREATE INDEX IF NOT EXISTS bids_bidder ON bids (bidder);
+CREATE TABLE IF NOT EXISTS deliveries (
+    job_id INTEGER PRIMARY KEY,
+    bid_id INTEGER,
+    proof_hash TEXT,
+    block INTEGER NOT NULL,
+    tx_hash TEXT,
+    approved INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS disputes (
+    dispute_id INTEGER PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    initiator TEXT,
+    reason TEXT,
+    status INTEGER NOT NULL,
+    message TEXT,
+    evidence_count INTEGER NOT NULL DEFAULT 0,
+    raised_block INTEGER,
+    resolved_block INTEGER
+);
+CREATE INDEX IF NOT EXISTS disputes_job ON disputes (job_id);
+CREATE TABLE IF NOT EXISTS escrows (
+    job_id INTEGER PRIMARY KEY,
+    user TEXT,
+    agent TEXT,
+    amount INTEGER,
+    state TEXT NOT NULL,
+    payout INTEGER,
+    fee INTEGER
+);
+CREATE TABLE IF NOT EXISTS reputation (
+    agent TEXT PRIMARY KEY,
+    score INTEGER NOT NULL,
+    jobs_completed INTEGER,
+    jobs_failed INTEGER,
+    total_earned INTEGER,
+    last_updated INTEGER,
+    block INTEGER NOT NULL
+);
+"""
+
+# OrderBook.DisputeStatus.PENDING
+_DISPUTE_PENDING = 1
+
+
+def _int(value: Any) -> int | float:
+    """uint256 for SQLite: INTEGER when it fits in int64, REAL (approximate) beyond"""
+    value = int(value)
+    return value if value < 2 ** 63 else float(value)
+
+
+def _hex(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    return str(value)
+
+
+def _field(value: Any, name: str, index: int) -> Any:
+    """Member of a decoded ABI tuple (dict-like or positional)"""
+    if isinstance(value, dict) or hasattr(value, "keys"):
+        return value[name]
+    return value[index]
+
+
+def job_type_tag(job_type: int | JobType) -> str:
+    """Tag a job type is posted under (e.g. JobType.TIKTOK_SCRAPE -> "tiktok_scrape")"""
+    return JobType(job_type).name.lower()
+
+
+class OrderBookIndex:
+    """
+    SQLite store and query API for the indexed order book.
+
+    Usage:
+        index = get_order_book_index()
+        if index:
+            bids = index.bids_for_job(job_id)
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Open (or create) an index database.
+
+        Args:
+            path: SQLite file path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # ==========================================================================
+    # QUERIES
+    # ==========================================================================
+
+    def _rows(self, sql: str, params: Iterable[Any] = ()) -> list[dict]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, tuple(params))]
+
+    def _with_tags(self, jobs: list[dict]) -> list[dict]:
+        """Attach each job's tag list"""
+        if not jobs:
+            return jobs
+        ids = [job["job_id"] for job in jobs]
+        tags: dict[int, list[str]] = {job_id: [] for job_id in ids}
+        for row in self._rows(
+            f"SELECT job_id, tag FROM job_tags WHERE job_id IN ({','.join('?' * len(ids))})", ids
+        ):
+            tags[row["job_id"]].append(row["tag"])
+        for job in jobs:
+            job["tags"] = tags[job["job_id"]]
+        return jobs
+
+    def job(self, job_id: int) -> Optional[dict]:
+        """One job with its tags, or None if not indexed"""
+        jobs = self._with_tags(self._rows("SELECT * FROM jobs WHERE job_id = ?", (job_id,)))
+        return jobs[0] if jobs else None
+
+    def open_jobs(
+        self,
+        tag: Optional[str] = None,
+        job_type: Optional[int | JobType] = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """
+        Open jobs, newest first.
+
+        Args:
+            tag: Only jobs carrying this tag
+            job_type: Only jobs tagged with this JobType (see job_type_tag)
+            limit: Maximum jobs returned
+        """
+        tags = [t for t in (tag, job_type_tag(job_type) if job_type is not None else None) if t]
+        sql = "SELECT * FROM jobs WHERE status = ?"
+        params: list[Any] = [JOB_OPEN]
+        for t in tags:
+            sql += " AND job_id IN (SELECT job_id FROM job_tags WHERE tag = ?)"
+            params.append(t.lower())
+        sql += " ORDER BY job_id DESC LIMIT ?"
+        params.append(limit)
+        return self._with_tags(self._rows(sql, params))
+
+    def jobs_by_poster(self, poster: str, limit: int = 100) -> list[dict]:
+        """Jobs posted by an address, newest first"""
+        return self._with_tags(self._rows(
+            "SELECT * FROM jobs WHERE poster = ? ORDER BY job_id DESC LIMIT ?",
+            (poster.lower(), limit),
+        ))
+
+    def bids_for_job(self, job_id: int) -> list[dict]:
+        """Bids on a job in the order they were placed"""
+        return self._rows("SELECT * FROM bids WHERE job_id = ? ORDER BY bid_id", (job_id,))
+
+    def lowest_bid(self, job_id: int) -> Optional[dict]:
+        """Cheapest bid on a job, or None if it has none"""
+        rows = self._rows(
+            "SELECT * FROM bids WHERE job_id = ? ORDER BY price, bid_id LIMIT 1", (job_id,)
+        )
+        return rows[0] if rows else None
+
+    def delivery(self, job_id: int) -> Optional[dict]:
+        """Delivery submitted for a job, if any"""
+        rows = self._rows("SELECT * FROM deliveries WHERE job_id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def disputes_for_job(self, job_id: int) -> list[dict]:
+        """Disputes raised on a job"""
+        return self._rows("SELECT * FROM disputes WHERE job_id = ? ORDER BY dispute_id", (job_id,))
+
+    def escrow(self, job_id: int) -> Optional[dict]:
+        """Escrow state of a job (locked / released / refunded)"""
+        rows = self._rows("SELECT * FROM escrows WHERE job_id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def reputation(self, agent: str) -> Optional[dict]:
+        """Latest reputation score and stats of an agent"""
+        rows = self._rows("SELECT * FROM reputation WHERE agent = ?", (agent.lower(),))
+        return rows[0] if rows else None
+
+    def _meta(self, key: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def block(self) -> Optional[int]:
+        """Last fully indexed block"""
+        return self._meta("block")
+
+    def lag_seconds(self) -> Optional[float]:
+        """Seconds since the indexer last caught up with the chain"""
+        synced_at = self._meta("synced_at")
+        return time.time() - synced_at if synced_at is not None else None
+
+    def is_fresh(self, max_lag: float) -> bool:
+        """Whether the indexer caught up within the last max_lag seconds"""
+        lag = self.lag_seconds()
+        return lag is not None and lag <= max_lag
+
+    def metrics(self) -> dict:
+        """Indexed block, lag and row counts"""
+        counts = self._rows(
+            "SELECT (SELECT COUNT(*) FROM jobs) AS jobs, (SELECT COUNT(*) FROM bids) AS bids, "
+            "(SELECT COUNT(*) FROM disputes) AS disputes"
+        )[0]
+        lag = self.lag_seconds()
+        return {"block": self.block, "lag_s": round(lag, 1) if lag is not None else None, **counts}
+
+    # ==========================================================================
+    # WRITES (indexer only)
+    # ==========================================================================
+
+    def mark_synced(self):
+        """Record that the indexer is caught up as of now"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('synced_at', ?)", (int(time.time()),)
+            )
+            self._conn.commit()
+
+    def reset(self):
+        """Drop every indexed row (e.g. the chain was reset under us)"""
+        with self._lock:
+            for table in ("meta", "jobs", "job_tags", "bids", "deliveries", "disputes", "escrows", "reputation"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.commit()
+
+    def apply_chunk(
+        self,
+        block: int,
+        events: list[tuple[str, Any]],
+        job_records: dict[int, tuple[Any, Any]],
+    ):
+        """
+        Write one chunk of decoded events and refreshed jobs, then move the cursor.
+
+        Args:
+            block: Last block of the chunk
+            events: (event name, decoded log) in log order
+            job_records: job_id -> (OrderBook.getJob, JobRegistry.getJob) for touched jobs
+        """
+        with self._lock:
+            try:
+                cur = self._conn.cursor()
+                for name, log in events:
+                    self._write_event(cur, name, log)
+                for job_id, (ob_job, registry_job) in job_records.items():
+                    self._write_job(cur, job_id, ob_job, registry_job, block)
+                cur.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('block', ?)", (block,))
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _write_job(self, cur: sqlite3.Cursor, job_id: int, ob_job: Any, registry_job: Any, block: int):
+        """Upsert a job, its tags and its bids from the contract views"""
+        if ob_job is None:
+            return
+        state, bids = ob_job
+        meta = registry_job[0][0] if registry_job is not None else None
+        cur.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, poster, status, description, metadata_uri, deadline, "
+            "created_at, accepted_bid_id, delivery_proof, has_dispute, updated_block) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job_id, str(state[0]).lower(), int(state[1]),
+                meta[2] if meta else None, meta[3] if meta else None,
+                int(meta[5]) if meta else None, int(meta[6]) if meta else None,
+                _int(state[2]), _hex(state[3]), int(bool(state[4])), block,
+            ),
+        )
+        if meta is not None:
+            cur.execute("DELETE FROM job_tags WHERE job_id = ?", (job_id,))
+            cur.executemany(
+                "INSERT OR IGNORE INTO job_tags (job_id, tag) VALUES (?, ?)",
+                [(job_id, str(tag).lower()) for tag in meta[4]],
+            )
+        cur.executemany(
+            "INSERT OR REPLACE INTO bids (bid_id, job_id, bidder, price, delivery_time, reputation, "
+            "metadata_uri, response_uri, accepted, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    int(bid[0]), int(bid[1]), str(bid[2]).lower(), _int(bid[3]), int(bid[4]),
+                    _int(bid[5]), bid[6], bid[7], int(bool(bid[8])), int(bid[9]),
+                )
+                for bid in bids
+            ],
+        )
+
+    def _write_event(self, cur: sqlite3.Cursor, name: str, log: Any):
+        """Apply the rows an event's args fully describe"""
+        args = log["args"]
+        block = log["blockNumber"]
+        if name == "DeliverySubmitted":
+            cur.execute(
+                "INSERT OR REPLACE INTO deliveries (job_id, bid_id, proof_hash, block, tx_hash, approved) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (args["jobId"], args["bidId"], _hex(args["proofHash"]), block, _hex(log["transactionHash"])),
+            )
+        elif name == "JobApproved":
+            cur.execute("UPDATE deliveries SET approved = 1 WHERE job_id = ?", (args["jobId"],))
+        elif name == "DisputeRaised":
+            cur.execute(
+                "INSERT OR REPLACE INTO disputes (dispute_id, job_id, initiator, reason, status, "
+                "evidence_count, raised_block) VALUES (?, ?, ?, ?, ?, 1, ?)",
+                (args["disputeId"], args["jobId"], str(args["initiator"]).lower(),
+                 args["reason"], _DISPUTE_PENDING, block),
+            )
+        elif name == "EvidenceSubmitted":
+            cur.execute(
+                "UPDATE disputes SET evidence_count = evidence_count + 1 WHERE dispute_id = ?",
+                (args["disputeId"],),
+            )
+        elif name == "DisputeResolved":
+            cur.execute(
+                "UPDATE disputes SET status = ?, message = ?, resolved_block = ? WHERE dispute_id = ?",
+                (int(args["resolution"]), args["message"], block, args["disputeId"]),
+            )
+        elif name == "EscrowCreated":
+            cur.execute(
+                "INSERT OR REPLACE INTO escrows (job_id, user, agent, amount, state) VALUES (?, ?, ?, ?, 'locked')",
+                (args["jobId"], str(args["user"]).lower(), str(args["agent"]).lower(), _int(args["amount"])),
+            )
+        elif name == "PaymentReleased":
+            cur.execute(
+                "UPDATE escrows SET state = 'released', payout = ?, fee = ? WHERE job_id = ?",
+                (_int(args["payout"]), _int(args["fee"]), args["jobId"]),
+            )
+        elif name == "PaymentRefunded":
+            cur.execute("UPDATE escrows SET state = 'refunded' WHERE job_id = ?", (args["jobId"],))
+        elif name == "ReputationUpdated":
+            stats = args["stats"]
+            cur.execute(
+                "INSERT OR REPLACE INTO reputation (agent, score, jobs_completed, jobs_failed, "
+                "total_earned, last_updated, block) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(args["agent"]).lower(), _int(args["score"]),
+                    int(_field(stats, "jobsCompleted", 0)), int(_field(stats, "jobsFailed", 1)),
+                    _int(_field(stats, "totalEarned", 2)), int(_field(stats, "lastUpdated", 3)),
+                    block,
+                ),
+            )
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+class OrderBookIndexer:
+    """
+    Keeps an OrderBookIndex current from chain logs.
+
+    Usage:
+        indexer = OrderBookIndexer(OrderBookIndex(default_index_path()))
+        await indexer.run()
+    """
+
+    def __init__(
+        self,
+        index: OrderBookIndex,
+        contracts: Optional[ContractInstances] = None,
+        poll_interval: float = float(os.getenv("INDEXER_POLL_INTERVAL", "3")),
+        confirmations: int = int(os.getenv("INDEXER_CONFIRMATIONS", "1")),
+        start_block: int = int(os.getenv("INDEXER_START_BLOCK", "0")),
+        chunk_size: int = 2_000,
+    ):
+        """
+        Initialize the indexer.
+
+        Args:
+            index: Store to write into
+            contracts: Contract instances for job/bid views (read-only is enough)
+            poll_interval: Seconds between polls once caught up
+            confirmations: Blocks to stay behind head (the index is never rewound)
+            start_block: First block to index on an empty database
+            chunk_size: Initial eth_getLogs chunk size
+        """
+        self.index = index
+        self.contracts = contracts or get_contracts()
+        self.poll_interval = poll_interval
+        self.confirmations = confirmations
+        self.start_block = start_block
+        self._w3: Optional[AsyncWeb3] = None
+        self._addresses: list[str] = []
+        self._decoders: dict[bytes, tuple[str, Any]] = {}
+        self._backfiller = LogBackfiller(self._fetch_logs, chunk_size=chunk_size)
+        self._running = False
+
+    def _setup(self):
+        """AsyncWeb3 on the shared RPC pool, plus a topic0 decoder per indexed event"""
+        self._w3 = AsyncWeb3(PooledAsyncHTTPProvider(get_rpc_pool(get_network().rpc_urls)))
+        addresses = get_contract_addresses()
+        by_name = {
+            "OrderBook": addresses.order_book,
+            "JobRegistry": addresses.job_registry,
+            "Escrow": addresses.escrow,
+            "ReputationToken": addresses.reputation_token,
+        }
+        for contract_name, event_names in INDEXED_EVENTS.items():
+            if not by_name[contract_name]:
+                logger.warning(f"{contract_name} address not configured; its events are not indexed")
+                continue
+            contract = self._w3.eth.contract(
+                address=Web3.to_checksum_address(by_name[contract_name]),
+                abi=load_abi(contract_name),
+            )
+            self._addresses.append(contract.address)
+            for event_name in event_names:
+                event = getattr(contract.events, event_name)()
+                self._decoders[event_abi_to_log_topic(event.abi)] = (event_name, event)
+            # Event layouts of older deployments of the same contract
+            if contract_name in LEGACY_EVENT_ABIS:
+                legacy = self._w3.eth.contract(address=contract.address, abi=LEGACY_EVENT_ABIS[contract_name])
+                for item in LEGACY_EVENT_ABIS[contract_name]:
+                    event = getattr(legacy.events, item["name"])()
+                    self._decoders[event_abi_to_log_topic(event.abi)] = (item["name"], event)
+
+    async def _fetch_logs(self, from_block: int, to_block: int) -> list[tuple[str, Any]]:
+        """Decoded logs of every indexed contract in an inclusive range"""
+        logs = await self._w3.eth.get_logs({
+            "address": self._addresses,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+        })
+        decoded = []
+        for log in sorted(logs, key=lambda l: (l["blockNumber"], l["logIndex"])):
+            entry = self._decoders.get(bytes(log["topics"][0])) if log["topics"] else None
+            if not entry:
+                continue
+            event_name, decoder = entry
+            try:
+                decoded.append((event_name, decoder.process_log(log)))
+            except Exception as e:
+                logger.warning(f"Could not decode {event_name} log: {e}")
+        return decoded
+
+    async def _apply_chunk(self, start: int, end: int, events: list[tuple[str, Any]]):
+        """Refresh the jobs a chunk touched and commit it with the cursor"""
+        touched: list[int] = []
+        for name, log in events:
+            job_id = log["args"].get("jobId")
+            if job_id is None:
+                continue
+            # The refresh below must not be served from this process's view cache
+            view_cache.invalidate(job_id)
+            if job_id not in touched:
+                touched.append(job_id)
+
+        records: dict[int, tuple[Any, Any]] = {}
+        for i in range(0, len(touched), RPC_BATCH_SIZE):
+            batch = touched[i:i + RPC_BATCH_SIZE]
+            records.update(await call_async(get_job_records, self.contracts, batch))
+
+        await asyncio.to_thread(self.index.apply_chunk, end, events, records)
+        if events:
+            logger.info(f"Indexed blocks {start}-{end}: {len(events)} events, {len(records)} jobs")
+
+    async def sync(self) -> Optional[int]:
+        """Index everything up to head - confirmations; returns the indexed block"""
+        if self._w3 is None:
+            self._setup()
+        head = await self._w3.eth.block_number
+        target = head - self.confirmations
+        last = self.index.block
+        if last is not None and last > head:
+            logger.warning(f"Index is at block {last} but head is {head}; chain was reset, re-indexing")
+            self.index.reset()
+            last = None
+        from_block = self.start_block if last is None else last + 1
+        if from_block <= target:
+            await self._backfiller.run(from_block, target, self._apply_chunk)
+        self.index.mark_synced()
+        return self.index.block
+
+    async def run(self):
+        """Poll until stop() is called"""
+        self._running = True
+        logger.info(f"📚 Order-book indexer writing to {self.index.path}")
+        while self._running:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Indexer sync failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def stop(self):
+        """Stop after the current poll"""
+        self._running = False
+
+
+def default_index_path() -> Path:
+    """INDEXER_DB, or orderbook.sqlite next to the event checkpoints"""
+    path = os.getenv("INDEXER_DB")
+    if path:
+        return Path(path).expanduser()
+    base_dir = Path(os.getenv("EVENT_CHECKPOINT_DIR", "~/.archive-agents")).expanduser()
+    return base_dir / "orderbook.sqlite"
+
+
+_index: Optional[OrderBookIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_order_book_index(max_lag: Optional[float] = None) -> Optional[OrderBookIndex]:
+    """
+    Shared read handle on the local index, if it is being kept current.
+
+    Args:
+        max_lag: Seconds since the indexer's last sync beyond which the index
+            is treated as unavailable (INDEXER_MAX_LAG, default 30)
+
+    Returns:
+        The index, or None if no indexer has written one recently (callers
+        fall back to RPC)
+    """
+    global _index
+    if max_lag is None:
+        max_lag = float(os.getenv("INDEXER_MAX_LAG", "30"))
+    if _index is None:
+        path = default_index_path()
+        if not path.exists():
+            return None
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = OrderBookIndex(path)
+                except sqlite3.Error as e:
+                    logger.debug(f"Order-book index unavailable: {e}")
+                    return None
+    return _index if _index.is_fresh(max_lag) else None
+
+
+def run_indexer():
+    """Entry point for `python -m agents indexer`"""
+    indexer = OrderBookIndexer(OrderBookIndex(default_index_path()))
+    try:
+        asyncio.run(indexer.run())
+    except KeyboardInterrupt:
+        pass
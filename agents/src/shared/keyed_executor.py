@@ -0,0 +1,105 @@
+"""
+Keyed Executor for Archive Agents
+
+Runs event handlers sharded by a key (the job ID). Work submitted for the
+same key runs strictly in submission order, one item at a time; work for
+different keys runs in parallel, capped by max_concurrency. This keeps
+BidPlaced -> BidAccepted -> DeliverySubmitted ordered per job without
+serializing unrelated jobs behind one slow LLM call.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class KeyedExecutor:
+    """
+    Per-key ordered, cross-key parallel task runner.
+
+    Usage:
+        executor = KeyedExecutor(max_concurrency=8)
+        await executor.submit(event.job_id, self._evaluate_bid, event)
+    """
+
+    def __init__(self, max_concurrency: int = 8, name: str = "keyed"):
+        """
+        Initialize the executor.
+
+        Args:
+            max_concurrency: Keys allowed to run a handler at the same time
+            name: Label used in logs and task names
+        """
+        self.max_concurrency = max_concurrency
+        self.name = name
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: dict[Hashable, deque] = {}
+        self._workers: dict[Hashable, asyncio.Task] = {}
+
+    def submit(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> asyncio.Future:
+        """
+        Queue fn(*args) behind any earlier work for the same key.
+
+        Returns:
+            Future resolved with the handler's result (or its exception)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(key, deque()).append((fn, args, future))
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(
+                self._drain(key), name=f"{self.name}-{key}"
+            )
+        return future
+
+    async def _drain(self, key: Hashable):
+        """Run one key's queue in order, then retire the worker"""
+        queue = self._pending[key]
+        future = None
+        try:
+            while queue:
+                fn, args, future = queue.popleft()
+                async with self._semaphore:
+                    try:
+                        result = await fn(*args)
+                        if not future.done():
+                            future.set_result(result)
+                    except Exception as e:
+                        logger.error(f"{self.name} handler for {key} failed: {e}")
+                        if not future.done():
+                            future.set_exception(e)
+                            # Nobody may await this future; don't warn about it
+                            future.exception()
+        finally:
+            # On stop(), callers awaiting the running or queued work see it cancelled
+            if future is not None:
+                future.cancel()
+            for _, _, queued in queue:
+                queued.cancel()
+            self._pending.pop(key, None)
+            self._workers.pop(key, None)
+
+    async def join(self):
+        """Wait until all submitted work has finished"""
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    def stop(self):
+        """Cancel all running and queued work"""
+        for task in list(self._workers.values()):
+            task.cancel()
+
+    def metrics(self) -> dict:
+        """Active keys and queued handler counts"""
+        return {
+            "active_keys": len(self._workers),
+            "queued": sum(len(q) for q in self._pending.values()),
+            "max_concurrency": self.max_concurrency,
+        }
@@ -2,19 +2,91 @@
 NeoFS REST Gateway Client
 
 Uses the NeoFS REST Gateway API for decentralized storage.
+
+get_neofs_client() hands out a process-wide client whose requests share one
+pooled httpx.AsyncClient per event loop, so uploads and downloads reuse
+keep-alive (optionally HTTP/2) connections to the gateway instead of paying
+TCP and TLS setup each time. close() on that client is a no-op; servers
+call close_neofs_client() on shutdown.
+
+Payloads stream through the gateway's raw-body endpoints
+(NEOFS_RAW_UPLOAD_PATH / NEOFS_RAW_DOWNLOAD_PATH) in NEOFS_STREAM_CHUNK_KB
+chunks: uploads take bytes, files or async byte iterators, and
+stream_object() / download_to_file() never hold a whole object in memory.
+Gateways without those endpoints are detected on first use and get the
+base64 JSON API instead. JSON is uploaded in canonical compact form, and a
+payload that was uploaded before returns the existing object ID (see
+neofs_index.py). upload_json(..., defer=True) hands the upload to the
+write-behind queue (neofs_queue.py) and returns a content-derived
+neofs://<cid>/sha256-<hex> URI at once. Only this host's readers resolve
+those reliably, so anything bound for the chain awaits result() for the
+real object ID first.
 """
 
 import os
 import json
 import base64
 import time
-from typing import Optional, Any
+import asyncio
+import logging
+import tempfile
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Any, AsyncIterable, AsyncIterator, IO
 from dataclasses import dataclass
 from datetime import datetime
 
 import httpx
 from pydantic import BaseModel
 
+from .neofs_cache import NeoFSCache, get_neofs_cache
+from .neofs_index import (
+    ATTRIBUTES_HASH_ATTRIBUTE,
+    CONTENT_HASH_ATTRIBUTE,
+    attributes_digest,
+    canonical_json,
+    content_digest,
+    file_digest,
+    get_upload_index,
+    iter_canonical_json,
+    json_digest,
+    parse_content_object_id,
+)
+
+if TYPE_CHECKING:
+    from .neofs_queue import PendingUpload
+
+try:
+    import h2  # noqa: F401  (installed by httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+NEOFS_TIMEOUT = float(os.getenv("NEOFS_TIMEOUT", "60"))
+NEOFS_MAX_CONNECTIONS = int(os.getenv("NEOFS_MAX_CONNECTIONS", "20"))
+NEOFS_MAX_KEEPALIVE = int(os.getenv("NEOFS_MAX_KEEPALIVE", "10"))
+NEOFS_KEEPALIVE_EXPIRY = float(os.getenv("NEOFS_KEEPALIVE_EXPIRY", "30"))
+NEOFS_HTTP2 = os.getenv("NEOFS_HTTP2", "false").lower() in ("1", "true", "yes")
+
+# Raw-body (streaming) endpoints; base64 JSON on /v1/objects is the fallback
+NEOFS_STREAMING = os.getenv("NEOFS_STREAMING", "true").lower() in ("1", "true", "yes")
+NEOFS_STREAM_CHUNK = int(float(os.getenv("NEOFS_STREAM_CHUNK_KB", "64")) * 1024)
+NEOFS_RAW_UPLOAD_PATH = os.getenv("NEOFS_RAW_UPLOAD_PATH", "/v1/upload/{container_id}")
+NEOFS_RAW_DOWNLOAD_PATH = os.getenv("NEOFS_RAW_DOWNLOAD_PATH", "/v1/get/{container_id}/{object_id}")
+
+# Look up uploads by their ContentHash attribute when the local index misses
+NEOFS_DEDUP_SEARCH = os.getenv("NEOFS_DEDUP_SEARCH", "false").lower() in ("1", "true", "yes")
+
+# Statuses meaning "this gateway has no such endpoint"
+_RAW_UNSUPPORTED_STATUS = (404, 405, 501)
+
+# What we learned per gateway URL: True (raw works), False (base64 only), absent (unknown)
+_raw_support: dict[str, bool] = {}
+
+UploadSource = bytes | bytearray | memoryview | str | os.PathLike | AsyncIterable[bytes]
+
 
 @dataclass
 class NeoFSConfig:
@@ -33,6 +105,11 @@ class UploadResult(BaseModel):
     """Result of object upload"""
     object_id: str
     container_id: str
+    deduplicated: bool = False  # an identical payload was already stored
+
+    async def result(self, timeout: Optional[float] = None) -> "UploadResult":
+        """Itself; matches PendingUpload.result() so callers can await either"""
+        return self
 
 
 class NeoFSObject(BaseModel):
@@ -43,41 +120,282 @@ class NeoFSObject(BaseModel):
     size: int
 
 
+# Pooled HTTP client
+#
+# httpx connections are bound to the event loop that opened them, so the
+# pool is per loop; a process normally runs one.
+
+_shared_http: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _new_http_client() -> httpx.AsyncClient:
+    """httpx client with the NEOFS_* pool limits"""
+    http2 = NEOFS_HTTP2 and HTTP2_AVAILABLE
+    if NEOFS_HTTP2 and not http2:
+        logger.warning("NEOFS_HTTP2 is set but h2 is not installed (pip install 'httpx[http2]'); using HTTP/1.1")
+    return httpx.AsyncClient(
+        timeout=NEOFS_TIMEOUT,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=NEOFS_MAX_CONNECTIONS,
+            max_keepalive_connections=NEOFS_MAX_KEEPALIVE,
+            keepalive_expiry=NEOFS_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def shared_http_client() -> httpx.AsyncClient:
+    """The pooled NeoFS HTTP client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _shared_http.get(loop)
+    if client is None or client.is_closed:
+        client = _shared_http[loop] = _new_http_client()
+    return client
+
+
+class RawEndpointUnsupported(Exception):
+    """The gateway does not serve the raw upload/download endpoint"""
+
+
+async def _iter_file(path: str | os.PathLike, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+    """A file's contents in chunks, read off the event loop"""
+    chunk_size = chunk_size or NEOFS_STREAM_CHUNK
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+    finally:
+        f.close()
+
+
+async def _tee(chunks: AsyncIterable[bytes], copy: IO[bytes]) -> AsyncIterator[bytes]:
+    """Pass chunks through while writing them to copy"""
+    async for chunk in chunks:
+        copy.write(chunk)
+        yield chunk
+
+
+async def _iter_json(data: Any) -> AsyncIterator[bytes]:
+    """Canonical JSON encoding of data in chunks of about NEOFS_STREAM_CHUNK bytes"""
+    buffer: list[str] = []
+    buffered = 0
+    for piece in iter_canonical_json(data):
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= NEOFS_STREAM_CHUNK:
+            yield "".join(buffer).encode("utf-8")
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+async def _read_all(data: UploadSource) -> bytes:
+    """Whole payload of an upload source (base64 fallback only)"""
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data)
+    if isinstance(data, os.PathLike):
+        return await asyncio.to_thread(Path(data).read_bytes)
+    return b"".join([chunk async for chunk in data])
+
+
 class NeoFSClient:
     """
     NeoFS REST Gateway client.
     
-    Uses the REST Gateway (HTTP Gateway is deprecated).
+    Uses the REST Gateway (HTTP Gateway is deprecated). A client built with
+    shared=True uses the process-wide connection pool and does not close it;
+    otherwise it owns its own httpx client.
     """
     
-    def __init__(self, config: NeoFSConfig):
+    def __init__(self, config: NeoFSConfig, shared: bool = False):
         self.gateway_url = config.gateway_url.rstrip('/')
         self.container_id = config.container_id
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self.shared = shared
+        self._client = None if shared else httpx.AsyncClient(timeout=NEOFS_TIMEOUT)
+        # (container, content hash, attributes hash) -> result of the upload in progress
+        self._inflight: dict[tuple[str, str, str], asyncio.Future] = {}
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client for gateway requests"""
+        return shared_http_client() if self.shared else self._client
     
     async def upload_object(
         self,
-        data: bytes | str,
+        data: UploadSource,
         attributes: list[ObjectAttribute] | None = None,
-        container_id: str | None = None
+        container_id: str | None = None,
+        content_hash: str | None = None,
     ) -> UploadResult:
-        """Upload data to NeoFS via REST POST /v1/objects/{cid}."""
-
+        """
+        Upload data to NeoFS, unless the same payload is already stored with
+        the same attributes (volatile ones like Timestamp aside).
+        
+        The payload is streamed as the raw request body (chunked transfer for
+        iterators) when the gateway has the raw upload endpoint, and sent as
+        base64 JSON via POST /v1/objects/{cid} otherwise.
+        
+        Args:
+            data: bytes, str, a file path, or an async iterator of byte chunks
+            attributes: Object attributes
+            container_id: Override default container ID
+            content_hash: sha256 hex of the payload; computed for bytes and
+                files, required for iterators to be deduplicated
+            
+        Returns:
+            UploadResult (deduplicated=True if nothing was uploaded)
+        """
         cid = container_id or self.container_id
         if not cid:
             raise ValueError("Container ID is required")
 
-        # Convert to base64 if string
         if isinstance(data, str):
             data = data.encode('utf-8')
-        payload_b64 = base64.b64encode(data).decode('ascii')
 
+        index = get_upload_index()
+        if index and content_hash is None:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                content_hash = content_digest(data)
+            elif isinstance(data, os.PathLike):
+                content_hash = await asyncio.to_thread(file_digest, data)
+        if not index or content_hash is None:
+            return await self._upload_new(cid, data, attributes)
+
+        # Hash attributes are (re)computed here; queued rows may carry stale copies
+        attributes = [
+            attr for attr in attributes or []
+            if attr.key not in (CONTENT_HASH_ATTRIBUTE, ATTRIBUTES_HASH_ATTRIBUTE)
+        ]
+        attributes_hash = attributes_digest({attr.key: attr.value for attr in attributes})
+        key = (cid, content_hash, attributes_hash)
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            # The same upload is running right now; share its result
+            result = await asyncio.shield(inflight)
+            return result.model_copy(update={"deduplicated": True})
+
+        object_id = await self._find_existing(cid, content_hash, attributes_hash)
+        if object_id:
+            return UploadResult(object_id=object_id, container_id=cid, deduplicated=True)
+
+        attributes += [
+            ObjectAttribute(key=CONTENT_HASH_ATTRIBUTE, value=content_hash),
+            ObjectAttribute(key=ATTRIBUTES_HASH_ATTRIBUTE, value=attributes_hash),
+        ]
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._upload_new(cid, data, attributes)
+            if result.object_id:
+                size = len(data) if isinstance(data, bytes) else None
+                index.record(cid, content_hash, attributes_hash, result.object_id, size)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: waiters re-raise it, nobody else needs to
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _find_existing(self, cid: str, content_hash: str, attributes_hash: str) -> Optional[str]:
+        """Object ID of the same payload with the same attributes: local index first, then (opt-in) a search"""
+        index = get_upload_index()
+        object_id = index.lookup(cid, content_hash, attributes_hash) if index else None
+        if object_id is None and NEOFS_DEDUP_SEARCH:
+            try:
+                matches = await self.search_objects(
+                    {CONTENT_HASH_ATTRIBUTE: content_hash, ATTRIBUTES_HASH_ATTRIBUTE: attributes_hash}, cid
+                )
+                object_id = next((obj.object_id for obj in matches if obj.object_id), None)
+            except Exception as e:
+                logger.debug(f"ContentHash search failed on {cid}: {e}")
+            if object_id and index:
+                index.record(cid, content_hash, attributes_hash, object_id)
+        return object_id
+
+    async def _upload_new(
+        self,
+        cid: str,
+        data: UploadSource,
+        attributes: list[ObjectAttribute] | None,
+    ) -> UploadResult:
+        """Upload without deduplication: raw streaming, else base64"""
         # Build attributes dict
         attrs_dict = {}
         if attributes:
             for attr in attributes:
                 attrs_dict[attr.key] = attr.value
 
+        if self._raw_enabled():
+            spool = None
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                body, size = data, len(data)
+            elif isinstance(data, os.PathLike):
+                body, size = _iter_file(data), os.path.getsize(data)
+            elif _raw_support.get(self.gateway_url) is None:
+                # First upload to this gateway: keep a replayable copy in case it
+                # lacks the raw endpoint (spills to disk past a few chunks)
+                spool = tempfile.SpooledTemporaryFile(max_size=NEOFS_STREAM_CHUNK * 16)
+                body, size = _tee(data, spool), None
+            else:
+                body, size = data, None
+            try:
+                return await self._upload_raw(cid, body, size, attrs_dict)
+            except RawEndpointUnsupported:
+                logger.info(f"NeoFS gateway {self.gateway_url} has no raw upload endpoint; using base64 uploads")
+                _raw_support[self.gateway_url] = False
+                if spool is not None:
+                    async for _ in body:  # whatever the gateway did not read
+                        pass
+                    spool.seek(0)
+                    data = spool.read()
+                elif not isinstance(data, (bytes, bytearray, memoryview, os.PathLike)):
+                    raise ValueError("Gateway rejected the streamed upload and the stream cannot be replayed")
+            finally:
+                if spool is not None:
+                    spool.close()
+
+        return await self._upload_base64(cid, await _read_all(data), attrs_dict)
+
+    async def upload_file(
+        self,
+        path: str | os.PathLike,
+        attributes: list[ObjectAttribute] | None = None,
+        container_id: str | None = None
+    ) -> UploadResult:
+        """Upload a file, streaming it from disk"""
+        return await self.upload_object(Path(path), attributes, container_id)
+
+    async def _upload_raw(
+        self,
+        cid: str,
+        body: bytes | AsyncIterator[bytes],
+        size: Optional[int],
+        attrs_dict: dict[str, str],
+    ) -> UploadResult:
+        """Raw-body upload; raises RawEndpointUnsupported if the gateway lacks it"""
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "X-Attributes": json.dumps(attrs_dict),
+        }
+        if size is not None:
+            headers["Content-Length"] = str(size)
+        response = await self.client.post(
+            self.gateway_url + NEOFS_RAW_UPLOAD_PATH.format(container_id=cid),
+            content=body,
+            headers=headers,
+        )
+        if response.status_code in _RAW_UNSUPPORTED_STATUS:
+            raise RawEndpointUnsupported(response.status_code)
+        response.raise_for_status()
+        _raw_support[self.gateway_url] = True
+        return self._upload_result(response, cid)
+
+    async def _upload_base64(self, cid: str, data: bytes, attrs_dict: dict[str, str]) -> UploadResult:
+        """Upload via POST /v1/objects/{cid} with a base64 JSON body"""
+        payload_b64 = base64.b64encode(data).decode('ascii')
         response = await self.client.post(
             f"{self.gateway_url}/v1/objects/{cid}",
             json={
@@ -86,7 +404,10 @@ class NeoFSClient:
             },
         )
         response.raise_for_status()
+        return self._upload_result(response, cid)
 
+    @staticmethod
+    def _upload_result(response: httpx.Response, cid: str) -> UploadResult:
         result = response.json()
         object_id = result.get("object_id") or result.get("oid")
         return UploadResult(
@@ -100,10 +421,11 @@ class NeoFSClient:
         container_id: str | None = None
     ) -> bytes:
         """
-        Download object from NeoFS.
+        Download object from NeoFS (served from the local cache when present).
         
         Args:
-            object_id: Object ID to download
+            object_id: Object ID to download, or a content-derived
+                sha256-<hex> ID handed out by the upload queue
             container_id: Override default container ID
             
         Returns:
@@ -113,6 +435,148 @@ class NeoFSClient:
         if not cid:
             raise ValueError("Container ID is required")
         
+        cache = get_neofs_cache()
+        if cache:
+            cached = await asyncio.to_thread(cache.get, cid, object_id)
+            if cached is not None:
+                return cached
+        
+        content_hash = parse_content_object_id(object_id)
+        if content_hash is None:
+            return b"".join([chunk async for chunk in self._stream_remote(cid, object_id, cache)])
+        
+        spooled = _queued_payload(cid, content_hash)
+        if spooled is not None:
+            try:
+                return await asyncio.to_thread(spooled.read_bytes)
+            except FileNotFoundError:
+                pass  # uploaded meanwhile
+        data = await self.download_object(await self._resolve_content_id(cid, content_hash), cid)
+        if content_digest(data) != content_hash:
+            raise ValueError(f"NeoFS object for {object_id} does not match its content hash")
+        if cache:
+            await asyncio.to_thread(cache.put, cid, object_id, data)
+        return data
+
+    async def stream_object(
+        self,
+        object_id: str,
+        container_id: str | None = None,
+        chunk_size: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield an object's payload in chunks without holding all of it in memory.
+        
+        Cached objects stream from disk; downloads are written through to the
+        cache as they arrive.
+        
+        Args:
+            object_id: Object ID to download
+            container_id: Override default container ID
+            chunk_size: Bytes per chunk (default NEOFS_STREAM_CHUNK_KB)
+        """
+        cid = container_id or self.container_id
+        if not cid:
+            raise ValueError("Container ID is required")
+        
+        cache = get_neofs_cache()
+        cached_path = cache.path(cid, object_id) if cache else None
+        content_hash = parse_content_object_id(object_id)
+        if cached_path is None and content_hash is not None:
+            cached_path = _queued_payload(cid, content_hash)
+            if cached_path is None:
+                object_id = await self._resolve_content_id(cid, content_hash)
+                cached_path = cache.path(cid, object_id) if cache else None
+        if cached_path is not None:
+            async for chunk in _iter_file(cached_path, chunk_size):
+                yield chunk
+            return
+        async for chunk in self._stream_remote(cid, object_id, cache, chunk_size):
+            yield chunk
+
+    async def _resolve_content_id(self, cid: str, content_hash: str) -> str:
+        """Real object ID of a queued upload: the upload index, else a ContentHash search"""
+        index = get_upload_index()
+        object_id = index.lookup(cid, content_hash) if index else None
+        if object_id is None:
+            matches = await self.search_objects({CONTENT_HASH_ATTRIBUTE: content_hash}, cid)
+            found = next((obj for obj in matches if obj.object_id), None)
+            if found is None:
+                raise ValueError(f"No NeoFS object in {cid} has content hash {content_hash} (not uploaded yet?)")
+            object_id = found.object_id
+            if index:
+                attributes_hash = attributes_digest({attr.key: attr.value for attr in found.attributes})
+                index.record(cid, content_hash, attributes_hash, object_id)
+        return object_id
+
+    async def download_to_file(
+        self,
+        object_id: str,
+        path: str | os.PathLike,
+        container_id: str | None = None
+    ) -> Path:
+        """
+        Stream an object into a file (written atomically).
+        
+        Returns:
+            The file path
+        """
+        path = Path(path)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in self.stream_object(object_id, container_id):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return path
+
+    async def _stream_remote(
+        self,
+        cid: str,
+        object_id: str,
+        cache: Optional[NeoFSCache],
+        chunk_size: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Gateway download in chunks (raw endpoint, else base64), written through to the cache"""
+        chunk_size = chunk_size or NEOFS_STREAM_CHUNK
+        raw_missing = False
+        if self._raw_enabled():
+            url = self.gateway_url + NEOFS_RAW_DOWNLOAD_PATH.format(container_id=cid, object_id=object_id)
+            async with self.client.stream("GET", url) as response:
+                if response.status_code in _RAW_UNSUPPORTED_STATUS:
+                    # Could also be a missing object; the base64 endpoint decides
+                    raw_missing = True
+                else:
+                    response.raise_for_status()
+                    _raw_support[self.gateway_url] = True
+                    writer = cache.writer(cid, object_id) if cache else None
+                    try:
+                        async for chunk in response.aiter_bytes(chunk_size):
+                            if writer:
+                                writer.write(chunk)
+                            yield chunk
+                    except BaseException:
+                        if writer:
+                            writer.abort()
+                        raise
+                    if writer:
+                        await asyncio.to_thread(writer.commit)
+                    return
+
+        data = await self._download_base64(cid, object_id)
+        if raw_missing and _raw_support.get(self.gateway_url) is None:
+            logger.info(f"NeoFS gateway {self.gateway_url} has no raw download endpoint; using base64 downloads")
+            _raw_support[self.gateway_url] = False
+        if cache:
+            await asyncio.to_thread(cache.put, cid, object_id, data)
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
+    async def _download_base64(self, cid: str, object_id: str) -> bytes:
+        """Download via GET /v1/objects/{cid}/by_id/{oid} (base64 JSON body)"""
         response = await self.client.get(
             f"{self.gateway_url}/v1/objects/{cid}/by_id/{object_id}"
         )
@@ -123,6 +587,10 @@ class NeoFSClient:
         if payload_b64 is None:
             raise ValueError("Payload missing in NeoFS response")
         return base64.b64decode(payload_b64)
+
+    def _raw_enabled(self) -> bool:
+        """Whether to try the raw (streaming) endpoints on this gateway"""
+        return NEOFS_STREAMING and _raw_support.get(self.gateway_url) is not False
     
     async def search_objects(
         self,
@@ -173,8 +641,9 @@ class NeoFSClient:
         data: Any,
         filename: str,
         additional_attributes: list[ObjectAttribute] | None = None,
-        container_id: str | None = None
-    ) -> UploadResult:
+        container_id: str | None = None,
+        defer: bool = False,
+    ) -> "UploadResult | PendingUpload":
         """
         Upload JSON data with proper attributes.
         
@@ -183,12 +652,12 @@ class NeoFSClient:
             filename: Filename for the object
             additional_attributes: Extra attributes to add
             container_id: Override default container ID
+            defer: Queue the upload (neofs_queue.py) instead of waiting for it
             
         Returns:
-            UploadResult
+            UploadResult, or a PendingUpload when deferred; both have
+            container_id and object_id for building the neofs:// URI
         """
-        json_string = json.dumps(data, indent=2)
-        
         attributes = [
             ObjectAttribute(key="FileName", value=filename),
             ObjectAttribute(key="ContentType", value="application/json"),
@@ -197,14 +666,26 @@ class NeoFSClient:
         if additional_attributes:
             attributes.extend(additional_attributes)
         
-        return await self.upload_object(json_string, attributes, container_id)
+        if defer:
+            from .neofs_queue import get_upload_queue  # neofs_queue imports this module
+            queue = get_upload_queue()
+            if queue:
+                return await queue.enqueue(self, canonical_json(data), attributes, container_id)
+        
+        # Canonical compact JSON; streamed uploads encode it chunk by chunk
+        # (hashing is a separate pass, so the document is never one string)
+        content_hash = await asyncio.to_thread(json_digest, data) if get_upload_index() else None
+        body = _iter_json(data) if self._raw_enabled() else canonical_json(data)
+        
+        return await self.upload_object(body, attributes, container_id, content_hash=content_hash)
     
     async def upload_scraping_results(
         self,
         results: Any,
         job_id: str | int,
-        source: str
-    ) -> UploadResult:
+        source: str,
+        defer: bool = False,
+    ) -> "UploadResult | PendingUpload":
         """
         Upload scraping results with standard attributes.
         
@@ -212,9 +693,10 @@ class NeoFSClient:
             results: Scraping results (JSON-serializable)
             job_id: Job ID
             source: Source identifier (e.g., "tiktok", "web")
+            defer: Queue the upload instead of waiting for it
             
         Returns:
-            UploadResult
+            UploadResult, or a PendingUpload when deferred
         """
         import time
         filename = f"scrape-{job_id}-{int(time.time())}.json"
@@ -226,15 +708,17 @@ class NeoFSClient:
                 ObjectAttribute(key="Type", value="scrape_result"),
                 ObjectAttribute(key="JobId", value=str(job_id)),
                 ObjectAttribute(key="Source", value=source),
-            ]
+            ],
+            defer=defer,
         )
     
     async def upload_call_result(
         self,
         result: Any,
         job_id: str | int,
-        phone_number: str
-    ) -> UploadResult:
+        phone_number: str,
+        defer: bool = False,
+    ) -> "UploadResult | PendingUpload":
         """
         Upload call recording/result with standard attributes.
         
@@ -242,9 +726,10 @@ class NeoFSClient:
             result: Call result (JSON-serializable)
             job_id: Job ID
             phone_number: Called phone number
+            defer: Queue the upload instead of waiting for it
             
         Returns:
-            UploadResult
+            UploadResult, or a PendingUpload when deferred
         """
         import time
         filename = f"call-{job_id}-{int(time.time())}.json"
@@ -256,12 +741,14 @@ class NeoFSClient:
                 ObjectAttribute(key="Type", value="call_result"),
                 ObjectAttribute(key="JobId", value=str(job_id)),
                 ObjectAttribute(key="PhoneNumber", value=phone_number),
-            ]
+            ],
+            defer=defer,
         )
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """Close the HTTP client (no-op for the shared client)"""
+        if not self.shared:
+            await self._client.aclose()
 
 
 async def upload_job_metadata(
@@ -269,14 +756,20 @@ async def upload_job_metadata(
     tags: list[str] | None = None,
     *,
     filename_prefix: str = "job-metadata",
+    defer: bool = False,
 ) -> str:
     """
     Upload job metadata document to NeoFS and return URI.
 
+    The URI is meant for postJob, so it always names the real object: a
+    deferred upload goes through the queue (durable, retried with backoff)
+    and is still awaited.
+
     Args:
         metadata: JSON-serializable metadata payload.
         tags: Optional tags to store alongside the object for discovery.
         filename_prefix: Prefix for generated filename.
+        defer: Upload through the write-behind queue instead of inline.
     """
     client = get_neofs_client()
     timestamp = int(time.time())
@@ -291,14 +784,87 @@ async def upload_job_metadata(
         metadata,
         filename=f"{filename_prefix}-{timestamp}.json",
         additional_attributes=attributes,
+        defer=defer,
     )
-    await client.close()
+    result = await result.result()
     return f"neofs://{result.container_id}/{result.object_id}"
 
 
-def get_neofs_client() -> NeoFSClient:
-    """Get default NeoFS client from environment"""
-    return NeoFSClient(NeoFSConfig(
-        gateway_url=os.getenv("NEOFS_REST_GATEWAY", "http://rest.t5.fs.neo.org:8080"),
-        container_id=os.getenv("NEOFS_CONTAINER_ID"),
-    ))
+def _queued_payload(cid: str, content_hash: str) -> Optional[Path]:
+    """Local spool file of a payload still in the upload queue"""
+    from .neofs_queue import get_upload_queue  # neofs_queue imports this module
+    queue = get_upload_queue()
+    return queue.payload_path(cid, content_hash) if queue else None
+
+
+def resolve_object_id(
+    container_id: str,
+    object_id: str,
+    gateway_url: Optional[str] = None,
+    timeout: float = 10.0,
+) -> Optional[str]:
+    """
+    Real object ID behind a content-derived ID, for synchronous readers.
+
+    Args:
+        container_id: Container holding the object
+        object_id: Any object ID; real NeoFS IDs are returned unchanged
+        gateway_url: Override NEOFS_REST_GATEWAY
+        timeout: Search request timeout in seconds
+
+    Returns:
+        The object ID, or None if the payload is not in NeoFS (yet)
+    """
+    content_hash = parse_content_object_id(object_id)
+    if content_hash is None:
+        return object_id
+    index = get_upload_index()
+    resolved = index.lookup(container_id, content_hash) if index else None
+    if resolved is None:
+        gateway = (gateway_url or os.getenv("NEOFS_REST_GATEWAY", "http://rest.t5.fs.neo.org:8080")).rstrip("/")
+        try:
+            response = httpx.post(
+                f"{gateway}/v1/objects/{container_id}/search",
+                json={"filters": [{"key": CONTENT_HASH_ATTRIBUTE, "match": "STRING_EQUAL", "value": content_hash}]},
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            found = next((obj for obj in response.json().get("objects", []) if obj.get("object_id")), None)
+        except Exception as e:
+            logger.debug(f"ContentHash search failed on {container_id}: {e}")
+            return None
+        resolved = found["object_id"] if found else None
+        if resolved and index:
+            index.record(container_id, content_hash, attributes_digest(found.get("attributes") or {}), resolved)
+    return resolved
+
+
+_neofs_clients: dict[tuple[str, Optional[str]], NeoFSClient] = {}
+
+
+def get_neofs_client(
+    gateway_url: Optional[str] = None,
+    container_id: Optional[str] = None,
+) -> NeoFSClient:
+    """
+    Get the shared NeoFS client (configured from the environment by default).
+    
+    Args:
+        gateway_url: Override NEOFS_REST_GATEWAY
+        container_id: Override NEOFS_CONTAINER_ID
+    """
+    config = NeoFSConfig(
+        gateway_url=gateway_url or os.getenv("NEOFS_REST_GATEWAY", "http://rest.t5.fs.neo.org:8080"),
+        container_id=container_id or os.getenv("NEOFS_CONTAINER_ID"),
+    )
+    key = (config.gateway_url, config.container_id)
+    if key not in _neofs_clients:
+        _neofs_clients[key] = NeoFSClient(config, shared=True)
+    return _neofs_clients[key]
+
+
+async def close_neofs_client():
+    """Close the pooled NeoFS connections of the running event loop (server shutdown)"""
+    client = _shared_http.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,275 @@
+"""
+Content-Addressed NeoFS Download Cache
+
+NeoFS objects are immutable: an object ID is derived from the object's
+content, so a payload downloaded once can be served locally forever. Each
+payload is stored in a file named by sha256("cid/oid") under
+NEOFS_CACHE_DIR. Writes go to a temp file that is renamed into place, so
+readers (including other agent processes sharing the directory) never see
+a partial object.
+
+Reads refresh the file's mtime. Once the directory grows past
+NEOFS_CACHE_MAX_MB, the least recently read files are evicted down to 90%
+of the cap. Large objects are streamed from path() instead of being read
+into memory. NEOFS_CACHE_MAX_MB=0 disables the cache.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Temp files older than this were left by a writer that died mid-write
+STALE_TEMP_SECONDS = 3600
+_TEMP_PREFIX = ".tmp-"
+
+
+class NeoFSCache:
+    """
+    Size-capped, LRU-evicted on-disk cache of NeoFS object payloads.
+
+    Safe to share between threads and between processes using the same
+    directory; cache errors are logged and treated as misses, never raised.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int):
+        """
+        Open (or create) a cache directory.
+
+        Args:
+            root: Cache directory
+            max_bytes: Size cap before eviction starts
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Approximate: other processes add files too; eviction rescans the directory
+        self._total = sum(size for _, size, _ in self._entries())
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(container_id: str, object_id: str) -> str:
+        """Cache key (file name) of an object"""
+        return hashlib.sha256(f"{container_id}/{object_id}".encode("utf-8")).hexdigest()
+
+    def _path(self, container_id: str, object_id: str) -> Path:
+        key = self.key(container_id, object_id)
+        return self.root / key[:2] / key
+
+    def get(self, container_id: str, object_id: str) -> Optional[bytes]:
+        """
+        Cached payload of an object.
+
+        Returns:
+            The payload, or None on a miss
+        """
+        path = self._path(container_id, object_id)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU recency
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except OSError as e:
+            logger.debug(f"NeoFS cache read failed for {container_id}/{object_id}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def path(self, container_id: str, object_id: str) -> Optional[Path]:
+        """
+        File holding a cached object, for streaming it from disk.
+
+        Returns:
+            The path, or None on a miss
+        """
+        path = self._path(container_id, object_id)
+        try:
+            os.utime(path)  # LRU recency
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except OSError as e:
+            logger.debug(f"NeoFS cache read failed for {container_id}/{object_id}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, container_id: str, object_id: str, data: bytes):
+        """Store an object's payload (atomically; a no-op if already cached)"""
+        if self._path(container_id, object_id).exists():
+            return
+        writer = self.writer(container_id, object_id)
+        writer.write(data)
+        writer.commit()
+
+    def writer(self, container_id: str, object_id: str) -> "CacheWriter":
+        """Incremental writer for an object downloaded in chunks"""
+        return CacheWriter(self, container_id, object_id)
+
+    def _added(self, size: int):
+        with self._lock:
+            self._total += size
+            over = self._total > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently read objects until the cache is under 90% of its cap"""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            for path, size, _ in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.debug(f"NeoFS cache eviction failed for {path}: {e}")
+                    continue
+                total -= size
+                self.evictions += 1
+            self._total = total
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        """(path, size, mtime) of every cached object; removes stale temp files"""
+        entries = []
+        now = time.time()
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.startswith(_TEMP_PREFIX):
+                    if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                        try:
+                            os.unlink(entry.path)
+                        except OSError:
+                            pass
+                    continue
+                entries.append((Path(entry.path), stat.st_size, stat.st_mtime))
+        return entries
+
+    def metrics(self) -> dict:
+        """Hit rate and size for get_status()"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes": self._total,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class CacheWriter:
+    """
+    Writes one object into the cache chunk by chunk.
+
+    Chunks go to a temp file; commit() makes the object visible atomically
+    and abort() (or a failed write) discards it. Errors are logged, not
+    raised, so a download never fails because of the cache.
+    """
+
+    def __init__(self, cache: NeoFSCache, container_id: str, object_id: str):
+        self.cache = cache
+        self.label = f"{container_id}/{object_id}"
+        self.path = cache._path(container_id, object_id)
+        self.size = 0
+        self._file = None
+        self._tmp_path: Optional[str] = None
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            fd, self._tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=_TEMP_PREFIX)
+            self._file = os.fdopen(fd, "wb")
+        except OSError as e:
+            self._fail(e)
+
+    def write(self, chunk: bytes):
+        """Append a chunk"""
+        if self._file is None:
+            return
+        try:
+            self._file.write(chunk)
+            self.size += len(chunk)
+        except OSError as e:
+            self._fail(e)
+
+    def commit(self):
+        """Flush, fsync and rename the object into place"""
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_path, self.path)
+            self._tmp_path = None
+        except OSError as e:
+            self._fail(e)
+            return
+        self.cache._added(self.size)
+
+    def abort(self):
+        """Discard the partial object"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp_path:
+            try:
+                os.unlink(self._tmp_path)
+            except OSError:
+                pass
+            self._tmp_path = None
+
+    def _fail(self, error: OSError):
+        logger.debug(f"NeoFS cache write failed for {self.label}: {error}")
+        self.abort()
+
+
+_cache: Optional[NeoFSCache] = None
+_cache_unavailable = False
+_cache_lock = threading.Lock()
+
+
+def get_neofs_cache() -> Optional[NeoFSCache]:
+    """The process-wide NeoFS cache, or None when NEOFS_CACHE_MAX_MB is 0"""
+    global _cache, _cache_unavailable
+    max_mb = float(os.getenv("NEOFS_CACHE_MAX_MB", "256"))
+    if max_mb <= 0 or _cache_unavailable:
+        return None
+    with _cache_lock:
+        if _cache is None and not _cache_unavailable:
+            root = Path(os.getenv("NEOFS_CACHE_DIR", "~/.archive-agents/neofs-cache")).expanduser()
+            try:
+                _cache = NeoFSCache(root, max_bytes=int(max_mb * 1024 * 1024))
+            except OSError as e:
+                logger.warning(f"NeoFS cache disabled, cannot use {root}: {e}")
+                _cache_unavailable = True
+        return _cache
+
+
+def neofs_cache_metrics() -> dict:
+    """Cache metrics for get_status(); empty when the cache is disabled"""
+    cache = get_neofs_cache()
+    return cache.metrics() if cache else {}
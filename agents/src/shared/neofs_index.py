@@ -0,0 +1,227 @@
+"""
+NeoFS Upload Deduplication Index
+
+Uploads are keyed by the sha256 of their payload plus a hash of their
+attributes (attributes_digest()). Before uploading, NeoFSClient looks both
+up here (and, with NEOFS_DEDUP_SEARCH=true, in the container's ContentHash
+and AttributesHash attributes); an upload of the same payload with the
+same attributes gets the existing object ID back instead of a second
+upload. Readers resolving a content-derived ID only need the payload, so
+they match on the content hash alone. JSON payloads are
+serialized canonically (sorted keys, compact separators, UTF-8), so the
+same document always hashes the same and takes fewer bytes than the old
+indent=2 output.
+
+The index is a SQLite file (NEOFS_UPLOAD_INDEX, default next to the event
+checkpoints) shared by every agent process on the host. NEOFS_DEDUP=false
+turns deduplication off.
+"""
+
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Object attributes carrying the payload and attribute hashes, for lookups across hosts
+CONTENT_HASH_ATTRIBUTE = "ContentHash"
+ATTRIBUTES_HASH_ATTRIBUTE = "AttributesHash"
+
+# Attributes describing the upload rather than the object; they don't prevent reuse
+_VOLATILE_ATTRIBUTES = frozenset({"Timestamp", CONTENT_HASH_ATTRIBUTE, ATTRIBUTES_HASH_ATTRIBUTE})
+
+# Prefix of content-derived object IDs (neofs://<cid>/sha256-<hex>), handed
+# out before an upload finishes; real NeoFS object IDs are base58
+CONTENT_ID_PREFIX = "sha256-"
+
+_canonical_encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def iter_canonical_json(data: Any) -> Iterator[str]:
+    """Canonical JSON encoding of data, piece by piece"""
+    return _canonical_encoder.iterencode(data)
+
+
+def canonical_json(data: Any) -> bytes:
+    """Canonical JSON encoding: sorted keys, no whitespace, UTF-8"""
+    return _canonical_encoder.encode(data).encode("utf-8")
+
+
+def json_digest(data: Any) -> str:
+    """sha256 hex of canonical_json(data), without building the whole string"""
+    digest = hashlib.sha256()
+    for piece in iter_canonical_json(data):
+        digest.update(piece.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def attributes_digest(attributes: dict[str, str]) -> str:
+    """sha256 hex of an upload's attributes in canonical form, ignoring volatile ones"""
+    identity = {key: value for key, value in attributes.items() if key not in _VOLATILE_ATTRIBUTES}
+    return hashlib.sha256(canonical_json(identity)).hexdigest()
+
+
+def content_object_id(content_hash: str) -> str:
+    """Content-derived object ID for a payload hash"""
+    return CONTENT_ID_PREFIX + content_hash
+
+
+def parse_content_object_id(object_id: str) -> Optional[str]:
+    """Payload hash of a content-derived object ID, or None for a real NeoFS ID"""
+    if object_id.startswith(CONTENT_ID_PREFIX):
+        return object_id[len(CONTENT_ID_PREFIX):]
+    return None
+
+
+def content_digest(data: bytes | bytearray | memoryview) -> str:
+    """sha256 hex of a payload"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: str | os.PathLike, chunk_size: int = 1 << 20) -> str:
+    """sha256 hex of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadIndex:
+    """
+    Persistent (container, content hash, attributes hash) -> object ID map.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Open (or create) an upload index.
+
+        Args:
+            path: SQLite file path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Replaces the content-hash-only "uploads" table of earlier versions, whose
+        # rows don't say which attributes an object carries; those are not reused
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS objects (
+                container_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                attributes_hash TEXT NOT NULL,
+                object_id TEXT NOT NULL,
+                size INTEGER,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (container_id, content_hash, attributes_hash)
+            )
+            """
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, container_id: str, content_hash: str, attributes_hash: Optional[str] = None) -> Optional[str]:
+        """
+        Object ID of an earlier upload of the same payload, if any.
+
+        Args:
+            container_id: Container
+            content_hash: sha256 hex of the payload
+            attributes_hash: attributes_digest() the object must have; None
+                accepts any (readers that only need the payload)
+        """
+        query = "SELECT object_id FROM objects WHERE container_id = ? AND content_hash = ?"
+        args: tuple = (container_id, content_hash)
+        if attributes_hash is not None:
+            query += " AND attributes_hash = ?"
+            args += (attributes_hash,)
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY created_at DESC LIMIT 1", args).fetchone()
+        if row:
+            self.hits += 1
+            return row[0]
+        self.misses += 1
+        return None
+
+    def record(
+        self,
+        container_id: str,
+        content_hash: str,
+        attributes_hash: str,
+        object_id: str,
+        size: Optional[int] = None,
+    ):
+        """Remember an uploaded payload and the attributes it was stored with"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO objects "
+                "(container_id, content_hash, attributes_hash, object_id, size, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (container_id, content_hash, attributes_hash, object_id, size, time.time()),
+            )
+            self._conn.commit()
+
+    def forget(self, container_id: str, content_hash: str):
+        """Drop an entry (e.g. the object expired or was deleted)"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM objects WHERE container_id = ? AND content_hash = ?",
+                (container_id, content_hash),
+            )
+            self._conn.commit()
+
+    def metrics(self) -> dict:
+        """Dedup hit rate for get_status()"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+_index: Optional[UploadIndex] = None
+_index_unavailable = False
+_index_lock = threading.Lock()
+
+
+def get_upload_index() -> Optional[UploadIndex]:
+    """The process-wide upload index, or None when NEOFS_DEDUP is off"""
+    global _index, _index_unavailable
+    if os.getenv("NEOFS_DEDUP", "true").lower() not in ("1", "true", "yes") or _index_unavailable:
+        return None
+    with _index_lock:
+        if _index is None and not _index_unavailable:
+            path = os.getenv("NEOFS_UPLOAD_INDEX")
+            if path:
+                path = Path(path).expanduser()
+            else:
+                base_dir = Path(os.getenv("EVENT_CHECKPOINT_DIR", "~/.archive-agents")).expanduser()
+                path = base_dir / "neofs-uploads.sqlite"
+            try:
+                _index = UploadIndex(path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"NeoFS upload dedup disabled, cannot open {path}: {e}")
+                _index_unavailable = True
+        return _index
+
+
+def upload_index_metrics() -> dict:
+    """Dedup metrics for get_status(); empty when deduplication is off"""
+    index = get_upload_index()
+    return index.metrics() if index else {}
@@ -0,0 +1,527 @@
+"""
+Write-Behind NeoFS Upload Queue
+
+Job, bid and call-result documents are referenced by URI long before anyone
+reads them, so the upload does not need to sit on the critical path.
+enqueue() persists the payload (file + SQLite row under NEOFS_QUEUE_DIR),
+seeds the local download cache and returns at once with a content-derived
+URI, neofs://<cid>/sha256-<hex>. If the payload was uploaded before, the
+real neofs://<cid>/<oid> is returned instead.
+
+A background task per process uploads due rows NEOFS_QUEUE_BATCH at a time
+over the pooled gateway client. The gateway has no multi-object upload, so
+a batch is a set of concurrent uploads; uploads of the same payload with
+the same attributes (neofs_index.attributes_digest) collapse into one row. Failures retry with exponential backoff (NEOFS_QUEUE_BACKOFF up to
+NEOFS_QUEUE_MAX_BACKOFF seconds) and rows survive restarts. Several
+processes can share the directory: rows are claimed with a lease, so each
+is uploaded once.
+
+Content-derived IDs are for local, off-chain use: readers on this host
+resolve them through the local cache, the queue's own payload files and
+the upload index, and others only through a ContentHash search (see
+NeoFSClient.download_object). Anything written on-chain (job and bid
+metadata URIs) awaits PendingUpload.result() and uses the real object ID.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .neofs import NeoFSClient, ObjectAttribute, UploadResult, get_neofs_client
+from .neofs_cache import get_neofs_cache
+from .neofs_index import (
+    attributes_digest,
+    content_digest,
+    content_object_id,
+    get_upload_index,
+)
+
+logger = logging.getLogger(__name__)
+
+# A claimed row is retried by anyone once its lease runs out (e.g. the uploader died)
+CLAIM_LEASE_SECONDS = 300
+# Longest the worker sleeps before looking for due rows again
+IDLE_POLL_SECONDS = 5.0
+
+
+@dataclass
+class PendingUpload:
+    """
+    A queued upload.
+
+    object_id / uri are usable immediately and never change: the real NeoFS
+    ID when the payload was already stored, a content-derived ID otherwise.
+    A content-derived URI is for local, off-chain references only; await
+    result() for the real ID before putting a URI on-chain.
+    """
+    container_id: str
+    content_hash: str
+    attributes_hash: str = ""
+    known_object_id: Optional[str] = None
+    _future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    @property
+    def object_id(self) -> str:
+        return self.known_object_id or content_object_id(self.content_hash)
+
+    @property
+    def uri(self) -> str:
+        return f"neofs://{self.container_id}/{self.object_id}"
+
+    def done(self) -> bool:
+        """Whether the real object ID is known"""
+        return self.known_object_id is not None or (self._future is not None and self._future.done())
+
+    async def result(self, timeout: Optional[float] = None) -> UploadResult:
+        """
+        Wait for the upload.
+
+        Raises:
+            asyncio.TimeoutError: Not uploaded within timeout
+            Exception: The last upload error, once NEOFS_QUEUE_MAX_ATTEMPTS
+                attempts failed (the queue keeps retrying regardless)
+        """
+        if self.known_object_id is not None:
+            return UploadResult(object_id=self.known_object_id, container_id=self.container_id, deduplicated=True)
+        return await asyncio.wait_for(asyncio.shield(self._future), timeout)
+
+
+class UploadQueue:
+    """
+    Durable queue of NeoFS uploads with a background uploader.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        batch_size: int = 8,
+        max_attempts: int = 5,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0,
+    ):
+        """
+        Open (or create) a queue directory.
+
+        Args:
+            directory: Holds queue.sqlite and the payloads/ spool
+            batch_size: Uploads run concurrently per round
+            max_attempts: Failed attempts before waiting callers get the error
+            base_backoff: First retry delay in seconds (doubles per failure)
+            max_backoff: Retry delay cap in seconds
+        """
+        self.directory = Path(directory)
+        self.payload_dir = self.directory / "payloads"
+        self.payload_dir.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.directory / "queue.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS queued (
+                container_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                attributes_hash TEXT NOT NULL,
+                gateway_url TEXT NOT NULL,
+                attributes TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (container_id, content_hash, attributes_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+        # Worker state belongs to one event loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._futures: dict[tuple[str, str, str], asyncio.Future] = {}
+        self._active = 0  # uploads in flight
+
+        self.enqueued = 0
+        self.uploaded = 0
+        self.failures = 0
+
+    # ==========================================================================
+    # Producer side
+    # ==========================================================================
+
+    async def enqueue(
+        self,
+        client: NeoFSClient,
+        data: bytes | str,
+        attributes: list[ObjectAttribute] | None = None,
+        container_id: str | None = None,
+    ) -> PendingUpload:
+        """
+        Queue an upload and return without waiting for it.
+
+        Args:
+            client: Client whose gateway (and default container) to upload to
+            data: Payload
+            attributes: Object attributes
+            container_id: Override the client's container ID
+
+        Returns:
+            PendingUpload with a URI usable right away
+        """
+        cid = container_id or client.container_id
+        if not cid:
+            raise ValueError("Container ID is required")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        content_hash = content_digest(data)
+        attrs = {attr.key: attr.value for attr in attributes or []}
+        attributes_hash = attributes_digest(attrs)
+
+        index = get_upload_index()
+        object_id = index.lookup(cid, content_hash, attributes_hash) if index else None
+        if object_id:
+            return PendingUpload(cid, content_hash, attributes_hash, known_object_id=object_id)
+
+        await asyncio.to_thread(self._persist, client.gateway_url, cid, content_hash, attributes_hash, data, attrs)
+        self.enqueued += 1
+
+        self.start()
+        key = (cid, content_hash, attributes_hash)
+        future = self._futures.get(key)
+        if future is None or future.done():
+            future = self._futures[key] = self._loop.create_future()
+        self._wakeup.set()
+        return PendingUpload(cid, content_hash, attributes_hash, _future=future)
+
+    def payload_path(self, container_id: str, content_hash: str) -> Optional[Path]:
+        """Spooled payload of a queued (not yet uploaded) object; shared by rows of the same payload"""
+        path = self._payload_path(container_id, content_hash)
+        return path if path.exists() else None
+
+    def _payload_path(self, container_id: str, content_hash: str) -> Path:
+        return self.payload_dir / f"{container_id}-{content_hash}"
+
+    def _persist(
+        self,
+        gateway_url: str,
+        cid: str,
+        content_hash: str,
+        attributes_hash: str,
+        data: bytes,
+        attrs: dict[str, str],
+    ):
+        """Write the payload file, then its row (a row always has its file)"""
+        path = self._payload_path(cid, content_hash)
+        if not path.exists():
+            fd, tmp_path = tempfile.mkstemp(dir=self.payload_dir, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO queued (container_id, content_hash, attributes_hash, gateway_url, "
+                "attributes, size, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (cid, content_hash, attributes_hash, gateway_url, json.dumps(attrs), len(data), now, now),
+            )
+        # Same-host readers of the content-derived ID never touch the gateway
+        cache = get_neofs_cache()
+        if cache:
+            cache.put(cid, content_object_id(content_hash), data)
+
+    # ==========================================================================
+    # Uploader
+    # ==========================================================================
+
+    def start(self):
+        """Start the uploader on the running event loop (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures of a previous loop can never be awaited again
+            self._loop = loop
+            self._futures = {}
+            self._worker = None
+            self._wakeup = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run(), name="neofs-upload-queue")
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until nothing is due for upload or in flight.
+
+        Returns:
+            True if the queue drained (rows waiting out a retry backoff don't count)
+        """
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._active or await asyncio.to_thread(self.depth):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self._wakeup.set()
+            await asyncio.sleep(0.05)
+        return True
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """Give queued uploads a moment to finish, then stop the uploader (rows stay durable)"""
+        if self._worker is None or self._loop is not asyncio.get_running_loop():
+            return
+        try:
+            await self.flush(drain_timeout)
+        finally:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _run(self):
+        while True:
+            try:
+                rows = await asyncio.to_thread(self._claim_due, self.batch_size)
+            except Exception as e:
+                logger.warning(f"NeoFS upload queue read failed: {e}")
+                rows = []
+            if rows:
+                self._active += len(rows)
+                try:
+                    outcomes = await asyncio.gather(*(self._upload(*row) for row in rows), return_exceptions=True)
+                finally:
+                    self._active -= len(rows)
+                for outcome in outcomes:
+                    if isinstance(outcome, Exception):
+                        logger.warning(f"NeoFS upload queue bookkeeping failed: {outcome}")
+                continue
+
+            try:
+                await self._settle_from_index()
+            except Exception as e:
+                logger.warning(f"NeoFS upload index read failed: {e}")
+            self._wakeup.clear()
+            try:
+                delay = await asyncio.to_thread(self._next_due_in)
+            except Exception:
+                delay = None
+            timeout = IDLE_POLL_SECONDS if delay is None else min(max(delay, 0.0), IDLE_POLL_SECONDS)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _claim_due(self, limit: int) -> list[tuple]:
+        """Lease up to limit due rows for this process"""
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT container_id, content_hash, attributes_hash, gateway_url, attributes, attempts FROM queued "
+                "WHERE next_attempt_at <= ? ORDER BY created_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            claimed = []
+            for row in rows:
+                cursor = self._conn.execute(
+                    "UPDATE queued SET next_attempt_at = ? WHERE container_id = ? AND content_hash = ? "
+                    "AND attributes_hash = ? AND next_attempt_at <= ?",
+                    (now + CLAIM_LEASE_SECONDS, row[0], row[1], row[2], now),
+                )
+                if cursor.rowcount:
+                    claimed.append(row)
+        return claimed
+
+    def _next_due_in(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(next_attempt_at) FROM queued").fetchone()
+        return None if row[0] is None else row[0] - time.time()
+
+    async def _upload(
+        self,
+        cid: str,
+        content_hash: str,
+        attributes_hash: str,
+        gateway_url: str,
+        attributes: str,
+        attempts: int,
+    ):
+        key = (cid, content_hash, attributes_hash)
+        path = self._payload_path(cid, content_hash)
+        try:
+            client = get_neofs_client(gateway_url, cid)
+            attrs = [ObjectAttribute(key=k, value=v) for k, v in json.loads(attributes).items()]
+            result = await client.upload_object(path, attrs, cid, content_hash=content_hash)
+            if not result.object_id:
+                raise ValueError("Gateway returned no object ID")
+        except asyncio.CancelledError:
+            # Shutting down: hand the row back instead of leaving it leased
+            self._reschedule(key, attempts, time.time(), "cancelled")
+            raise
+        except Exception as e:
+            attempts += 1
+            self.failures += 1
+            delay = min(self.base_backoff * 2 ** (attempts - 1), self.max_backoff)
+            logger.warning(f"NeoFS upload of {cid}/{content_hash[:12]} failed (attempt {attempts}), retrying in {delay:.0f}s: {e}")
+            await asyncio.to_thread(self._reschedule, key, attempts, time.time() + delay, str(e))
+            future = self._futures.get(key)
+            if future is not None and not future.done() and attempts >= self.max_attempts:
+                future.set_exception(e)
+                future.exception()  # retrieved: awaiting callers re-raise it
+            return
+
+        await asyncio.to_thread(self._complete, key)
+        self.uploaded += 1
+        future = self._futures.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def _reschedule(self, key: tuple[str, str, str], attempts: int, next_attempt_at: float, error: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE queued SET attempts = ?, next_attempt_at = ?, last_error = ? "
+                "WHERE container_id = ? AND content_hash = ? AND attributes_hash = ?",
+                (attempts, next_attempt_at, error[:500], *key),
+            )
+
+    def _complete(self, key: tuple[str, str, str]):
+        cid, content_hash, _ = key
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM queued WHERE container_id = ? AND content_hash = ? AND attributes_hash = ?",
+                key,
+            )
+            # Rows with other attributes may still need the spooled payload
+            remaining = self._conn.execute(
+                "SELECT 1 FROM queued WHERE container_id = ? AND content_hash = ? LIMIT 1",
+                (cid, content_hash),
+            ).fetchone()
+        if remaining:
+            return
+        try:
+            self._payload_path(cid, content_hash).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _queued(self, key: tuple[str, str, str]) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM queued WHERE container_id = ? AND content_hash = ? AND attributes_hash = ?",
+                key,
+            ).fetchone() is not None
+
+    def _uploaded_elsewhere(self, keys: list[tuple[str, str, str]]) -> dict[tuple[str, str, str], str]:
+        """Object IDs the upload index has for keys that are no longer queued"""
+        index = get_upload_index()
+        if not index:
+            return {}
+        found = {}
+        for key in keys:
+            if self._queued(key):
+                continue
+            object_id = index.lookup(*key)
+            if object_id:
+                found[key] = object_id
+        return found
+
+    async def _settle_from_index(self):
+        """Resolve waiters whose payload another process uploaded"""
+        pending = [key for key, future in self._futures.items() if not future.done()]
+        if not pending:
+            return
+        for key, object_id in (await asyncio.to_thread(self._uploaded_elsewhere, pending)).items():
+            future = self._futures.pop(key, None)
+            if future and not future.done():
+                future.set_result(UploadResult(object_id=object_id, container_id=key[0]))
+
+    # ==========================================================================
+    # Introspection
+    # ==========================================================================
+
+    def depth(self, due_only: bool = True) -> int:
+        """Queued uploads (by default only those due now, not in backoff)"""
+        query = "SELECT COUNT(*) FROM queued"
+        args: tuple = ()
+        if due_only:
+            query += " WHERE next_attempt_at <= ? OR attempts = 0"
+            args = (time.time(),)
+        with self._lock:
+            return self._conn.execute(query, args).fetchone()[0]
+
+    def metrics(self) -> dict:
+        """Queue depth and throughput for get_status()"""
+        with self._lock:
+            queued, oldest = self._conn.execute("SELECT COUNT(*), MIN(created_at) FROM queued").fetchone()
+        return {
+            "queued": queued,
+            "oldest_age_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+            "enqueued": self.enqueued,
+            "uploaded": self.uploaded,
+            "failures": self.failures,
+        }
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+_queue: Optional[UploadQueue] = None
+_queue_unavailable = False
+_queue_lock = threading.Lock()
+
+
+def get_upload_queue() -> Optional[UploadQueue]:
+    """The process-wide upload queue, or None if its directory is unusable (uploads then run inline)"""
+    global _queue, _queue_unavailable
+    if _queue_unavailable:
+        return None
+    with _queue_lock:
+        if _queue is None and not _queue_unavailable:
+            directory = Path(os.getenv("NEOFS_QUEUE_DIR", "~/.archive-agents/neofs-queue")).expanduser()
+            try:
+                _queue = UploadQueue(
+                    directory,
+                    batch_size=int(os.getenv("NEOFS_QUEUE_BATCH", "8")),
+                    max_attempts=int(os.getenv("NEOFS_QUEUE_MAX_ATTEMPTS", "5")),
+                    base_backoff=float(os.getenv("NEOFS_QUEUE_BACKOFF", "2")),
+                    max_backoff=float(os.getenv("NEOFS_QUEUE_MAX_BACKOFF", "300")),
+                )
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"NeoFS upload queue disabled, cannot use {directory}: {e}")
+                _queue_unavailable = True
+        return _queue
+
+
+def start_upload_queue():
+    """Upload whatever a previous run left queued (server startup)"""
+    queue = get_upload_queue()
+    if queue:
+        queue.start()
+
+
+async def stop_upload_queue(drain_timeout: float = 5.0):
+    """Drain briefly and stop the uploader (server shutdown); the rest uploads on next start"""
+    if _queue is not None:
+        await _queue.stop(drain_timeout)
+
+
+def upload_queue_metrics() -> dict:
+    """Queue metrics for get_status(); empty until the queue is used"""
+    return _queue.metrics() if _queue is not None else {}
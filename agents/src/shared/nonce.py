@@ -0,0 +1,133 @@
+"""
+Local Nonce Management for Archive Agents
+
+Hands out transaction nonces from memory instead of asking the node for
+every transaction, so one account can have many transactions in flight.
+The node is only consulted on first use and whenever our view may be wrong:
+a send was rejected for its nonce, a send failed in an unknown state, or a
+transaction never got a receipt (dropped from the mempool).
+"""
+
+import logging
+import threading
+from typing import Callable, Optional, TypeVar
+
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Node error fragments meaning the nonce we used was stale or already taken
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "replacement transaction underpriced",
+    "already imported",
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """Whether a send failure was caused by a conflicting nonce"""
+    message = str(error).lower()
+    return any(fragment in message for fragment in NONCE_ERRORS)
+
+
+def is_already_known(error: Exception) -> bool:
+    """Whether the node already has this exact signed transaction"""
+    message = str(error).lower()
+    return "already known" in message or "known transaction" in message
+
+
+class NonceManager:
+    """
+    Per-account nonce allocator with resync on conflicts.
+
+    Sends are serialized per account (sending is one quick RPC); waiting for
+    receipts is not, so transactions are pipelined back-to-back.
+
+    Usage:
+        nonces = get_nonce_manager(w3, account.address)
+        tx_hash = nonces.submit(lambda nonce: sign_and_send(nonce))
+    """
+
+    def __init__(self, w3: Web3, address: str, max_retries: int = 3):
+        """
+        Initialize the manager.
+
+        Args:
+            w3: Web3 instance used to read the pending transaction count
+            address: Account whose nonces are managed
+            max_retries: Resync-and-resend attempts after a nonce conflict
+        """
+        self.w3 = w3
+        self.address = Web3.to_checksum_address(address)
+        self.max_retries = max_retries
+        self._lock = threading.RLock()
+        self._next: Optional[int] = None
+        self._sent = 0
+        self._resyncs = 0
+
+    def _sync(self) -> int:
+        """Reload the next nonce from the node's pending count"""
+        self._next = self.w3.eth.get_transaction_count(self.address, "pending")
+        self._resyncs += 1
+        return self._next
+
+    def resync(self):
+        """Re-read the nonce from the node before the next send"""
+        with self._lock:
+            self._next = None
+
+    def submit(self, send: Callable[[int], T]) -> T:
+        """
+        Run send(nonce) with the next nonce for this account.
+
+        On a nonce conflict the nonce is resynced and send is retried. Any
+        other failure leaves the nonce unconsumed but marks it for a resync,
+        since the transaction may or may not have reached the node.
+
+        Args:
+            send: Builds, signs and broadcasts a transaction with the nonce
+
+        Returns:
+            Whatever send returned (usually the transaction hash)
+        """
+        with self._lock:
+            for attempt in range(self.max_retries + 1):
+                nonce = self._next if self._next is not None else self._sync()
+                try:
+                    result = send(nonce)
+                except Exception as e:
+                    self._next = None
+                    if is_nonce_error(e) and attempt < self.max_retries:
+                        logger.warning(f"Nonce {nonce} rejected for {self.address[:10]}... ({e}); resyncing")
+                        continue
+                    raise
+                self._next = nonce + 1
+                self._sent += 1
+                return result
+
+    def metrics(self) -> dict:
+        """Next local nonce and send/resync counters"""
+        return {
+            "address": self.address,
+            "next_nonce": self._next,
+            "sent": self._sent,
+            "resyncs": self._resyncs,
+        }
+
+
+# Process-wide managers, one per account
+_nonce_managers: dict[str, NonceManager] = {}
+_nonce_managers_lock = threading.Lock()
+
+
+def get_nonce_manager(w3: Web3, address: str) -> NonceManager:
+    """Shared NonceManager for an account (all senders in the process must use it)"""
+    key = address.lower()
+    with _nonce_managers_lock:
+        if key not in _nonce_managers:
+            _nonce_managers[key] = NonceManager(w3, address)
+        return _nonce_managers[key]
@@ -0,0 +1,197 @@
+"""
+Adaptive Poll Scheduling for Archive Agents
+
+Decides how long the EventListener sleeps between polls instead of a fixed
+interval. The scheduler learns the chain's block time from head timestamps
+and aims each poll just after the next block is expected. Block timestamps
+come from the chain's clock, so the expected time is converted to local time
+with a learned clock offset before it is compared with time.time(). While
+the agent is waiting on one of its own jobs (a pending bid, an accept, a
+delivery) it never sleeps longer than hot_interval, and it backs off when
+the chain is idle or the RPC rate-limits us.
+"""
+
+import time
+import logging
+from collections import deque
+from typing import Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """
+    Block-time aware poll interval with idle and rate-limit backoff.
+
+    Usage:
+        scheduler = PollScheduler(base_interval=3)
+        scheduler.observe_head(number, timestamp)
+        scheduler.record_poll(event_count)
+        await asyncio.sleep(scheduler.next_delay())
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 3.0,
+        min_interval: float = 0.5,
+        max_interval: float = 30.0,
+        hot_interval: float = 1.0,
+        margin: float = 0.3,
+        idle_polls: int = 10,
+        max_backoff: int = 16,
+        block_time_alpha: float = 0.2,
+        lag_window: int = 256,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            base_interval: Interval used until a block time has been learned
+            min_interval: Shortest sleep between polls
+            max_interval: Longest sleep between polls
+            hot_interval: Longest sleep while a job is watched
+            margin: Seconds to wait past the expected block before polling
+            idle_polls: Event-free polls before each idle backoff step
+            max_backoff: Largest multiplier for idle or rate-limit backoff
+            block_time_alpha: EWMA weight of each new block time sample
+            lag_window: Recent event lag samples kept for percentiles
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hot_interval = hot_interval
+        self.margin = margin
+        self.idle_polls = idle_polls
+        self.max_backoff = max_backoff
+        self.block_time_alpha = block_time_alpha
+
+        self.block_time: Optional[float] = None
+        self.interval = base_interval
+        self._head: Optional[int] = None
+        self._head_time: Optional[float] = None  # chain timestamp of the head
+        self._head_seen: Optional[float] = None  # wall clock when the head was first seen
+        # Local clock minus chain clock, from the freshest heads (skew plus minimum delay)
+        self._offsets: deque[float] = deque(maxlen=32)
+        self._idle = 0
+        self._stale = 0
+        self._rate_limit_backoff = 1
+        self._watching: dict[Hashable, float] = {}
+        self._lags: deque[float] = deque(maxlen=lag_window)
+
+    # ==========================================================================
+    # OBSERVATIONS
+    # ==========================================================================
+
+    def observe_head(self, number: int, timestamp: Optional[int] = None):
+        """Record the latest head and update the block time estimate"""
+        now = time.time()
+        if self._head is not None and number > self._head:
+            if timestamp and self._head_time:
+                sample = (timestamp - self._head_time) / (number - self._head)
+            else:
+                sample = (now - self._head_seen) / (number - self._head)
+            if sample > 0:
+                if self.block_time is None:
+                    self.block_time = sample
+                else:
+                    a = self.block_time_alpha
+                    self.block_time = a * sample + (1 - a) * self.block_time
+            self._stale = 0
+        elif self._head is not None:
+            self._stale += 1
+            return
+
+        self._head = number
+        self._head_time = float(timestamp) if timestamp else now
+        self._head_seen = now
+        self._offsets.append(now - self._head_time)
+
+    def _produced_at(self) -> Optional[float]:
+        """Local time the current head was most likely produced"""
+        if self._head_time is None:
+            return None
+        # The smallest recent offset is the head we saw soonest after it was made
+        return min(self._head_seen, self._head_time + min(self._offsets))
+
+    def record_poll(self, event_count: int):
+        """Record a successful poll; relaxes rate-limit backoff"""
+        self._idle = 0 if event_count else self._idle + 1
+        self._rate_limit_backoff = max(1, self._rate_limit_backoff // 2)
+
+    def record_event(self, block_number: int):
+        """Record how long after its block an event was picked up"""
+        produced_head = self._produced_at()
+        if produced_head is None:
+            return
+        block_time = self.block_time or self.base_interval
+        produced = produced_head - (self._head - block_number) * block_time
+        self._lags.append(max(0.0, time.time() - produced))
+
+    def on_rate_limited(self):
+        """Back off after the RPC rejected a poll for rate limiting"""
+        self._rate_limit_backoff = min(self.max_backoff, self._rate_limit_backoff * 2)
+        logger.warning(f"RPC rate limited; poll backoff x{self._rate_limit_backoff}")
+
+    def watch(self, key: Hashable, ttl: float = 600):
+        """Poll tightly while `key` (e.g. a job with a pending bid) is active"""
+        self._watching[key] = time.monotonic() + ttl
+
+    def unwatch(self, key: Hashable):
+        """Stop tightening for `key`"""
+        self._watching.pop(key, None)
+
+    @property
+    def hot(self) -> bool:
+        """Whether anything is being watched"""
+        now = time.monotonic()
+        for key in [k for k, expires in self._watching.items() if expires <= now]:
+            del self._watching[key]
+        return bool(self._watching)
+
+    # ==========================================================================
+    # SCHEDULING
+    # ==========================================================================
+
+    def next_delay(self) -> float:
+        """Seconds to sleep before the next poll"""
+        block_time = self.block_time or self.base_interval
+        delay = block_time
+        produced = self._produced_at()
+        if produced is not None:
+            # Aim just past the next expected block, in local time
+            delay = produced + block_time + self.margin - time.time()
+            if delay <= 0:
+                # Block is overdue: re-check soon, slower the longer the head stays stale
+                delay = block_time / 4 * 2 ** min(self._stale, 4)
+
+        if self.hot:
+            delay = min(delay, self.hot_interval)
+        elif self._idle >= self.idle_polls:
+            steps = min(self._idle // self.idle_polls, self.max_backoff.bit_length() - 1)
+            delay = max(delay, self.base_interval * 2 ** steps)
+
+        delay *= self._rate_limit_backoff
+        self.interval = min(self.max_interval, max(self.min_interval, delay))
+        return self.interval
+
+    def metrics(self) -> dict:
+        """Current interval, learned block time, backoff state and event lag"""
+        lags = sorted(self._lags)
+        hot = self.hot
+
+        def pct(p: float) -> float:
+            if not lags:
+                return 0.0
+            return round(lags[min(len(lags) - 1, int(p * (len(lags) - 1)))], 2)
+
+        return {
+            "interval_s": round(self.interval, 2),
+            "block_time_s": round(self.block_time, 2) if self.block_time else None,
+            "head": self._head,
+            "watching": len(self._watching) if hot else 0,
+            "idle_polls": self._idle,
+            "rate_limit_backoff": self._rate_limit_backoff,
+            "event_lag_s_p50": pct(0.50),
+            "event_lag_s_p95": pct(0.95),
+            "event_lag_s_last": round(self._lags[-1], 2) if self._lags else None,
+        }
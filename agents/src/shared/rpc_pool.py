@@ -0,0 +1,418 @@
+"""
+RPC Endpoint Pool for Archive Agents
+
+NEOX_RPC_URL may list several endpoints (comma-separated). One RpcPool per
+endpoint list tracks each node's latency and errors, and the pooled
+providers built on it route every request:
+- reads go to the fastest healthy node, sticking to it until another is
+  clearly faster; inside pool.session() every read stays on one node (a
+  poll's head and its eth_getLogs must agree), moving only if it fails
+- every Nth plain read re-measures the least recently sampled node, but
+  head and log queries are never used as probes
+- writes and pending-nonce reads go to a sticky primary, which only moves
+  when it fails, so our transactions and nonces stay on one mempool
+- a node that keeps failing is taken out of rotation (circuit open),
+  retried after a cooldown with a single request (half-open), and put back
+  on success; failed requests fail over to the next node
+
+The sync (PooledHTTPProvider) and async (PooledAsyncHTTPProvider) providers
+share the pool, so contracts.py, wallet.py and events.py all see the same
+health picture.
+"""
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, Sequence
+
+from web3 import Web3, AsyncWeb3
+from web3._utils.batching import sort_batch_response_by_response_ids
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPC_URL = "https://testnet.rpc.banelabs.org"
+
+# Methods that must hit the node holding our pending transactions
+PRIMARY_METHODS = {
+    "eth_sendRawTransaction",
+    "eth_sendTransaction",
+    "eth_getTransactionCount",
+    "eth_newFilter",
+    "eth_newBlockFilter",
+    "eth_getFilterChanges",
+    "eth_getFilterLogs",
+    "eth_uninstallFilter",
+}
+
+# Reads a lagging node would answer wrongly; never sent to a node just to measure it
+NO_PROBE_METHODS = {
+    "eth_blockNumber",
+    "eth_getBlockByNumber",
+    "eth_getLogs",
+}
+
+
+def split_rpc_urls(value: Optional[str]) -> tuple[str, ...]:
+    """Endpoints from a comma-separated NEOX_RPC_URL value"""
+    urls = tuple(u.strip() for u in (value or "").split(",") if u.strip())
+    return urls or (DEFAULT_RPC_URL,)
+
+
+@dataclass
+class Endpoint:
+    """Health and latency of one RPC node"""
+    url: str
+    latency: Optional[float] = None  # EWMA seconds
+    last_sample: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    failures: int = 0  # consecutive
+    open_until: float = 0.0  # circuit open while now < open_until
+    cooldown: float = 0.0
+    probing: bool = False  # half-open trial in flight
+
+    def available(self, now: float) -> bool:
+        """Closed, or cooled down and not already being probed"""
+        return now >= self.open_until and not (self.open_until and self.probing)
+
+
+@dataclass
+class RpcSession:
+    """Reads of one unit of work (e.g. a poll), pinned to a single endpoint"""
+    pool: "RpcPool"
+    endpoint: Optional[Endpoint] = None
+
+
+# Session of the running task (async) or thread (sync), if any
+_current_session: ContextVar[Optional[RpcSession]] = ContextVar("rpc_session", default=None)
+
+
+class RpcPool:
+    """
+    Latency-routed, circuit-broken set of RPC endpoints.
+
+    Usage:
+        pool = get_rpc_pool()
+        w3 = Web3(PooledHTTPProvider(pool))
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        failure_threshold: int = 3,
+        base_cooldown: float = 15.0,
+        max_cooldown: float = 300.0,
+        switch_ratio: float = 2.0,
+        probe_every: int = 50,
+        alpha: float = 0.2,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            urls: Endpoints in priority order (the first is the initial primary)
+            failure_threshold: Consecutive failures that open an endpoint's circuit
+            base_cooldown: Seconds an opened circuit waits before a trial request
+            max_cooldown: Cap for the cooldown, which doubles on every re-open
+            switch_ratio: Leave the current read node only when it is this much slower
+            probe_every: Send every Nth read to the least recently measured node
+            alpha: EWMA weight of each new latency sample
+        """
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.switch_ratio = switch_ratio
+        self.probe_every = probe_every
+        self.alpha = alpha
+        self._primary = self.endpoints[0]
+        self._reads = 0
+        self._lock = threading.Lock()
+
+    @property
+    def urls(self) -> tuple[str, ...]:
+        return tuple(e.url for e in self.endpoints)
+
+    @contextmanager
+    def session(self) -> Iterator[RpcSession]:
+        """
+        Pin every read inside the block to one endpoint.
+
+        Tasks started inside the block share the session. Nested sessions
+        reuse the outer one.
+
+        Usage:
+            with pool.session():
+                head = await w3.eth.get_block("latest")
+                logs = await w3.eth.get_logs({...})
+        """
+        current = _current_session.get()
+        if current is not None and current.pool is self:
+            yield current
+            return
+        token = _current_session.set(RpcSession(self))
+        try:
+            yield _current_session.get()
+        finally:
+            _current_session.reset(token)
+
+    def active_session(self) -> Optional[RpcSession]:
+        """This pool's session for the running task or thread, if any"""
+        session = _current_session.get()
+        return session if session is not None and session.pool is self else None
+
+    # ==========================================================================
+    # ROUTING
+    # ==========================================================================
+
+    def _claim(self, endpoint: Endpoint) -> Endpoint:
+        """Mark a half-open endpoint's single trial request as taken"""
+        if endpoint.open_until:
+            endpoint.probing = True
+        return endpoint
+
+    def _fallback(self, exclude: Sequence[Endpoint]) -> Optional[Endpoint]:
+        """Every circuit is open: use the one that reopens soonest"""
+        rest = [e for e in self.endpoints if e not in exclude]
+        return min(rest, key=lambda e: e.open_until) if rest else None
+
+    def pick(
+        self,
+        method: str,
+        current: Optional[Endpoint] = None,
+        exclude: Sequence[Endpoint] = (),
+        pinned: bool = False,
+    ) -> Optional[Endpoint]:
+        """
+        Endpoint for the next request.
+
+        Args:
+            method: JSON-RPC method (writes are pinned to the primary)
+            current: The caller's current read endpoint, kept unless clearly slower
+            exclude: Endpoints that already failed this request
+            pinned: Keep current for reads whenever it is healthy (session reads)
+
+        Returns:
+            An endpoint, or None once every endpoint has been tried
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [e for e in self.endpoints if e not in exclude and e.available(now)]
+            if not healthy:
+                return self._fallback(exclude)
+
+            if method in PRIMARY_METHODS:
+                if self._primary in healthy:
+                    return self._claim(self._primary)
+                if self._primary in exclude and self._primary.available(now):
+                    # One failed request: fail over for this request only
+                    return self._claim(healthy[0])
+                # Sticky: move on only once the primary's circuit opens, never back
+                self._primary = healthy[0]
+                logger.warning(f"RPC primary is now {self._primary.url}")
+                return self._claim(self._primary)
+
+            if pinned and current in healthy:
+                return self._claim(current)
+
+            self._reads += 1
+            measured = [e for e in healthy if e.latency is not None]
+            # Head and log reads (and session reads) only go to measured nodes when any exist
+            probe_ok = method not in NO_PROBE_METHODS and not pinned
+            if probe_ok or not measured:
+                unmeasured = [e for e in healthy if e.latency is None]
+                if unmeasured:
+                    return self._claim(unmeasured[0])
+                if self._reads % self.probe_every == 0:
+                    return self._claim(min(healthy, key=lambda e: e.last_sample))
+
+            best = min(measured, key=lambda e: e.latency)
+            if current in measured and current.latency <= best.latency * self.switch_ratio:
+                return self._claim(current)
+            return self._claim(best)
+
+    # ==========================================================================
+    # FEEDBACK
+    # ==========================================================================
+
+    def record_success(self, endpoint: Endpoint, latency: float):
+        """Fold in a latency sample and close the circuit"""
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.last_sample = time.monotonic()
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency = self.alpha * latency + (1 - self.alpha) * endpoint.latency
+            if endpoint.open_until:
+                logger.info(f"RPC endpoint {endpoint.url} recovered")
+            endpoint.failures = 0
+            endpoint.open_until = 0.0
+            endpoint.cooldown = 0.0
+            endpoint.probing = False
+
+    def record_failure(self, endpoint: Endpoint, error: Exception):
+        """Count a transport failure; open the circuit past the threshold"""
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.errors += 1
+            endpoint.failures += 1
+            endpoint.probing = False
+            if endpoint.open_until or endpoint.failures >= self.failure_threshold:
+                endpoint.cooldown = min(
+                    self.max_cooldown,
+                    endpoint.cooldown * 2 if endpoint.cooldown else self.base_cooldown,
+                )
+                endpoint.open_until = time.monotonic() + endpoint.cooldown
+                logger.warning(
+                    f"RPC endpoint {endpoint.url} circuit open for {endpoint.cooldown:.0f}s ({error})"
+                )
+
+    def metrics(self) -> dict:
+        """Per-endpoint latency, error counts and circuit state"""
+        now = time.monotonic()
+        return {
+            e.url: {
+                "latency_ms": round(e.latency * 1000, 1) if e.latency is not None else None,
+                "requests": e.requests,
+                "errors": e.errors,
+                "circuit": "closed" if not e.open_until else ("open" if now < e.open_until else "half-open"),
+                "primary": e is self._primary,
+            }
+            for e in self.endpoints
+        }
+
+
+# ==============================================================================
+# PROVIDERS
+# ==============================================================================
+
+def _read_route(session: Optional[RpcSession], read_endpoint: Optional[Endpoint]) -> tuple[Optional[Endpoint], bool]:
+    """(current endpoint, pinned) for pick(): a session's endpoint wins over the provider's"""
+    if session is not None and session.endpoint is not None:
+        return session.endpoint, True
+    return read_endpoint, session is not None
+
+
+def _pin(session: Optional[RpcSession], endpoint: Endpoint):
+    """Bind a session to the endpoint that served its first (or failover) read"""
+    if session is None or session.endpoint is endpoint:
+        return
+    if session.endpoint is not None:
+        logger.warning(f"RPC session moved from {session.endpoint.url} to {endpoint.url} after a failure")
+    session.endpoint = endpoint
+
+
+class PooledHTTPProvider(Web3.HTTPProvider):
+    """HTTPProvider that sends each request to an endpoint chosen by an RpcPool"""
+
+    def __init__(self, pool: "RpcPool", **kwargs: Any):
+        # Failover across endpoints replaces web3's per-endpoint retries
+        kwargs.setdefault("exception_retry_configuration", None)
+        super().__init__(",".join(pool.urls), **kwargs)
+        self.pool = pool
+        self._read_endpoint: Optional[Endpoint] = None
+
+    def _post(self, method: str, request_data: bytes) -> bytes:
+        tried: list[Endpoint] = []
+        last_error: Optional[Exception] = None
+        session = self.pool.active_session()
+        while True:
+            current, pinned = _read_route(session, self._read_endpoint)
+            endpoint = self.pool.pick(method, current, tried, pinned)
+            if endpoint is None:
+                raise last_error
+            start = time.monotonic()
+            try:
+                raw = self._request_session_manager.make_post_request(
+                    endpoint.url, request_data, **self.get_request_kwargs()
+                )
+            except Exception as e:
+                self.pool.record_failure(endpoint, e)
+                tried.append(endpoint)
+                last_error = e
+                continue
+            self.pool.record_success(endpoint, time.monotonic() - start)
+            if method not in PRIMARY_METHODS:
+                self._read_endpoint = endpoint
+                _pin(session, endpoint)
+            return raw
+
+    def _make_request(self, method, request_data: bytes) -> bytes:
+        return self._post(method, request_data)
+
+    def make_batch_request(self, batch_requests):
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        raw_response = self._post("batch", request_data)
+        responses_list = self.decode_rpc_response(raw_response)
+        return sort_batch_response_by_response_ids(responses_list)
+
+
+class PooledAsyncHTTPProvider(AsyncWeb3.AsyncHTTPProvider):
+    """AsyncHTTPProvider that sends each request to an endpoint chosen by an RpcPool"""
+
+    def __init__(self, pool: "RpcPool", **kwargs: Any):
+        kwargs.setdefault("exception_retry_configuration", None)
+        super().__init__(",".join(pool.urls), **kwargs)
+        self.pool = pool
+        self._read_endpoint: Optional[Endpoint] = None
+
+    async def _post(self, method: str, request_data: bytes) -> bytes:
+        tried: list[Endpoint] = []
+        last_error: Optional[Exception] = None
+        session = self.pool.active_session()
+        while True:
+            current, pinned = _read_route(session, self._read_endpoint)
+            endpoint = self.pool.pick(method, current, tried, pinned)
+            if endpoint is None:
+                raise last_error
+            start = time.monotonic()
+            try:
+                raw = await self._request_session_manager.async_make_post_request(
+                    endpoint.url, request_data, **self.get_request_kwargs()
+                )
+            except Exception as e:
+                self.pool.record_failure(endpoint, e)
+                tried.append(endpoint)
+                last_error = e
+                continue
+            self.pool.record_success(endpoint, time.monotonic() - start)
+            if method not in PRIMARY_METHODS:
+                self._read_endpoint = endpoint
+                _pin(session, endpoint)
+            return raw
+
+    async def _make_request(self, method, request_data: bytes) -> bytes:
+        return await self._post(method, request_data)
+
+    async def make_batch_request(self, batch_requests):
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        raw_response = await self._post("batch", request_data)
+        responses_list = self.decode_rpc_response(raw_response)
+        return sort_batch_response_by_response_ids(responses_list)
+
+
+# Process-wide pools, one per endpoint list
+_pools: dict[tuple[str, ...], RpcPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_rpc_pool(urls: Optional[Sequence[str] | str] = None) -> RpcPool:
+    """
+    Shared RpcPool for an endpoint list.
+
+    Args:
+        urls: Endpoints, or a comma-separated string; defaults to the
+            configured network's NEOX_RPC_URL list
+    """
+    if urls is None:
+        from .config import get_network
+        urls = get_network().rpc_urls
+    key = split_rpc_urls(urls) if isinstance(urls, str) else tuple(urls)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = RpcPool(key)
+        return _pools[key]
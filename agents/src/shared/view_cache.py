@@ -0,0 +1,139 @@
+"""
+Read-through Cache for OrderBook / JobRegistry Views
+
+The same job is read many times while it moves through its lifecycle
+(bid evaluation, acceptance, metadata lookup, delivery). ViewCache keeps
+OrderBook.getJob (job state + bids) and JobRegistry.getJob results per job
+and drops them precisely when the EventListener sees an event that changes
+them, with a TTL as the fallback for events nobody in the process listens
+to. Our own transactions invalidate their job once mined.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# View kinds
+JOB = "job"            # OrderBook.getJob -> (JobState, Bid[])
+REGISTRY = "registry"  # JobRegistry.getJob -> (StoredJob, ...)
+
+# Which cached views each event makes stale (keyed by EventType value)
+INVALIDATED_BY: dict[str, tuple[str, ...]] = {
+    "JobPosted": (JOB, REGISTRY),
+    "BidPlaced": (JOB,),
+    "BidAccepted": (JOB, REGISTRY),
+    "DeliverySubmitted": (JOB, REGISTRY),
+    "DeliveryApproved": (JOB, REGISTRY),
+    "JobCancelled": (JOB, REGISTRY),
+}
+
+
+class ViewCache:
+    """
+    Per-job view cache with event invalidation and a TTL fallback.
+
+    Usage:
+        job = view_cache.get(JOB, job_id, lambda: order_book.functions.getJob(job_id).call())
+        view_cache.on_event("BidPlaced", job_id)
+    """
+
+    def __init__(
+        self,
+        ttl: float = float(os.getenv("VIEW_CACHE_TTL", "30")),
+        maxsize: int = 10_000,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry is trusted without an invalidating event
+            maxsize: Entries kept before the least recently used is evicted
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, int], tuple[float, Any]] = OrderedDict()
+        # Bumped on every invalidation so a load racing an event is not stored
+        self._generations: dict[tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._invalidations = 0
+
+    def lookup(self, kind: str, job_id: int) -> tuple[bool, Any, int]:
+        """(found, value, generation) for one view; counts a hit or a miss"""
+        key = (kind, job_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if time.monotonic() < entry[0]:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return True, entry[1], 0
+                del self._entries[key]
+                self._expired += 1
+            self._misses += 1
+            return False, None, self._generations.get(key, 0)
+
+    def store(self, kind: str, job_id: int, value: Any, generation: int):
+        """Cache a loaded view unless it was invalidated while loading"""
+        key = (kind, job_id)
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, kind: str, job_id: int, load: Callable[[], Any]) -> Any:
+        """Cached view, or load() it and cache the result"""
+        found, value, generation = self.lookup(kind, job_id)
+        if found:
+            return value
+        value = load()
+        self.store(kind, job_id, value, generation)
+        return value
+
+    def invalidate(self, job_id: int, kinds: Iterable[str] = (JOB, REGISTRY)):
+        """Drop cached views of a job"""
+        with self._lock:
+            for kind in kinds:
+                key = (kind, job_id)
+                self._generations[key] = self._generations.get(key, 0) + 1
+                if self._entries.pop(key, None) is not None:
+                    self._invalidations += 1
+
+    def on_event(self, event_type: str, job_id: Optional[int]):
+        """Invalidate whatever an OrderBook event made stale"""
+        kinds = INVALIDATED_BY.get(event_type)
+        if kinds and job_id is not None:
+            self.invalidate(job_id, kinds)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            for key in self._entries:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        """Size, hit/miss counts and invalidations"""
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            "expired": self._expired,
+            "invalidations": self._invalidations,
+        }
+
+
+# Process-wide cache shared by contracts.py readers and every EventListener
+view_cache = ViewCache()
@@ -9,7 +9,7 @@ Each agent has its own wallet for:
 
 import os
 import json
-from typing import Optional
+from typing import Callable, Optional
 from dataclasses import dataclass, field
 from decimal import Decimal
 
@@ -18,6 +18,9 @@ from eth_account import Account
 from eth_account.signers.local import LocalAccount
 
 from .config import get_network, get_contract_addresses
+from .contracts import get_http_provider
+from .nonce import get_nonce_manager, is_already_known
+from .gas import get_gas_price_oracle
 
 
 @dataclass
@@ -73,8 +76,8 @@ class AgentWallet:
         self.network = get_network()
         self.addresses = get_contract_addresses()
         
-        # Create Web3 instance
-        self.w3 = Web3(Web3.HTTPProvider(self.network.rpc_url))
+        # Create Web3 instance on the process-wide provider for the RPC pool
+        self.w3 = Web3(get_http_provider(",".join(self.network.rpc_urls)))
         
         # Create account from private key
         if not private_key.startswith("0x"):
@@ -82,6 +85,10 @@ class AgentWallet:
         self.account: LocalAccount = Account.from_key(private_key)
         self.w3.eth.default_account = self.account.address
         
+        # Shared with contracts.send_transaction for the same account
+        self.nonces = get_nonce_manager(self.w3, self.account.address)
+        self.gas_prices = get_gas_price_oracle(self.w3)
+        
         # Load USDC ABI for token operations
         self._usdc_abi = self._load_erc20_abi()
     
@@ -180,6 +187,31 @@ class AgentWallet:
         raw = usdc_contract.functions.balanceOf(self.address).call()
         return Decimal(raw) / Decimal(10 ** 6)
     
+    def _send(self, build_tx: Callable[[int], dict]) -> TransactionResult:
+        """Sign and send build_tx(nonce) with a locally allocated nonce, then wait for it"""
+        def sign_and_send(nonce: int):
+            signed = self.w3.eth.account.sign_transaction(build_tx(nonce), self.account.key)
+            try:
+                return self.w3.eth.send_raw_transaction(signed.raw_transaction)
+            except Exception as e:
+                if not is_already_known(e):
+                    raise
+                return signed.hash
+        
+        tx_hash = self.nonces.submit(sign_and_send)
+        try:
+            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        except Exception:
+            # Possibly dropped; re-read the nonce before the next send
+            self.nonces.resync()
+            raise
+        
+        return TransactionResult(
+            success=receipt['status'] == 1,
+            tx_hash=tx_hash.hex(),
+            gas_used=receipt['gasUsed']
+        )
+    
     def transfer_native(self, to: str, amount_ether: Decimal) -> TransactionResult:
         """
         Transfer native tokens (GAS).
@@ -189,25 +221,15 @@ class AgentWallet:
             amount_ether: Amount in ether
         """
         try:
-            tx = {
+            return self._send(lambda nonce: {
                 'from': self.address,
                 'to': Web3.to_checksum_address(to),
                 'value': self.w3.to_wei(float(amount_ether), 'ether'),
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': nonce,
                 'gas': 21000,
-                'gasPrice': self.w3.eth.gas_price,
+                'gasPrice': self.gas_prices.gas_price(),
                 'chainId': self.network.chain_id,
-            }
-            
-            signed = self.w3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            
-            return TransactionResult(
-                success=receipt['status'] == 1,
-                tx_hash=tx_hash.hex(),
-                gas_used=receipt['gasUsed']
-            )
+            })
         except Exception as e:
             return TransactionResult(success=False, error=str(e))
     
@@ -231,26 +253,17 @@ class AgentWallet:
             # Convert to raw units (6 decimals)
             raw_amount = int(amount * 10 ** 6)
             
-            tx = usdc_contract.functions.transfer(
+            call = usdc_contract.functions.transfer(
                 Web3.to_checksum_address(to),
                 raw_amount
-            ).build_transaction({
+            )
+            return self._send(lambda nonce: call.build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': nonce,
                 'gas': 100000,
-                'gasPrice': self.w3.eth.gas_price,
+                'gasPrice': self.gas_prices.gas_price(),
                 'chainId': self.network.chain_id,
-            })
-            
-            signed = self.w3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            
-            return TransactionResult(
-                success=receipt['status'] == 1,
-                tx_hash=tx_hash.hex(),
-                gas_used=receipt['gasUsed']
-            )
+            }))
         except Exception as e:
             return TransactionResult(success=False, error=str(e))
     
@@ -277,26 +290,17 @@ class AgentWallet:
             else:
                 raw_amount = int(amount * 10 ** 6)
             
-            tx = usdc_contract.functions.approve(
+            call = usdc_contract.functions.approve(
                 Web3.to_checksum_address(spender),
                 raw_amount
-            ).build_transaction({
+            )
+            return self._send(lambda nonce: call.build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': nonce,
                 'gas': 100000,
-                'gasPrice': self.w3.eth.gas_price,
+                'gasPrice': self.gas_prices.gas_price(),
                 'chainId': self.network.chain_id,
-            })
-            
-            signed = self.w3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            
-            return TransactionResult(
-                success=receipt['status'] == 1,
-                tx_hash=tx_hash.hex(),
-                gas_used=receipt['gasUsed']
-            )
+            }))
         except Exception as e:
             return TransactionResult(success=False, error=str(e))
     
@@ -309,8 +313,8 @@ class AgentWallet:
         return signed.signature.hex()
     
     def get_nonce(self) -> int:
-        """Get current nonce for the wallet"""
-        return self.w3.eth.get_transaction_count(self.address)
+        """Get current nonce for the wallet (including pending transactions)"""
+        return self.w3.eth.get_transaction_count(self.address, "pending")
     
     def estimate_gas(self, to: str, data: bytes = b'', value: int = 0) -> int:
         """Estimate gas for a transaction"""
@@ -7,7 +7,6 @@ by requested hashtags.
 
 import os
 import json
-import base64
 import asyncio
 import logging
 from typing import Optional
@@ -15,16 +14,16 @@ from typing import Optional
 from spoon_ai.agents.toolcall import ToolCallAgent
 from spoon_ai.tools import ToolManager
 from spoon_ai.chat import ChatBot
-import httpx
 
 from agents.src.shared.base_agent import BaseArchiveAgent, AgentCapability, ActiveJob, BidDecision
 from agents.src.shared.config import JobType, JOB_TYPE_LABELS
-from agents.src.shared.events import JobPostedEvent
+from agents.src.shared.events import EventType, JobPostedEvent, parse_job_posted
 from agents.src.shared.wallet_tools import create_wallet_tools
 from agents.src.shared.bidding_tools import create_bidding_tools
 from agents.src.tiktok.tool import create_tiktok_tools
-from agents.src.shared.contracts import get_bids_for_job, get_job
+from agents.src.shared.contracts import get_bids_for_job, get_job_records, get_registry_job, call_async
 from agents.src.shared.neofs import get_neofs_client
+from agents.src.shared.indexer import get_order_book_index
 
 logger = logging.getLogger(__name__)
 
@@ -72,22 +71,26 @@ class TikTokAgent(BaseArchiveAgent):
         self._job_metadata_cache: dict[int, dict] = {}
         self._metadata_uri_cache: dict[str, str] = {}
 
-    def _matches_job(self, job: JobPostedEvent) -> bool:
+    async def _matches_job(self, job: JobPostedEvent) -> bool:
         """Check if the job description or tags look like a TikTok scrape we can do."""
         tokens = ["tiktok", "tt", "hashtag", "profile"]
-        metadata_record = self._get_job_metadata_record(job.job_id) or {}
-        desc_source = job.description or metadata_record.get("description") or ""
+        desc_source = job.description
+        metadata_uri = job.metadata_uri
+        if not desc_source or not metadata_uri:
+            # JobPosted carries both; older OrderBook deployments emitted neither
+            metadata_record = await self._get_job_metadata_record(job.job_id) or {}
+            desc_source = desc_source or metadata_record.get("description") or ""
+            metadata_uri = metadata_uri or metadata_record.get("metadata_uri") or ""
         desc = desc_source.lower()
-
-        registry_tags = metadata_record.get("tags") or []
-        tag_list = list({*self._get_job_tags(job.job_id), *registry_tags})
-        tags_joined = " ".join(tag_list).lower() if tag_list else ""
-
-        metadata_uri = metadata_record.get("metadata_uri") or ""
-        metadata_text = self._get_metadata_text(metadata_uri)
+        metadata_text = await self._get_metadata_text(metadata_uri)
 
         searchable_text = " ".join(filter(None, [desc, metadata_text]))
-        matched = any(tok in searchable_text for tok in tokens) or any(tok in tags_joined for tok in tokens)
+        matched = any(tok in searchable_text for tok in tokens)
+
+        # Tags live only in the JobRegistry (the event has their hash); read them if still undecided
+        tag_list = [] if matched else await self._get_job_tags(job.job_id)
+        tags_joined = " ".join(tag_list).lower() if tag_list else ""
+        matched = matched or any(tok in tags_joined for tok in tokens)
         logger.info(
             "Match check job_id=%s tokens=%s desc_snip=%s tags=%s metadata_uri=%s match=%s",
             getattr(job, "job_id", None),
@@ -99,13 +102,13 @@ class TikTokAgent(BaseArchiveAgent):
         )
         return matched
 
-    def _get_job_tags(self, job_id: int) -> list[str]:
+    async def _get_job_tags(self, job_id: int) -> list[str]:
         """Fetch tags from JobRegistry metadata for a given job id."""
-        record = self._get_job_metadata_record(job_id) or {}
+        record = await self._get_job_metadata_record(job_id) or {}
         tags = record.get("tags") or []
         return [str(t) for t in tags]
 
-    def _get_job_metadata_record(self, job_id: int) -> dict | None:
+    async def _get_job_metadata_record(self, job_id: int) -> dict | None:
         """Return cached job metadata (description, tags, metadataURI) from JobRegistry."""
         if job_id in self._job_metadata_cache:
             return self._job_metadata_cache[job_id]
@@ -113,11 +116,15 @@ class TikTokAgent(BaseArchiveAgent):
         if not self._contracts:
             return None
         try:
-            stored_job, _ = self._contracts.job_registry.functions.getJob(job_id).call()
+            registry_job = await call_async(get_registry_job, self._contracts, job_id)
         except Exception as e:
             logger.debug("Failed to fetch job metadata for job %s: %s", job_id, e)
             return None
+        return self._cache_registry_record(job_id, registry_job)
 
+    def _cache_registry_record(self, job_id: int, registry_job) -> dict | None:
+        """Parse a JobRegistry.getJob result into the metadata cache."""
+        stored_job = registry_job[0] if registry_job else None
         if not stored_job or not isinstance(stored_job, (list, tuple)) or len(stored_job) == 0:
             return None
 
@@ -130,7 +137,7 @@ class TikTokAgent(BaseArchiveAgent):
         self._job_metadata_cache[job_id] = record
         return record
 
-    def _fetch_metadata_document(self, metadata_uri: str) -> Optional[dict]:
+    async def _fetch_metadata_document(self, metadata_uri: str) -> Optional[dict]:
         """Retrieve NeoFS metadata JSON referenced by metadata_uri."""
         if not metadata_uri or not metadata_uri.startswith("neofs://"):
             return None
@@ -140,28 +147,22 @@ class TikTokAgent(BaseArchiveAgent):
         except ValueError:
             return None
 
-        gateway = os.getenv("NEOFS_REST_GATEWAY", "https://rest.fs.neo.org").rstrip("/")
-        url = f"{gateway}/v1/objects/{container_id}/by_id/{object_id}"
         try:
-            response = httpx.get(url, timeout=10)
-            response.raise_for_status()
-            payload_b64 = response.json().get("payload")
-            if not payload_b64:
-                return None
-            decoded = base64.b64decode(payload_b64)
-            return json.loads(decoded)
+            # Pooled async client; serves the disk cache and queued uploads first
+            data = await get_neofs_client().download_object(object_id, container_id)
+            return json.loads(data)
         except Exception as e:
             logger.debug("Failed to download metadata %s: %s", metadata_uri, e)
             return None
 
-    def _get_metadata_text(self, metadata_uri: str) -> str:
+    async def _get_metadata_text(self, metadata_uri: str) -> str:
         """Return cached flattened metadata JSON for keyword matching."""
         if not metadata_uri:
             return ""
         if metadata_uri in self._metadata_uri_cache:
             return self._metadata_uri_cache[metadata_uri]
 
-        document = self._fetch_metadata_document(metadata_uri)
+        document = await self._fetch_metadata_document(metadata_uri)
         if not isinstance(document, dict):
             self._metadata_uri_cache[metadata_uri] = ""
             return ""
@@ -173,44 +174,43 @@ class TikTokAgent(BaseArchiveAgent):
         self._metadata_uri_cache[metadata_uri] = text
         return text
 
-    def log_historical_jobs(self, from_block: int = 0, to_block: str | int = "latest"):
-        """Fetch historical JobPosted logs and log match/non-match."""
-        if not self._contracts:
+    async def log_historical_jobs(self, from_block: int = 0, to_block: str | int = "latest"):
+        """Scan historical JobPosted logs in chunks and log match/non-match."""
+        if not self._contracts or not self.event_listener:
             logger.warning("No contracts loaded; cannot fetch historical jobs.")
             return
-        try:
-            logs = (
-                self._contracts.order_book.events.JobPosted()
-                .get_logs(from_block=from_block, to_block=to_block)
-            )
-            if not logs:
-                logger.info("No JobPosted logs found in range %s-%s", from_block, to_block)
+        found = 0
+
+        async def log_chunk(start: int, end: int, events: list):
+            nonlocal found
+            jobs = [parse_job_posted(ev) for event_type, ev in events if event_type == EventType.JOB_POSTED]
+            if not jobs:
                 return
-            for ev in logs:
-                args = ev["args"]
-                job = JobPostedEvent(
-                    job_id=args.get("jobId", args.get("id", 0)),
-                    client=args.get("client", args.get("poster", "")),
-                    job_type=args.get("jobType", 0),
-                    budget=args.get("budget", 0),
-                    deadline=args.get("deadline", 0),
-                    description=args.get("description", ""),
-                    block_number=ev["blockNumber"],
-                    tx_hash=ev["transactionHash"].hex() if ev["transactionHash"] else "",
-                )
-                match = self._matches_job(job)
+
+            # One batched read for every job in the chunk: OrderBook state + registry metadata
+            try:
+                records = await call_async(get_job_records, self._contracts, [job.job_id for job in jobs])
+            except Exception as e:
+                logger.debug("Batched job read failed for blocks %s-%s: %s", start, end, e)
+                records = {}
+            for job_id, (_, registry_job) in records.items():
+                if registry_job is not None:
+                    self._cache_registry_record(job_id, registry_job)
+
+            for job in jobs:
+                found += 1
+                match = await self._matches_job(job)
                 logger.info(
-                    "Historical JobPosted id=%s type=%s budget=%s match=%s desc=%s tx=%s",
+                    "Historical JobPosted id=%s match=%s desc=%s metadata=%s tx=%s",
                     job.job_id,
-                    job.job_type,
-                    job.budget,
                     match,
                     (job.description or "")[:200],
+                    job.metadata_uri,
                     job.tx_hash,
                 )
                 # Also log current on-chain job state/bids if available
                 try:
-                    state, bids = self._contracts.order_book.functions.getJob(job.job_id).call()
+                    state, bids = records[job.job_id][0]
                     logger.info(
                         "JobState id=%s poster=%s status=%s accepted_bid=%s has_dispute=%s bids=%s",
                         job.job_id,
@@ -222,6 +222,11 @@ class TikTokAgent(BaseArchiveAgent):
                     )
                 except Exception as e:
                     logger.debug("Unable to fetch job state for id=%s: %s", job.job_id, e)
+
+        try:
+            await self.event_listener.backfill(from_block, to_block, log_chunk, [EventType.JOB_POSTED])
+            if not found:
+                logger.info("No JobPosted logs found in range %s-%s", from_block, to_block)
         except Exception as e:
             logger.error("Failed to fetch historical jobs: %s", e)
 
@@ -238,12 +243,19 @@ class TikTokAgent(BaseArchiveAgent):
     def _adjust_bid_for_competition(self, decision, job: JobPostedEvent):
         """Undercut existing bids to stay competitive."""
         try:
-            if not self._contracts:
-                return decision
-            bids = get_bids_for_job(self._contracts, job.job_id)
-            if not bids:
-                return decision
-            current_low = min(b[2] for b in bids)  # assuming tuple (..., amount, ...)
+            index = get_order_book_index()
+            if index:
+                lowest = index.lowest_bid(job.job_id)
+                if not lowest:
+                    return decision
+                current_low = int(lowest["price"])
+            else:
+                if not self._contracts:
+                    return decision
+                bids = get_bids_for_job(self._contracts, job.job_id)
+                if not bids:
+                    return decision
+                current_low = min(b[3] for b in bids)  # Bid tuple: (id, jobId, bidder, price, ...)
             target = int(max(current_low * 0.95, current_low - 10_000))  # undercut ~5% with floor
             if target > 0 and target < decision.proposed_amount:
                 decision.proposed_amount = target
@@ -269,13 +281,15 @@ class TikTokAgent(BaseArchiveAgent):
                 "agent": self.agent_name,
                 "agent_type": self.agent_type,
             }
-            result = await neofs.upload_json(
+            queued = await neofs.upload_json(
                 payload,
                 filename=f"bid-{job.job_id}.json",
                 additional_attributes=None,
                 container_id=os.getenv("NEOFS_CONTAINER_ID"),
+                defer=True,
             )
-            await neofs.close()
+            # The URI goes into placeBid; only real object IDs resolve off this host
+            result = await queued.result()
             uri = f"neofs://{result.container_id}/{result.object_id}"
             logger.info("Uploaded bid metadata to NeoFS: %s", uri)
             return uri
@@ -324,7 +338,7 @@ class TikTokAgent(BaseArchiveAgent):
             logger.info("Skipping job #%s: not our job type (%s)", job.job_id, job.job_type)
             return
 
-        if not self._matches_job(job):
+        if not await self._matches_job(job):
             logger.info(f"Skipping job #{job.job_id}: description not TikTok-related.")
             return
 
@@ -354,14 +368,21 @@ class TikTokAgent(BaseArchiveAgent):
                     decision.estimated_time,
                     metadata_uri,
                 )
-                from agents.src.shared.contracts import place_bid  # local import to avoid cycle
-                bid_id = place_bid(
+                from agents.src.shared.contracts import send_place_bid, send_async  # local import to avoid cycle
+                pending = await send_async(
+                    send_place_bid,
                     self._contracts,
                     job.job_id,
                     decision.proposed_amount,
                     decision.estimated_time,
                     metadata_uri,
+                    priority=self.priority_bids,
                 )
+                logger.info("Bid sent job_id=%s tx=%s", job.job_id, pending.tx_hash)
+                self._bid_txs[job.job_id] = pending
+                if self.event_listener:
+                    self.event_listener.watch_job(job.job_id)
+                bid_id = await pending.wait()
                 logger.info("Bid placed job_id=%s bid_id=%s", job.job_id, bid_id)
             except Exception as e:
                 logger.error("Failed to place bid on job %s: %s", job.job_id, e)
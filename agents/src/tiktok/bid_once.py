@@ -1,12 +1,16 @@
 """
 One-off TikTok bid script.
 
-Scans a range of OrderBook jobs, finds TikTok-related requests, and places a
-competitive low bid using the TikTok agent wallet.
+Lists the open OrderBook jobs (one getOpenJobs call per page), reads their
+bids and registry metadata in one batch, finds TikTok-related requests, and
+places a competitive low bid using the TikTok agent wallet.
 
 Usage:
     python agents/src/tiktok/bid_once.py [start_id] [end_id]
 
+    With no arguments every open job is considered; otherwise only open jobs
+    with start_id <= id <= end_id.
+
 Env:
     TIKTOK_PRIVATE_KEY (required)
     ORDERBOOK_ADDRESS, ESCROW_ADDRESS, JOB_REGISTRY_ADDRESS,
@@ -19,70 +23,72 @@ import logging
 
 from agents.src.shared.contracts import (
     get_contracts,
-    get_job,
-    get_bids_for_job,
-    place_bid,
+    get_all_open_jobs,
+    get_job_records,
+    send_place_bid,
 )
-from agents.src.shared.config import JobType
 
 
-def is_tiktok_job(job_tuple) -> bool:
-    """Heuristic: job tuple from get_job, index 0 is description, index 1 is job_type."""
-    if not job_tuple:
+def is_tiktok_job(registry_job) -> bool:
+    """Heuristic on a JobRegistry.getJob result: StoredJob.metadata holds description and tags."""
+    if not registry_job:
         return False
     try:
-        desc = (job_tuple[0] or "").lower()
-        job_type = int(job_tuple[1])
-        return job_type == JobType.TIKTOK_SCRAPE.value or "tiktok" in desc or "tt" in desc
+        metadata = registry_job[0][0]
+        desc = (metadata[2] or "").lower()
+        tags = [t.lower() for t in metadata[4]]
+        return "tiktok" in desc or any("tiktok" in t for t in tags)
     except Exception:
         return False
 
 
 def main():
     logging.basicConfig(level=logging.INFO)
-    start_id = int(sys.argv[1]) if len(sys.argv) > 1 else 1
-    end_id = int(sys.argv[2]) if len(sys.argv) > 2 else start_id + 20
+    start_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    end_id = int(sys.argv[2]) if len(sys.argv) > 2 else (start_id + 20 if start_id is not None else None)
 
     if not os.getenv("TIKTOK_PRIVATE_KEY"):
         print("TIKTOK_PRIVATE_KEY not set")
         sys.exit(1)
 
     contracts = get_contracts(private_key=os.getenv("TIKTOK_PRIVATE_KEY"))
-    order_book = contracts.order_book
 
-    for job_id in range(start_id, end_id + 1):
-        try:
-            job = get_job(contracts, job_id)
-        except Exception:
-            continue
+    # Open jobs page by page, then bids (getJob) and registry metadata for all of them in one batch
+    job_ids = [job_id for job_id, _ in get_all_open_jobs(contracts)]
+    if start_id is not None:
+        job_ids = [job_id for job_id in job_ids if start_id <= job_id <= end_id]
+    records = get_job_records(contracts, job_ids)
+    pending = []
 
-        if not is_tiktok_job(job):
+    for job_id, (job, registry_job) in sorted(records.items()):
+        if job is None or not is_tiktok_job(registry_job):
             continue
 
-        desc = job[0]
-        job_type = int(job[1])
-        budget = int(job[2]) if len(job) > 2 else 0
-        logging.info(f"Found TikTok job #{job_id}: type={job_type} budget={budget/1_000_000} USDC desc={desc}")
+        desc = registry_job[0][0][2]
+        logging.info(f"Found TikTok job #{job_id}: desc={desc}")
 
-        # Under-cut lowest bid if exists, else bid 70% of budget
-        bid_amount = int(budget * 0.7) if budget > 0 else 1_000_000
-        try:
-            bids = get_bids_for_job(contracts, job_id)
-            if bids:
-                lowest = min(b[2] for b in bids)  # amount field
-                bid_amount = max(int(lowest * 0.95), 100_000)
-        except Exception:
-            pass
+        # Under-cut lowest bid if exists, else bid 1 USDC
+        bid_amount = 1_000_000
+        bids = job[1]  # getJob returns (JobState, Bid[])
+        if bids:
+            lowest = min(b[3] for b in bids)  # Bid.price
+            bid_amount = max(int(lowest * 0.95), 100_000)
 
         eta_seconds = 3600  # 1 hour default
         metadata_uri = f"ipfs://tiktok-bid-{job_id}"
 
+        # Send every bid back-to-back, then wait for the receipts together
         try:
-            tx_hash = place_bid(contracts, job_id, bid_amount, eta_seconds, metadata_uri)
-            logging.info(f"Placed bid on job #{job_id}: {bid_amount/1_000_000} USDC, tx={tx_hash}")
+            pending.append((job_id, bid_amount, send_place_bid(contracts, job_id, bid_amount, eta_seconds, metadata_uri)))
         except Exception as e:
             logging.error(f"Failed to bid on job #{job_id}: {e}")
 
+    for job_id, bid_amount, tx in pending:
+        try:
+            bid_id = tx.result()
+            logging.info(f"Placed bid on job #{job_id}: {bid_amount/1_000_000} USDC, bid_id={bid_id}, tx={tx.tx_hash}")
+        except Exception as e:
+            logging.error(f"Failed to bid on job #{job_id}: {e}")
 
 if __name__ == "__main__":
     main()
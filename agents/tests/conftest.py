@@ -0,0 +1,36 @@
+"""
+Shared fixtures for the agent tests.
+
+Every test gets its own state directory, so checkpoints, spill files and
+NeoFS caches never touch ~/.archive-agents.
+"""
+
+import pytest
+from hexbytes import HexBytes
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    """Point every on-disk store at a per-test directory"""
+    monkeypatch.setenv("EVENT_CHECKPOINT_DIR", str(tmp_path / "state"))
+    monkeypatch.setenv("NEOFS_CACHE_DIR", str(tmp_path / "neofs-cache"))
+    monkeypatch.setenv("NEOFS_UPLOAD_INDEX", str(tmp_path / "neofs-uploads.sqlite"))
+    monkeypatch.setenv("NEOFS_QUEUE_DIR", str(tmp_path / "neofs-queue"))
+    return tmp_path / "state"
+
+
+@pytest.fixture
+def make_log():
+    """Factory for decoded OrderBook logs as web3 returns them"""
+
+    def make(block: int, log_index: int = 0, tx: int | None = None, **args):
+        tx = block * 1000 + log_index if tx is None else tx
+        return {
+            "args": args,
+            "blockNumber": block,
+            "logIndex": log_index,
+            "transactionHash": HexBytes(tx.to_bytes(32, "big")),
+            "blockHash": HexBytes((block + 1).to_bytes(32, "big")),
+        }
+
+    return make
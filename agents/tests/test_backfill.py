@@ -0,0 +1,99 @@
+"""Chunked eth_getLogs backfill: ordering, splitting and error handling."""
+
+import asyncio
+
+import pytest
+
+from agents.src.shared import backfill
+from agents.src.shared.backfill import LogBackfiller, is_range_too_large
+
+
+class _NoSleep:
+    """asyncio stand-in for backfill.py that records backoff delays instead of sleeping"""
+
+    def __init__(self):
+        self.sleeps = []
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    fake = _NoSleep()
+    monkeypatch.setattr(backfill, "asyncio", fake)
+    return fake.sleeps
+
+
+async def collect(backfiller: LogBackfiller, start: int, end: int) -> list:
+    chunks = []
+
+    async def on_chunk(s, e, logs):
+        chunks.append((s, e, logs))
+
+    await backfiller.run(start, end, on_chunk)
+    return chunks
+
+
+async def test_chunks_are_delivered_in_block_order():
+    async def fetch(start, end):
+        await asyncio.sleep(0.001 * (100 - start))  # later chunks finish first
+        return list(range(start, end + 1))
+
+    chunks = await collect(LogBackfiller(fetch, chunk_size=10, max_concurrency=4), 0, 95)
+    starts = [s for s, _, _ in chunks]
+    assert starts == sorted(starts)
+    assert [log for _, _, logs in chunks for log in logs] == list(range(96))
+
+
+async def test_range_errors_split_the_chunk():
+    calls = []
+
+    async def fetch(start, end):
+        calls.append((start, end))
+        if end - start + 1 > 25:
+            raise ValueError("query returned more than 10000 results")
+        return [start]
+
+    bf = LogBackfiller(fetch, chunk_size=100, max_concurrency=1)
+    chunks = await collect(bf, 0, 99)
+    assert [s for s, _, _ in chunks] == [0]
+    assert chunks[0][2] == [0, 25, 50, 75]
+    assert bf.chunk_size <= 50
+
+
+async def test_rate_limits_back_off_then_succeed(no_backoff):
+    failures = [2]
+
+    async def fetch(start, end):
+        if failures[0]:
+            failures[0] -= 1
+            raise RuntimeError("429 Too Many Requests")
+        return ["log"]
+
+    chunks = await collect(LogBackfiller(fetch, chunk_size=10), 0, 9)
+    assert chunks == [(0, 9, ["log"])]
+    assert len(no_backoff) == 2 and no_backoff[0] < no_backoff[1]
+
+
+async def test_other_errors_raise_immediately(no_backoff):
+    calls = []
+
+    async def fetch(start, end):
+        calls.append((start, end))
+        raise ConnectionError("connection refused")
+
+    with pytest.raises(ConnectionError):
+        await collect(LogBackfiller(fetch, chunk_size=100, max_concurrency=1), 0, 99)
+    assert calls == [(0, 99)]
+    assert no_backoff == []
+
+
+def test_range_error_detection():
+    assert is_range_too_large(ValueError("exceed maximum block range: 5000"))
+    assert is_range_too_large(ValueError("Log response size exceeded."))
+    assert not is_range_too_large(ValueError("execution reverted"))
+    assert not is_range_too_large(TimeoutError("read timeout"))
@@ -0,0 +1,95 @@
+"""Durable cursors, the processed-event ledger, and listener resume."""
+
+from types import SimpleNamespace
+
+from agents.src.shared.backfill import LogBackfiller
+from agents.src.shared.checkpoint import CheckpointStore, LEDGER_RETENTION_BLOCKS
+from agents.src.shared.events import EventListener, EventType
+
+ORDER_BOOK = "0x00000000000000000000000000000000000000Aa"
+
+
+def test_cursor_survives_reopen(tmp_path):
+    store = CheckpointStore(tmp_path / "events.sqlite")
+    assert store.get_cursor(ORDER_BOOK, "JobPosted") is None
+    store.set_cursors(ORDER_BOOK, ["JobPosted", "BidAccepted"], 120)
+    store.close()
+
+    reopened = CheckpointStore(tmp_path / "events.sqlite")
+    # Addresses are stored lowercased, so checksum and plain forms agree
+    assert reopened.get_cursor(ORDER_BOOK.lower(), "JobPosted") == 120
+    assert reopened.get_cursor(ORDER_BOOK, "BidAccepted") == 120
+
+
+def test_processed_ledger_rewind_and_retention(tmp_path):
+    store = CheckpointStore(tmp_path / "events.sqlite")
+    store.mark_processed("0xAB", 0, 100)
+    store.mark_processed("0xcd", 1, 105)
+    assert store.is_processed("0xab", 0)
+
+    store.set_cursors(ORDER_BOOK, ["JobPosted"], 110)
+    store.rewind(ORDER_BOOK, 102)
+    assert store.get_cursor(ORDER_BOOK, "JobPosted") == 102
+    assert store.is_processed("0xab", 0)
+    assert not store.is_processed("0xcd", 1)  # orphaned block: must be handled again
+
+    store.set_cursors(ORDER_BOOK, ["JobPosted"], 101 + LEDGER_RETENTION_BLOCKS)
+    assert not store.is_processed("0xab", 0)
+
+
+def _listener(store: CheckpointStore, logs: list) -> tuple[EventListener, list]:
+    listener = EventListener(checkpoint=store, confirmations=0)
+    listener._order_book = SimpleNamespace(address=ORDER_BOOK)
+
+    async def fetch(start, end):
+        return [(EventType.JOB_POSTED, log) for log in logs if start <= log["blockNumber"] <= end]
+
+    listener._backfiller = LogBackfiller(fetch, chunk_size=5)
+    seen = []
+
+    async def on_job(event):
+        seen.append(event.job_id)
+
+    listener.on_job_posted(on_job)
+    return listener, seen
+
+
+async def test_listener_commits_and_resumes(tmp_path, make_log):
+    store = CheckpointStore(tmp_path / "events.sqlite")
+    logs = [make_log(3, jobId=1), make_log(8, jobId=2), make_log(12, jobId=3)]
+
+    listener, seen = _listener(store, logs[:2])
+    await listener._scan(head=10, blocks_back=10)
+    # Cursors stay below events that are queued but not yet handled
+    assert store.get_cursor(ORDER_BOOK, "JobPosted") < 8
+    await listener.drain()
+    await listener._scan(head=11, blocks_back=10)  # the next poll commits past them
+    listener.stop()
+    assert seen == [1, 2]
+    assert store.get_cursor(ORDER_BOOK, "JobPosted") == 11
+
+    # A restart resumes after the cursor and only delivers the new event
+    restarted, seen = _listener(store, logs)
+    await restarted._scan(head=15, blocks_back=10)
+    await restarted.drain()
+    restarted.stop()
+    assert seen == [3]
+    assert store.get_cursor(ORDER_BOOK, "JobPosted") == 11  # held below the queued block 12 until the next poll
+
+
+async def test_processed_events_are_not_redelivered(tmp_path, make_log):
+    store = CheckpointStore(tmp_path / "events.sqlite")
+    logs = [make_log(3, jobId=1), make_log(4, jobId=2)]
+
+    listener, seen = _listener(store, logs)
+    await listener._scan(head=4, blocks_back=10)
+    await listener.drain()
+    listener.stop()
+
+    # The cursor lags (a crash before it was committed); the ledger still dedupes
+    store.set_cursors(ORDER_BOOK, ["JobPosted"], 2)
+    replay, seen = _listener(store, logs)
+    await replay._scan(head=4, blocks_back=10)
+    await replay.drain()
+    replay.stop()
+    assert seen == []
@@ -0,0 +1,167 @@
+"""Event dispatch: failed handlers hold the watermark, spill files survive restarts, jobs stay in chain order."""
+
+import asyncio
+import json
+from dataclasses import dataclass
+
+from agents.src.shared.dispatch import EventDispatcher, OverflowPolicy, QueuedEvent
+from agents.src.shared.keyed_executor import KeyedExecutor
+
+
+@dataclass
+class Payload:
+    job_id: int
+
+
+def event(block: int, job_id: int | None = None) -> QueuedEvent:
+    return QueuedEvent("JobPosted", Payload(job_id or block), f"0x{block:064x}", 0, block)
+
+
+async def test_failed_handler_holds_the_watermark():
+    attempts = []
+
+    async def handler(item):
+        attempts.append(item.block_number)
+        return item.block_number != 5
+
+    dispatcher = EventDispatcher(handler, retry_delay=0, max_attempts=3)
+    dispatcher.register("JobPosted", Payload)
+    for block in (5, 7, 9):
+        await dispatcher.put(event(block))
+    await asyncio.wait_for(dispatcher.join(), timeout=2)
+    dispatcher.stop()
+
+    assert attempts == [5, 5, 5, 7, 9]
+    assert dispatcher.low_watermark("JobPosted") == 5
+    metrics = dispatcher.metrics()["JobPosted"]
+    assert (metrics["handled"], metrics["failed"], metrics["retried"], metrics["held"]) == (2, 1, 2, 1)
+
+
+async def test_retry_succeeds_and_releases_the_watermark():
+    failures = [1]
+
+    async def handler(item):
+        if failures[0]:
+            failures[0] -= 1
+            raise RuntimeError("rpc timeout")
+        return True
+
+    dispatcher = EventDispatcher(handler, retry_delay=0)
+    dispatcher.register("JobPosted", Payload)
+    await dispatcher.put(event(5))
+    await asyncio.wait_for(dispatcher.join(), timeout=2)
+    dispatcher.stop()
+    assert dispatcher.low_watermark("JobPosted") is None
+    assert dispatcher.metrics()["JobPosted"]["handled"] == 1
+
+
+async def test_spill_is_replayed_after_restart(tmp_path):
+    gate = asyncio.Event()
+
+    async def stuck(item):
+        await gate.wait()
+        return True
+
+    first = EventDispatcher(stuck, maxsize=1, overflow=OverflowPolicy.SPILL, spill_dir=tmp_path)
+    first.register("JobPosted", Payload)
+    for block in (1, 2, 3, 4):
+        await first.put(event(block))
+    await asyncio.sleep(0)
+    first.stop()  # crash with events still spilled
+
+    spill = tmp_path / "JobPosted.spill.jsonl"
+    assert [json.loads(line)["block_number"] for line in spill.read_text().splitlines()] == [2, 3, 4]
+
+    seen = []
+    delivered = asyncio.Event()
+
+    async def handler(item):
+        seen.append(item.payload.job_id)
+        if len(seen) == 6:
+            delivered.set()
+        return True
+
+    second = EventDispatcher(handler, maxsize=1, overflow=OverflowPolicy.SPILL, spill_dir=tmp_path)
+    second.register("JobPosted", Payload)
+    assert second.low_watermark("JobPosted") == 2
+    second.start()
+    for block in (6, 7, 8):
+        await second.put(event(block))
+    # Delivery must not depend on join(), which production code never calls
+    await asyncio.wait_for(delivered.wait(), timeout=2)
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert seen == [2, 3, 4, 6, 7, 8]
+    assert second.low_watermark("JobPosted") is None
+    assert spill.read_text() == ""
+    second.stop()
+
+
+async def test_spill_drains_without_join(tmp_path):
+    gate = asyncio.Event()
+    seen = []
+
+    async def handler(item):
+        await gate.wait()
+        seen.append(item.block_number)
+        return True
+
+    dispatcher = EventDispatcher(handler, maxsize=1, overflow=OverflowPolicy.SPILL, spill_dir=tmp_path)
+    dispatcher.register("JobPosted", Payload)
+    for block in range(1, 6):
+        await dispatcher.put(event(block))
+    gate.set()
+    for _ in range(50):
+        if len(seen) == 5:
+            break
+        await asyncio.sleep(0.01)
+    dispatcher.stop()
+
+    assert seen == [1, 2, 3, 4, 5]
+
+
+async def test_one_job_is_handled_in_chain_order_across_event_types():
+    # As in the agents: several consumers per type, callbacks fanned out to a KeyedExecutor
+    executor = KeyedExecutor(max_concurrency=8)
+    order = []
+
+    async def handle(item):
+        # Other jobs' JobPosted handlers are slow, so job 1's BidAccepted is dequeued first
+        await asyncio.sleep(0.02 if item.payload.job_id != 1 else 0)
+        order.append((item.payload.job_id, item.event_type))
+
+    async def handler(item):
+        await executor.submit(item.payload.job_id, handle, item)
+        return True
+
+    dispatcher = EventDispatcher(handler, consumers=2, retry_delay=0, order_key=lambda item: item.payload.job_id)
+    for event_type in ("JobPosted", "BidPlaced", "BidAccepted"):
+        dispatcher.register(event_type, Payload)
+    chain = [("JobPosted", 2), ("JobPosted", 3), ("JobPosted", 1), ("BidPlaced", 1), ("BidAccepted", 1)]
+    for index, (event_type, job_id) in enumerate(chain):
+        await dispatcher.put(QueuedEvent(event_type, Payload(job_id), f"0x{index:064x}", index, 10))
+    await asyncio.wait_for(dispatcher.join(), timeout=2)
+    dispatcher.stop()
+
+    assert [event_type for job_id, event_type in order if job_id == 1] == ["JobPosted", "BidPlaced", "BidAccepted"]
+    assert dispatcher.low_watermark("BidAccepted") is None
+
+
+async def test_held_event_releases_its_job():
+    seen = []
+
+    async def handler(item):
+        seen.append(item.event_type)
+        return item.event_type != "JobPosted"
+
+    dispatcher = EventDispatcher(handler, max_attempts=2, retry_delay=0, order_key=lambda item: item.payload.job_id)
+    for event_type in ("JobPosted", "BidAccepted"):
+        dispatcher.register(event_type, Payload)
+    await dispatcher.put(QueuedEvent("JobPosted", Payload(1), "0x01", 0, 5))
+    await dispatcher.put(QueuedEvent("BidAccepted", Payload(1), "0x02", 0, 6))
+    await asyncio.wait_for(dispatcher.join(), timeout=2)
+    dispatcher.stop()
+
+    assert seen == ["JobPosted", "JobPosted", "BidAccepted"]
+    assert dispatcher.low_watermark("JobPosted") == 5
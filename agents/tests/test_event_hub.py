@@ -0,0 +1,68 @@
+"""Hub clients apply their own confirmation depth to streamed events."""
+
+from agents.src.shared.events import EventListener, EventType
+
+
+def hub_event(event_type: EventType, block: int, job_id: int) -> dict:
+    payload = {"job_id": job_id, "bid_id": 1, "worker": "0xw", "amount": 5, "block_number": block, "tx_hash": ""}
+    if event_type == EventType.JOB_POSTED:
+        payload = {"job_id": job_id, "client": "0xc", "description": "", "job_type": 0, "budget": 0,
+                   "deadline": 0, "block_number": block, "tx_hash": ""}
+    return {
+        "kind": "event",
+        "event_type": event_type.value,
+        "payload": payload,
+        "tx_hash": f"0x{block:064x}",
+        "log_index": 0,
+        "block_number": block,
+        "block_hash": f"0x{block + 1:064x}",
+    }
+
+
+def progress(head: int) -> dict:
+    return {"kind": "progress", "head": head, "blocks": {"JobPosted": head - 1, "BidAccepted": head - 1}}
+
+
+async def test_events_wait_for_the_agents_own_depth():
+    listener = EventListener(source="hub", confirmations={EventType.JOB_POSTED: 1, EventType.BID_ACCEPTED: 3})
+    accepted = []
+
+    async def accept(item):
+        accepted.append((item.event_type, item.block_number))
+
+    listener._accept = accept
+    listener.on_job_posted(lambda e: None)
+    listener.on_bid_accepted(lambda e: None)
+
+    await listener._on_hub_message(hub_event(EventType.JOB_POSTED, 10, 1))
+    await listener._on_hub_message(hub_event(EventType.BID_ACCEPTED, 10, 1))
+    assert accepted == []  # nothing is released before the head is known
+
+    await listener._on_hub_message(progress(11))
+    assert accepted == [("JobPosted", 10)]
+    assert listener._last_blocks[EventType.BID_ACCEPTED] == 8  # cursor stays below the held event
+
+    await listener._on_hub_message(hub_event(EventType.JOB_POSTED, 11, 2))
+    await listener._on_hub_message(progress(12))
+    assert accepted[-1] == ("JobPosted", 11)  # the held BidAccepted does not block JobPosted
+
+    await listener._on_hub_message(progress(13))
+    assert accepted[-1] == ("BidAccepted", 10)
+    assert listener._last_blocks[EventType.BID_ACCEPTED] == 10
+
+
+async def test_reorg_discards_held_events():
+    listener = EventListener(source="hub", confirmations=3)
+    accepted = []
+
+    async def accept(item):
+        accepted.append(item.block_number)
+
+    listener._accept = accept
+    listener.on_bid_accepted(lambda e: None)
+
+    await listener._on_hub_message(progress(10))
+    await listener._on_hub_message(hub_event(EventType.BID_ACCEPTED, 10, 1))
+    await listener._on_hub_message({"kind": "reorg", "fork": 9})
+    await listener._on_hub_message(progress(14))
+    assert accepted == []
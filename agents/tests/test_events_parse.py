@@ -0,0 +1,125 @@
+"""JobPosted/BidAccepted logs decode in both the current and the pre-upgrade layout."""
+
+from types import SimpleNamespace
+
+from eth_abi import encode
+from web3 import Web3
+
+from agents.src.shared.events import EventListener, EventType, apply_job_metadata, job_tags_hash, parse_job_posted
+
+ORDER_BOOK = "0x" + "11" * 20
+POSTER = "0x" + "22" * 20
+
+
+def listener(monkeypatch) -> EventListener:
+    monkeypatch.setenv("ORDERBOOK_ADDRESS", ORDER_BOOK)
+    events = EventListener(source="rpc")
+    events._setup_contracts()
+    return events
+
+
+def topic(value: int | str | bytes) -> bytes:
+    if isinstance(value, int):
+        return value.to_bytes(32, "big")
+    if isinstance(value, str):
+        return bytes.fromhex(value.removeprefix("0x")).rjust(32, b"\0")
+    return value
+
+
+def log(signature: str, topics: list, data: bytes = b"", block: int = 7) -> dict:
+    return {
+        "address": Web3.to_checksum_address(ORDER_BOOK),
+        "topics": [Web3.keccak(text=signature)] + [topic(t) for t in topics],
+        "data": data,
+        "blockNumber": block,
+        "logIndex": 0,
+        "transactionHash": b"\x01" * 32,
+        "transactionIndex": 0,
+        "blockHash": b"\x02" * 32,
+    }
+
+
+def decode(events: EventListener, raw: dict) -> tuple[EventType, dict]:
+    event_type, decoder = events._decoders[bytes(raw["topics"][0])]
+    return event_type, decoder.process_log(raw)
+
+
+def test_both_layouts_are_subscribed(monkeypatch):
+    events = listener(monkeypatch)
+    current = Web3.keccak(text="JobPosted(uint256,address,bytes32,uint64,string,string)")
+    legacy = Web3.keccak(text="JobPosted(uint256,address)")
+    assert events._decoders[bytes(current)][0] == EventType.JOB_POSTED
+    assert events._decoders[bytes(legacy)][0] == EventType.JOB_POSTED
+    assert bytes(Web3.keccak(text="BidAccepted(uint256,uint256,address,address)")) in events._decoders
+
+
+def test_current_job_posted_layout(monkeypatch):
+    events = listener(monkeypatch)
+    tags_hash = job_tags_hash(["tiktok"])
+    raw = log(
+        "JobPosted(uint256,address,bytes32,uint64,string,string)",
+        [5, POSTER, tags_hash],
+        encode(["uint64", "string", "string"], [99, "neofs://c/o", "scrape #cats"]),
+    )
+    event_type, decoded = decode(events, raw)
+    job = parse_job_posted(decoded)
+
+    assert event_type == EventType.JOB_POSTED
+    assert (job.job_id, job.deadline, job.metadata_uri, job.description) == (5, 99, "neofs://c/o", "scrape #cats")
+    assert job.tags_hash == tags_hash
+    # Terms aren't in the log until the metadata document fills them
+    assert (job.job_type, job.budget) == (None, 0)
+    apply_job_metadata(job, {"job_type": 0, "budget_micro": 2_000_000})
+    assert (job.job_type, job.budget) == (0, 2_000_000)
+
+
+def test_legacy_layouts(monkeypatch):
+    events = listener(monkeypatch)
+    _, decoded = decode(events, log("JobPosted(uint256,address)", [5, POSTER]))
+    job = parse_job_posted(decoded)
+    assert (job.job_id, job.client.lower(), job.metadata_uri, job.description) == (5, POSTER, "", "")
+
+    raw = log("BidAccepted(uint256,uint256,address,address)", [5, 3], encode(["address", "address"], [POSTER, POSTER]))
+    event_type, decoded = decode(events, raw)
+    accepted = events._parse_bid_accepted(decoded)
+    assert event_type == EventType.BID_ACCEPTED
+    assert (accepted.job_id, accepted.bid_id, accepted.amount) == (5, 3, 0)
+
+
+def test_malformed_metadata_leaves_terms_unset(monkeypatch):
+    events = listener(monkeypatch)
+    _, decoded = decode(events, log("JobPosted(uint256,address)", [5, POSTER]))
+    job = apply_job_metadata(parse_job_posted(decoded), {"job_type": "tiktok"})
+    assert job.job_type is None
+    assert apply_job_metadata(job, "not a document") is job
+
+
+async def test_backfill_scans_history_without_callbacks(monkeypatch):
+    events = listener(monkeypatch)
+    chain = [
+        log("JobPosted(uint256,address)", [1, POSTER], block=3),
+        log("BidPlaced(uint256,uint256,address,uint256,uint64,string)", [1, 1, POSTER], block=4),
+        log("JobPosted(uint256,address)", [2, POSTER], block=250),
+    ]
+    requested = []
+
+    async def get_logs(params):
+        requested.append(params["topics"][0])
+        return [
+            raw for raw in chain
+            if params["fromBlock"] <= raw["blockNumber"] <= params["toBlock"]
+            and Web3.to_hex(raw["topics"][0]) in params["topics"][0]
+        ]
+
+    events._w3 = SimpleNamespace(eth=SimpleNamespace(get_logs=get_logs))
+    events._backfiller.chunk_size = 100
+    chunks = []
+
+    async def on_chunk(start, end, found):
+        chunks.append((start, end, [parse_job_posted(event).job_id for _, event in found]))
+
+    await events.backfill(0, 299, on_chunk, [EventType.JOB_POSTED])
+
+    assert chunks == [(0, 99, [1]), (100, 199, []), (200, 299, [2])]
+    # Only JobPosted topics (both layouts), although nothing subscribed to it
+    assert all(len(topics) == 2 for topics in requested)
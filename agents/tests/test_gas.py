@@ -0,0 +1,65 @@
+"""Gas limits: eth_estimateGas every time, learned receipts as floor and fallback."""
+
+import pytest
+from web3.exceptions import ContractLogicError
+
+from agents.src.shared.gas import GasEstimator
+
+
+class Call:
+    address = "0xOrderBook"
+    fn_name = "placeBid"
+
+    def __init__(self, estimate):
+        self._estimate = estimate
+        self.estimates = 0
+
+    def estimate_gas(self, tx):
+        self.estimates += 1
+        if isinstance(self._estimate, Exception):
+            raise self._estimate
+        return self._estimate
+
+
+def test_estimates_even_with_history():
+    gas = GasEstimator(margin=1.5, default_limit=500_000)
+    gas.record(Call(0), {"gasUsed": 100_000, "status": 1}, 150_000)
+
+    # Longer calldata needs more than anything seen before
+    call = Call(180_000)
+    assert gas.estimate(call, "0xme") == 270_000
+    assert call.estimates == 1
+
+
+def test_history_is_a_floor():
+    gas = GasEstimator(margin=1.5)
+    gas.record(Call(0), {"gasUsed": 100_000, "status": 1}, 150_000)
+    assert gas.estimate(Call(60_000), "0xme") == 150_000
+    assert gas.metrics()["learned_floors"] == 1
+
+
+@pytest.mark.parametrize("history, expected", [(True, 150_000), (False, 500_000)])
+def test_failed_estimate_request_falls_back(history, expected):
+    gas = GasEstimator(margin=1.5, default_limit=500_000)
+    if history:
+        gas.record(Call(0), {"gasUsed": 100_000, "status": 1}, 150_000)
+    assert gas.estimate(Call(TimeoutError("read timed out")), "0xme") == expected
+
+
+@pytest.mark.parametrize("error", [
+    ContractLogicError("execution reverted: Job not open"),
+    ValueError({"code": 3, "message": "execution reverted"}),
+])
+def test_reverting_estimate_is_raised(error):
+    gas = GasEstimator(margin=1.5, default_limit=500_000)
+    gas.record(Call(0), {"gasUsed": 100_000, "status": 1}, 150_000)
+    with pytest.raises(type(error)):
+        gas.estimate(Call(error), "0xme")
+    assert gas.metrics()["fallbacks"] == gas.metrics()["learned_fallbacks"] == 0
+
+
+def test_out_of_gas_forgets_history():
+    gas = GasEstimator(margin=1.5, default_limit=500_000)
+    gas.record(Call(0), {"gasUsed": 100_000, "status": 1}, 150_000)
+    gas.record(Call(0), {"gasUsed": 150_000, "status": 0}, 150_000)
+    assert gas.estimate(Call(ConnectionError("node unreachable")), "0xme") == 500_000
@@ -0,0 +1,78 @@
+"""Keyed executor: per-key ordering, cross-key parallelism, stop()."""
+
+import asyncio
+
+import pytest
+
+from agents.src.shared.keyed_executor import KeyedExecutor
+
+
+async def test_same_key_runs_in_submission_order():
+    executor = KeyedExecutor(max_concurrency=4)
+    order = []
+
+    async def handle(key, n, delay):
+        await asyncio.sleep(delay)
+        order.append((key, n))
+        return n
+
+    futures = [
+        executor.submit("a", handle, "a", 1, 0.03),
+        executor.submit("b", handle, "b", 1, 0.0),
+        executor.submit("a", handle, "a", 2, 0.0),
+        executor.submit("a", handle, "a", 3, 0.01),
+    ]
+    assert await asyncio.gather(*futures) == [1, 1, 2, 3]
+    assert [n for key, n in order if key == "a"] == [1, 2, 3]
+    # "b" did not wait behind the slow first "a" handler
+    assert order[0] == ("b", 1)
+    assert executor.metrics()["active_keys"] == 0
+
+
+async def test_failure_reaches_the_future_and_the_key_continues():
+    executor = KeyedExecutor()
+
+    async def boom():
+        raise RuntimeError("bid reverted")
+
+    async def ok():
+        return "done"
+
+    failed = executor.submit(7, boom)
+    after = executor.submit(7, ok)
+    with pytest.raises(RuntimeError):
+        await failed
+    assert await after == "done"
+
+
+async def test_concurrency_is_capped():
+    executor = KeyedExecutor(max_concurrency=2)
+    running, peak = 0, 0
+
+    async def handle():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*(executor.submit(key, handle) for key in range(6)))
+    assert peak == 2
+
+
+async def test_stop_cancels_running_and_queued_work():
+    executor = KeyedExecutor()
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.Event().wait()
+
+    running = executor.submit(1, hang)
+    queued = executor.submit(1, hang)
+    await started.wait()
+    executor.stop()
+    await executor.join()
+
+    assert running.cancelled() and queued.cancelled()
+    assert executor.metrics() == {"active_keys": 0, "queued": 0, "max_concurrency": 8}
@@ -0,0 +1,85 @@
+"""The NeoFS download cache serves immutable objects and evicts the least recently read."""
+
+import os
+import time
+
+from agents.src.shared.neofs_cache import STALE_TEMP_SECONDS, NeoFSCache
+
+
+def age(cache: NeoFSCache, object_id: str, seconds: float):
+    """Backdate an object's last read"""
+    path = cache._path("cid", object_id)
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_round_trip_and_metrics(tmp_path):
+    cache = NeoFSCache(tmp_path, max_bytes=1024)
+    assert cache.get("cid", "a") is None
+    cache.put("cid", "a", b"payload")
+
+    assert cache.get("cid", "a") == b"payload"
+    assert cache.path("cid", "a").read_bytes() == b"payload"
+    assert cache.get("other", "a") is None
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["bytes"]) == (2, 2, 7)
+
+
+def test_eviction_drops_least_recently_read(tmp_path):
+    cache = NeoFSCache(tmp_path, max_bytes=300)
+    for object_id, seconds in (("old", 30), ("mid", 20), ("new", 10)):
+        cache.put("cid", object_id, b"x" * 100)
+        age(cache, object_id, seconds)
+    cache.get("cid", "old")  # reading refreshes recency
+
+    cache.put("cid", "extra", b"x" * 100)  # 400 > 300: evict down to 270
+
+    assert cache.get("cid", "mid") is None
+    assert cache.get("cid", "new") is None
+    assert cache.get("cid", "old") == b"x" * 100
+    assert cache.get("cid", "extra") == b"x" * 100
+    assert cache.evictions == 2
+    assert cache.metrics()["bytes"] == 200
+
+
+def test_eviction_rescans_files_of_other_processes(tmp_path):
+    first = NeoFSCache(tmp_path, max_bytes=150)
+    second = NeoFSCache(tmp_path, max_bytes=150)
+    first.put("cid", "a", b"x" * 100)
+    age(first, "a", 60)
+    second.put("cid", "b", b"x" * 100)
+    age(second, "b", 30)
+
+    first.put("cid", "c", b"x" * 100)  # first counts 200; the rescan finds 300
+
+    assert first.get("cid", "a") is None
+    assert first.get("cid", "b") is None
+    assert first.get("cid", "c") == b"x" * 100
+    assert first.metrics()["bytes"] == 100
+
+
+def test_aborted_writer_leaves_nothing(tmp_path):
+    cache = NeoFSCache(tmp_path, max_bytes=1024)
+    writer = cache.writer("cid", "a")
+    writer.write(b"partial")
+    writer.abort()
+
+    assert cache.get("cid", "a") is None
+    assert not [p for p in tmp_path.rglob("*") if p.is_file()]
+
+
+def test_stale_temp_files_are_removed(tmp_path):
+    shard = tmp_path / "ab"
+    shard.mkdir()
+    stale = shard / ".tmp-dead"
+    stale.write_bytes(b"x")
+    then = time.time() - STALE_TEMP_SECONDS - 1
+    os.utime(stale, (then, then))
+    fresh = shard / ".tmp-live"
+    fresh.write_bytes(b"x")
+
+    cache = NeoFSCache(tmp_path, max_bytes=1024)
+
+    assert not stale.exists()
+    assert fresh.exists()
+    assert cache.metrics()["bytes"] == 0
@@ -0,0 +1,64 @@
+"""Upload deduplication reuses an object only for the same payload with the same attributes."""
+
+import sys
+
+import pytest
+
+from agents.src.shared.neofs import NeoFSClient, NeoFSConfig, ObjectAttribute, UploadResult
+from agents.src.shared.neofs_index import UploadIndex, attributes_digest
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client whose uploads are recorded instead of sent, with a fresh upload index"""
+    monkeypatch.setattr(sys.modules[UploadIndex.__module__], "_index", None)
+    client = NeoFSClient(NeoFSConfig(gateway_url="http://gateway", container_id="cid"), shared=True)
+    client.uploads = []
+
+    async def upload_new(cid, data, attributes):
+        client.uploads.append({attr.key: attr.value for attr in attributes or []})
+        return UploadResult(object_id=f"oid-{len(client.uploads)}", container_id=cid)
+
+    monkeypatch.setattr(client, "_upload_new", upload_new)
+    return client
+
+
+def attrs(**values) -> list[ObjectAttribute]:
+    return [ObjectAttribute(key=key, value=value) for key, value in values.items()]
+
+
+async def test_same_payload_and_attributes_reuse_the_object(client):
+    first = await client.upload_object(b"{}", attrs(Type="job_metadata", Timestamp="1"))
+    second = await client.upload_object(b"{}", attrs(Type="job_metadata", Timestamp="2"))
+
+    assert second.object_id == first.object_id
+    assert second.deduplicated
+    assert len(client.uploads) == 1
+    assert client.uploads[0]["AttributesHash"] == attributes_digest({"Type": "job_metadata"})
+
+
+async def test_different_attributes_get_their_own_object(client):
+    job = await client.upload_object(b"{}", attrs(Type="job_metadata"))
+    delivery = await client.upload_object(b"{}", attrs(Type="delivery"))
+    bare = await client.upload_object(b"{}")
+
+    assert len({job.object_id, delivery.object_id, bare.object_id}) == 3
+    assert not delivery.deduplicated
+    assert [upload["Type"] for upload in client.uploads[:2]] == ["job_metadata", "delivery"]
+
+
+async def test_stale_hash_attributes_are_replaced(client):
+    await client.upload_object(b"{}", attrs(Type="job_metadata", ContentHash="old", AttributesHash="old"))
+
+    uploaded = client.uploads[0]
+    assert uploaded["ContentHash"] != "old"
+    assert uploaded["AttributesHash"] == attributes_digest({"Type": "job_metadata"})
+
+
+def test_lookup_without_attributes_hash_matches_any(tmp_path):
+    index = UploadIndex(tmp_path / "index.sqlite")
+    index.record("cid", "hash", attributes_digest({"Type": "a"}), "oid-a")
+
+    assert index.lookup("cid", "hash", attributes_digest({"Type": "b"})) is None
+    assert index.lookup("cid", "hash", attributes_digest({"Type": "a"})) == "oid-a"
+    assert index.lookup("cid", "hash") == "oid-a"
@@ -0,0 +1,149 @@
+"""The write-behind upload queue leases rows, retries failures and survives restarts."""
+
+import asyncio
+import sys
+
+import pytest
+
+from agents.src.shared.neofs import ObjectAttribute, UploadResult
+from agents.src.shared.neofs_cache import get_neofs_cache
+from agents.src.shared.neofs_index import attributes_digest, content_digest, content_object_id
+from agents.src.shared.neofs_queue import PendingUpload, UploadQueue
+
+queue_module = sys.modules[UploadQueue.__module__]
+
+
+class FakeClient:
+    """Gateway stand-in: fails the first `failures` uploads, optionally blocks until released"""
+
+    gateway_url = "http://gateway"
+    container_id = "cid"
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.uploads: list[tuple[bytes, dict]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def upload_object(self, path, attributes, cid, content_hash=None):
+        await self.release.wait()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("gateway down")
+        self.uploads.append((path.read_bytes(), {attr.key: attr.value for attr in attributes}))
+        return UploadResult(object_id=f"oid-{len(self.uploads)}", container_id=cid)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(queue_module, "get_neofs_client", lambda gateway_url, cid: client)
+    monkeypatch.setattr(sys.modules[content_digest.__module__], "_index", None)
+    monkeypatch.setattr(sys.modules[get_neofs_cache.__module__], "_cache", None)
+    return client
+
+
+def make_queue(tmp_path, **kwargs) -> UploadQueue:
+    kwargs.setdefault("base_backoff", 0.01)
+    return UploadQueue(tmp_path / "queue", **kwargs)
+
+
+async def test_upload_resolves_pending_and_cleans_up(tmp_path, client):
+    queue = make_queue(tmp_path)
+    pending = await queue.enqueue(client, b'{"a":1}', [ObjectAttribute(key="Type", value="bid")])
+
+    assert pending.object_id == content_object_id(content_digest(b'{"a":1}'))
+    assert queue.payload_path("cid", pending.content_hash) is not None
+    result = await pending.result(timeout=2)
+
+    assert result.object_id == "oid-1"
+    assert client.uploads == [(b'{"a":1}', {"Type": "bid"})]
+    assert queue.depth(due_only=False) == 0
+    assert queue.payload_path("cid", pending.content_hash) is None
+    await queue.stop()
+
+
+async def test_failures_retry_with_backoff(tmp_path, client):
+    client.failures = 2
+    queue = make_queue(tmp_path, max_attempts=5)
+    pending = await queue.enqueue(client, b"payload")
+
+    result = await pending.result(timeout=2)
+
+    assert result.object_id == "oid-1"
+    assert queue.failures == 2
+    await queue.stop()
+
+
+async def test_waiters_get_the_error_after_max_attempts_but_the_row_stays(tmp_path, client):
+    client.failures = 1
+    queue = make_queue(tmp_path, max_attempts=1, base_backoff=60)
+    pending = await queue.enqueue(client, b"payload")
+
+    with pytest.raises(ConnectionError):
+        await pending.result(timeout=2)
+
+    assert queue.depth(due_only=False) == 1
+    assert queue.depth() == 0  # waiting out the backoff
+    await queue.stop(drain_timeout=0)
+
+
+def test_claimed_rows_are_leased(tmp_path, client):
+    first = make_queue(tmp_path)
+    second = make_queue(tmp_path)
+    first._persist("http://gateway", "cid", "hash", attributes_digest({}), b"x", {})
+
+    assert len(first._claim_due(8)) == 1
+    assert second._claim_due(8) == []  # leased to first
+
+    # An uploader that dies leaves its lease to run out; anyone may then retry
+    second._conn.execute("UPDATE queued SET next_attempt_at = 0")
+    second._conn.commit()
+    assert len(second._claim_due(8)) == 1
+    assert first._claim_due(8) == []
+
+
+async def test_rows_survive_a_restart(tmp_path, client):
+    client.release.clear()  # the gateway hangs until shutdown
+    queue = make_queue(tmp_path)
+    pending = await queue.enqueue(client, b"payload")
+    await asyncio.sleep(0.05)
+    await queue.stop(drain_timeout=0.05)
+    queue.close()
+
+    client.release.set()
+    restarted = make_queue(tmp_path)
+    assert restarted.depth() == 1  # handed back, not left leased
+    restarted.start()
+    assert await restarted.flush(timeout=2)
+
+    assert client.uploads == [(b"payload", {})]
+    assert restarted.payload_path("cid", pending.content_hash) is None
+    await restarted.stop()
+
+
+async def test_same_payload_with_other_attributes_is_a_separate_row(tmp_path, client):
+    client.release.clear()
+    queue = make_queue(tmp_path)
+    job = await queue.enqueue(client, b"{}", [ObjectAttribute(key="Type", value="job_metadata")])
+    delivery = await queue.enqueue(client, b"{}", [ObjectAttribute(key="Type", value="delivery")])
+    again = await queue.enqueue(client, b"{}", [ObjectAttribute(key="Type", value="delivery")])
+    assert queue.depth(due_only=False) == 2
+
+    client.release.set()
+    results = [await pending.result(timeout=2) for pending in (job, delivery, again)]
+
+    assert results[1].object_id == results[2].object_id != results[0].object_id
+    assert sorted(attrs["Type"] for _, attrs in client.uploads) == ["delivery", "job_metadata"]
+    assert queue.payload_path("cid", job.content_hash) is None
+    await queue.stop()
+
+
+async def test_known_uploads_are_final_at_once():
+    pending = PendingUpload("cid", "hash", known_object_id="oid")
+    assert pending.done()
+    assert pending.uri == "neofs://cid/oid"
+    assert (await pending.result()).object_id == "oid"
+    # Inline uploads share the interface, so on-chain writers can always await result()
+    stored = UploadResult(object_id="oid", container_id="cid")
+    assert await stored.result() is stored
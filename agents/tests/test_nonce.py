@@ -0,0 +1,75 @@
+"""Local nonce allocation, reuse after failed sends, and resync on conflicts."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agents.src.shared.nonce import NonceManager
+
+ACCOUNT = "0x00000000000000000000000000000000000000Bb"
+
+
+class FakeEth:
+    def __init__(self, pending: int):
+        self.pending = pending
+        self.reads = 0
+
+    def get_transaction_count(self, address, block):
+        assert block == "pending"
+        self.reads += 1
+        return self.pending
+
+
+def manager(pending: int = 5, **kwargs) -> tuple[NonceManager, FakeEth]:
+    eth = FakeEth(pending)
+    return NonceManager(SimpleNamespace(eth=eth), ACCOUNT, **kwargs), eth
+
+
+def test_nonces_are_allocated_locally():
+    nonces, eth = manager()
+    assert [nonces.submit(lambda n: n) for _ in range(3)] == [5, 6, 7]
+    assert eth.reads == 1
+
+
+def test_failed_send_leaves_the_nonce_for_the_next_transaction():
+    nonces, eth = manager()
+    nonces.submit(lambda n: n)
+
+    def fail(nonce):
+        raise ConnectionError("connection reset")
+
+    with pytest.raises(ConnectionError):
+        nonces.submit(fail)
+    # The node never saw nonce 6, so its pending count hands it out again
+    eth.pending = 6
+    assert nonces.submit(lambda n: n) == 6
+    assert eth.reads == 2
+
+
+def test_nonce_conflict_resyncs_and_resends():
+    nonces, eth = manager()
+    tried = []
+
+    def send(nonce):
+        tried.append(nonce)
+        if nonce < 9:
+            eth.pending = 9  # another sender used this account
+            raise ValueError("nonce too low")
+        return nonce
+
+    assert nonces.submit(send) == 9
+    assert tried == [5, 9]
+    assert nonces.submit(lambda n: n) == 10
+
+
+def test_persistent_conflict_gives_up():
+    nonces, _ = manager(max_retries=2)
+    tried = []
+
+    def send(nonce):
+        tried.append(nonce)
+        raise ValueError("replacement transaction underpriced")
+
+    with pytest.raises(ValueError):
+        nonces.submit(send)
+    assert len(tried) == 3
@@ -0,0 +1,53 @@
+"""Adaptive poll delays: block ETA in local time, hot interval, backoff."""
+
+import pytest
+
+from agents.src.shared import poll_scheduler
+from agents.src.shared.poll_scheduler import PollScheduler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(poll_scheduler.time, "time", lambda: now[0])
+    return now
+
+
+def learn(scheduler: PollScheduler, clock, skew: float, heads: int = 4, block_time: float = 6.0):
+    """Observe heads 1 s after they were produced, on a chain clock `skew` seconds off ours"""
+    for n in range(heads):
+        produced = clock[0]
+        clock[0] += 1.0
+        scheduler.observe_head(n, int(produced + skew))
+        clock[0] = produced + block_time
+
+
+@pytest.mark.parametrize("skew", [0, 45, -45])
+def test_block_eta_ignores_clock_skew(clock, skew):
+    scheduler = PollScheduler(base_interval=3, margin=0.5)
+    learn(scheduler, clock, skew)
+    assert scheduler.block_time == pytest.approx(6.0)
+    # Head last seen 3 s ago: the next is due 6 s after the last, whatever the chain clock says
+    clock[0] -= 2.0
+    assert scheduler.next_delay() == pytest.approx(3.5)
+
+
+def test_hot_interval_caps_the_delay(clock):
+    scheduler = PollScheduler(base_interval=3, hot_interval=1.0, margin=0.5)
+    learn(scheduler, clock, skew=0)
+    clock[0] -= 6.0  # right as the last head was produced
+    assert scheduler.next_delay() == pytest.approx(7.5)
+    scheduler.watch("job-1")
+    assert scheduler.next_delay() == pytest.approx(1.0)
+    scheduler.unwatch("job-1")
+    assert scheduler.next_delay() == pytest.approx(7.5)
+
+
+def test_rate_limit_backoff_relaxes(clock):
+    scheduler = PollScheduler(base_interval=2, max_interval=30)
+    base = scheduler.next_delay()
+    scheduler.on_rate_limited()
+    scheduler.on_rate_limited()
+    assert scheduler.next_delay() == pytest.approx(base * 4)
+    scheduler.record_poll(1)
+    assert scheduler.next_delay() == pytest.approx(base * 2)
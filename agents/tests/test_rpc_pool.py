@@ -0,0 +1,102 @@
+"""RPC pool: circuit breaker, latency routing, and session pinning."""
+
+import sys
+
+import pytest
+
+from agents.src.shared.rpc_pool import PooledAsyncHTTPProvider, RpcPool
+
+URLS = ("http://a", "http://b", "http://c")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(sys.modules[RpcPool.__module__].time, "monotonic", lambda: now[0])
+    return now
+
+
+def measured_pool(**kwargs) -> RpcPool:
+    pool = RpcPool(URLS, **kwargs)
+    for endpoint, latency in zip(pool.endpoints, (0.05, 0.01, 0.02)):
+        pool.record_success(endpoint, latency)
+    return pool
+
+
+def test_circuit_trips_and_recovers(clock):
+    pool = RpcPool(URLS, failure_threshold=2, base_cooldown=10)
+    a = pool.endpoints[0]
+    for _ in range(2):
+        pool.record_failure(a, ConnectionError("refused"))
+    assert pool.metrics()["http://a"]["circuit"] == "open"
+    assert pool.pick("eth_call") is not a
+
+    clock[0] += 11
+    assert pool.metrics()["http://a"]["circuit"] == "half-open"
+    others = pool.endpoints[1:]
+    # One trial request only while half-open
+    assert pool.pick("eth_call", exclude=others) is a
+    assert not a.available(clock[0])
+
+    pool.record_failure(a, ConnectionError("refused"))
+    assert a.cooldown == 20  # reopened with a doubled cooldown
+    clock[0] += 21
+    assert pool.pick("eth_call", exclude=others) is a
+    pool.record_success(a, 0.01)
+    assert pool.metrics()["http://a"]["circuit"] == "closed"
+    assert a.cooldown == 0
+
+
+def test_reads_follow_latency_and_writes_stay_on_the_primary():
+    pool = measured_pool()
+    assert pool.pick("eth_call").url == "http://b"
+    assert pool.pick("eth_sendRawTransaction").url == "http://a"
+
+
+def test_head_and_log_reads_are_never_probes():
+    pool = measured_pool(probe_every=1)
+    b = pool.endpoints[1]
+    assert {pool.pick("eth_getLogs", b).url for _ in range(5)} == {"http://b"}
+    assert {pool.pick("eth_blockNumber", b).url for _ in range(5)} == {"http://b"}
+    # Other reads still re-measure the stalest node
+    assert pool.pick("eth_call", b).url != "http://b"
+
+
+async def test_session_pins_head_and_logs_to_one_node():
+    pool = measured_pool(probe_every=1)
+    provider = PooledAsyncHTTPProvider(pool)
+    served = []
+
+    async def post(url, data, **kwargs):
+        served.append(url)
+        return b"{}"
+
+    provider._request_session_manager.async_make_post_request = post
+    with pool.session() as session:
+        await provider._post("eth_getBlockByNumber", b"")
+        # Slower than b by far, but the session keeps the node it started on
+        pool.record_success(pool.endpoints[1], 10.0)
+        await provider._post("eth_getLogs", b"")
+        await provider._post("eth_call", b"")
+        with pool.session() as inner:
+            assert inner is session
+    assert served == ["http://b"] * 3
+    assert pool.active_session() is None
+
+
+async def test_session_fails_over_when_its_node_fails():
+    pool = measured_pool()
+    provider = PooledAsyncHTTPProvider(pool)
+    served = []
+
+    async def post(url, data, **kwargs):
+        if url == "http://b":
+            raise ConnectionError("reset")
+        served.append(url)
+        return b"{}"
+
+    provider._request_session_manager.async_make_post_request = post
+    with pool.session() as session:
+        session.endpoint = pool.endpoints[1]
+        await provider._post("eth_getLogs", b"")
+        assert session.endpoint.url == served[0] != "http://b"
@@ -0,0 +1,68 @@
+"""View cache: event invalidation, load races, TTL and LRU eviction."""
+
+import sys
+
+from agents.src.shared.events import EventListener, EventType
+from agents.src.shared.dispatch import QueuedEvent
+from agents.src.shared.view_cache import JOB, REGISTRY, ViewCache
+
+
+def test_events_invalidate_only_what_they_change():
+    cache = ViewCache(ttl=60)
+    cache.get(JOB, 1, lambda: "job")
+    cache.get(REGISTRY, 1, lambda: "registry")
+
+    cache.on_event("BidPlaced", 1)
+    assert cache.get(JOB, 1, lambda: "reloaded") == "reloaded"
+    assert cache.get(REGISTRY, 1, lambda: "reloaded") == "registry"
+
+
+def test_load_racing_an_event_is_not_stored():
+    cache = ViewCache(ttl=60)
+
+    def load():
+        cache.on_event("BidPlaced", 1)  # event arrives while the read is in flight
+        return "stale"
+
+    assert cache.get(JOB, 1, load) == "stale"
+    assert cache.get(JOB, 1, lambda: "fresh") == "fresh"
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    # The package re-exports the view_cache instance under the module's name
+    monkeypatch.setattr(sys.modules[ViewCache.__module__].time, "monotonic", lambda: now[0])
+    cache = ViewCache(ttl=30)
+    cache.get(JOB, 1, lambda: "old")
+    now[0] += 31
+    assert cache.get(JOB, 1, lambda: "new") == "new"
+    assert cache.metrics()["expired"] == 1
+
+
+def test_least_recently_used_is_evicted():
+    cache = ViewCache(ttl=60, maxsize=2)
+    cache.get(JOB, 1, lambda: "a")
+    cache.get(JOB, 2, lambda: "b")
+    cache.get(JOB, 1, lambda: "unused")  # touch 1
+    cache.get(JOB, 3, lambda: "c")
+    assert cache.metrics()["size"] == 2
+    assert cache.get(JOB, 1, lambda: "reloaded") == "a"
+    assert cache.get(JOB, 2, lambda: "reloaded") == "reloaded"
+
+
+async def test_accepted_bid_placed_invalidates_the_shared_cache(monkeypatch):
+    cache = ViewCache(ttl=60)
+    monkeypatch.setattr("agents.src.shared.events.view_cache", cache)
+    cache.get(JOB, 7, lambda: "bids before")
+
+    listener = EventListener()
+    delivered = []
+
+    async def deliver(item):
+        delivered.append(item)
+
+    listener._deliver = deliver
+    payload = type("Bid", (), {"job_id": 7})()
+    await listener._accept(QueuedEvent(EventType.BID_PLACED.value, payload, "0x01", 0, 5))
+    assert cache.get(JOB, 7, lambda: "bids after") == "bids after"
+    assert len(delivered) == 1
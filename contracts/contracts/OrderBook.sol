@@ -81,14 +81,26 @@ contract OrderBook is Ownable {
     mapping(uint256 => Dispute) private disputes;
     mapping(uint256 => uint256) private jobToDispute;
 
+    // Jobs in OPEN status, for paginated listing (order changes as jobs leave)
+    uint256[] private openJobIds;
+    mapping(uint256 => uint256) private openJobSlot; // jobId => index in openJobIds + 1
+
     IJobRegistry public jobRegistry;
     IEscrow public escrow;
     IReputationToken public reputationToken;
     IAgentRegistryView public agentRegistry;
 
-    event JobPosted(uint256 indexed jobId, address indexed poster);
+    /// @dev tagsHash = keccak256(abi.encode(tags)), indexed so listeners can filter on a tag set
+    event JobPosted(
+        uint256 indexed jobId,
+        address indexed poster,
+        bytes32 indexed tagsHash,
+        uint64 deadline,
+        string metadataURI,
+        string description
+    );
     event BidPlaced(uint256 indexed jobId, uint256 indexed bidId, address bidder, uint256 price);
-    event BidAccepted(uint256 indexed jobId, uint256 indexed bidId, address poster, address agent);
+    event BidAccepted(uint256 indexed jobId, uint256 indexed bidId, address poster, address agent, uint256 price);
     event BidResponseSubmitted(uint256 indexed jobId, uint256 indexed bidId, string responseURI);
     event DeliverySubmitted(uint256 indexed jobId, uint256 indexed bidId, bytes32 proofHash);
     event JobApproved(uint256 indexed jobId, uint256 indexed bidId);
@@ -138,7 +150,20 @@ contract OrderBook is Ownable {
             createdAt: block.timestamp
         });
         jobRegistry.upsertJob(meta, JobTypes.JobStatus.OPEN);
-        emit JobPosted(jobId, msg.sender);
+        openJobIds.push(jobId);
+        openJobSlot[jobId] = openJobIds.length;
+        _emitJobPosted(meta);
+    }
+
+    function _emitJobPosted(JobTypes.JobMetadata memory meta) private {
+        emit JobPosted(
+            meta.id,
+            meta.poster,
+            keccak256(abi.encode(meta.tags)),
+            meta.deadline,
+            meta.metadataURI,
+            meta.description
+        );
     }
 
     function placeBid(
@@ -204,11 +229,12 @@ contract OrderBook is Ownable {
         bid.responseURI = responseURI;  // Store poster's answers
         job.status = JobTypes.JobStatus.IN_PROGRESS;
         job.acceptedBidId = bidId;
+        _removeOpenJob(jobId);
 
         jobRegistry.updateJobStatus(jobId, JobTypes.JobStatus.IN_PROGRESS);
         escrow.lockFunds(jobId, msg.sender, bid.bidder, bid.price);
 
-        emit BidAccepted(jobId, bidId, msg.sender, bid.bidder);
+        emit BidAccepted(jobId, bidId, msg.sender, bid.bidder, bid.price);
         if (bytes(responseURI).length > 0) {
             emit BidResponseSubmitted(jobId, bidId, responseURI);
         }
@@ -256,11 +282,81 @@ contract OrderBook is Ownable {
 
     function getJob(uint256 jobId) external view returns (JobState memory job, Bid[] memory jobBids) {
         job = jobStates[jobId];
+        (jobBids, ) = _bidsPage(jobId, 0, type(uint256).max);
+    }
+
+    /// @notice getJob for many jobs in one call; unknown ids yield an empty state and no bids
+    function getJobs(uint256[] calldata jobIds)
+        external
+        view
+        returns (JobState[] memory jobs, Bid[][] memory jobBids)
+    {
+        jobs = new JobState[](jobIds.length);
+        jobBids = new Bid[][](jobIds.length);
+        for (uint256 i = 0; i < jobIds.length; i++) {
+            jobs[i] = jobStates[jobIds[i]];
+            (jobBids[i], ) = _bidsPage(jobIds[i], 0, type(uint256).max);
+        }
+    }
+
+    /// @notice A page of OPEN jobs. Accepting a bid moves the last open job into the
+    /// accepted job's slot, so a listing that spans an acceptance may skip or repeat one
+    function getOpenJobs(uint256 offset, uint256 limit)
+        external
+        view
+        returns (uint256[] memory jobIds, JobState[] memory jobs, uint256 total)
+    {
+        total = openJobIds.length;
+        uint256 count = _pageLength(total, offset, limit);
+        jobIds = new uint256[](count);
+        jobs = new JobState[](count);
+        for (uint256 i = 0; i < count; i++) {
+            jobIds[i] = openJobIds[offset + i];
+            jobs[i] = jobStates[jobIds[i]];
+        }
+    }
+
+    /// @notice A page of a job's bids in placement order
+    function getBidsPage(uint256 jobId, uint256 offset, uint256 limit)
+        external
+        view
+        returns (Bid[] memory page, uint256 total)
+    {
+        return _bidsPage(jobId, offset, limit);
+    }
+
+    function _bidsPage(uint256 jobId, uint256 offset, uint256 limit)
+        private
+        view
+        returns (Bid[] memory page, uint256 total)
+    {
         uint256[] storage bidIds = jobBidIds[jobId];
-        jobBids = new Bid[](bidIds.length);
-        for (uint256 i = 0; i < bidIds.length; i++) {
-            jobBids[i] = bidsById[bidIds[i]];
+        total = bidIds.length;
+        uint256 count = _pageLength(total, offset, limit);
+        page = new Bid[](count);
+        for (uint256 i = 0; i < count; i++) {
+            page[i] = bidsById[bidIds[offset + i]];
+        }
+    }
+
+    function _pageLength(uint256 total, uint256 offset, uint256 limit) private pure returns (uint256) {
+        if (offset >= total) {
+            return 0;
+        }
+        uint256 remaining = total - offset;
+        return limit < remaining ? limit : remaining;
+    }
+
+    function _removeOpenJob(uint256 jobId) private {
+        uint256 slot = openJobSlot[jobId];
+        if (slot == 0) {
+            return;
         }
+        uint256 lastId = openJobIds[openJobIds.length - 1];
+        openJobIds[slot - 1] = lastId;
+        openJobSlot[lastId] = slot;
+        openJobIds.pop();
+        delete openJobSlot[jobId];
     }
 
     function raiseDispute(uint256 jobId, string calldata reason, string calldata evidence) external returns (uint256 disputeId) {
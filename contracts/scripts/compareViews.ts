@@ -0,0 +1,84 @@
+import { ethers } from "hardhat";
+
+/**
+ * Compare reading market state one job at a time (getJob in a loop) against the
+ * batch views (getJobs, getOpenJobs). Reports the eth_call gas estimate and the
+ * wall-clock latency of each approach.
+ *
+ * Usage:
+ * npx hardhat run scripts/compareViews.ts                         # in-process Hardhat network
+ * npx hardhat run scripts/compareViews.ts --network neoxTestnet   # real RPC latency
+ *
+ * Set COMPARE_JOBS to change the number of jobs (default 50).
+ */
+
+async function timed<T>(fn: () => Promise<T>): Promise<[T, number]> {
+  const start = performance.now();
+  const result = await fn();
+  return [result, performance.now() - start];
+}
+
+async function main() {
+  const jobCount = Number(process.env.COMPARE_JOBS || "50");
+  const [deployer, poster, agent] = await ethers.getSigners();
+
+  console.log(`📊 OrderBook view comparison (${jobCount} jobs, 1 bid each)\n`);
+
+  const jobRegistry = await ethers.deployContract("JobRegistry", [deployer.address]);
+  const agentRegistry = await ethers.deployContract("AgentRegistry", [deployer.address]);
+  const orderBook = await ethers.deployContract("OrderBook", [deployer.address, await jobRegistry.getAddress()]);
+  await (await jobRegistry.setOrderBook(orderBook.target)).wait();
+  await (await orderBook.setAgentRegistry(agentRegistry.target)).wait();
+  await (await agentRegistry.connect(agent).registerAgent("Bench Agent", "ipfs://agent", ["bench"])).wait();
+
+  const jobIds: bigint[] = [];
+  for (let i = 0; i < jobCount; i++) {
+    const jobId = await orderBook.connect(poster).postJob.staticCall(`Job ${i}`, `ipfs://job-${i}`, ["bench"], 0);
+    await (await orderBook.connect(poster).postJob(`Job ${i}`, `ipfs://job-${i}`, ["bench"], 0)).wait();
+    await (await orderBook.connect(agent).placeBid(jobId, ethers.parseUnits("1", 6), 3600, "ipfs://bid")).wait();
+    jobIds.push(jobId);
+  }
+
+  // Gas: each eth_call pays the 21k intrinsic cost plus calldata and ABI encoding
+  let loopGas = 0n;
+  for (const id of jobIds) {
+    loopGas += await orderBook.getJob.estimateGas(id);
+  }
+  const batchGas = await orderBook.getJobs.estimateGas(jobIds);
+  const openGas = await orderBook.getOpenJobs.estimateGas(0, jobCount);
+
+  // Latency: one round trip per job vs one round trip total
+  const [, loopMs] = await timed(async () => {
+    for (const id of jobIds) {
+      await orderBook.getJob(id);
+    }
+  });
+  const [batched, batchMs] = await timed(() => orderBook.getJobs(jobIds));
+  const [open, openMs] = await timed(() => orderBook.getOpenJobs(0, jobCount));
+
+  if (batched[0].length !== jobCount || open[0].length !== jobCount) {
+    throw new Error("Batch views returned an unexpected number of jobs");
+  }
+
+  const rows = [
+    { view: "getJob x N", calls: jobCount, gas: loopGas, ms: loopMs },
+    { view: "getJobs(ids)", calls: 1, gas: batchGas, ms: batchMs },
+    { view: "getOpenJobs(0, N)", calls: 1, gas: openGas, ms: openMs },
+  ];
+  console.table(
+    rows.map((r) => ({
+      view: r.view,
+      calls: r.calls,
+      gas: r.gas.toString(),
+      "gas vs loop": `${((Number(r.gas) / Number(loopGas)) * 100).toFixed(1)}%`,
+      "latency (ms)": r.ms.toFixed(1),
+    }))
+  );
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error(error);
+    process.exit(1);
+  });
@@ -34,7 +34,12 @@ describe("A2A marketplace flow", () => {
     const jobId = await orderBook
       .connect(poster)
       .postJob.staticCall("Find restaurants", "ipfs://job", ["restaurant"], 0);
-    await orderBook.connect(poster).postJob("Find restaurants", "ipfs://job", ["restaurant"], 0);
+    const tagsHash = ethers.keccak256(
+      ethers.AbiCoder.defaultAbiCoder().encode(["string[]"], [["restaurant"]])
+    );
+    await expect(orderBook.connect(poster).postJob("Find restaurants", "ipfs://job", ["restaurant"], 0))
+      .to.emit(orderBook, "JobPosted")
+      .withArgs(jobId, poster.address, tagsHash, 0, "ipfs://job", "Find restaurants");
 
     const bidId = await orderBook
       .connect(agent)
@@ -42,7 +47,9 @@ describe("A2A marketplace flow", () => {
     await orderBook.connect(agent).placeBid(jobId, price, 3600, "ipfs://bid-metadata");
 
     await usdc.connect(poster).approve(escrow.target, price);
-    await orderBook.connect(poster).acceptBid(jobId, bidId, "ipfs://response-answers");
+    await expect(orderBook.connect(poster).acceptBid(jobId, bidId, "ipfs://response-answers"))
+      .to.emit(orderBook, "BidAccepted")
+      .withArgs(jobId, bidId, poster.address, agent.address, price);
 
     const escrowBalanceAfterLock = await usdc.balanceOf(escrow.target);
     expect(escrowBalanceAfterLock).to.equal(price);
@@ -64,3 +71,105 @@ describe("A2A marketplace flow", () => {
     expect(jobData[0].status).to.equal(3); // COMPLETED
   });
 });
+
+describe("OrderBook batch views", () => {
+  async function deployMarket() {
+    const [deployer, poster, agent, other, third] = await ethers.getSigners();
+
+    const usdc = await ethers.deployContract("MockUSDC");
+    const agentRegistry = await ethers.deployContract("AgentRegistry", [deployer.address]);
+    const jobRegistry = await ethers.deployContract("JobRegistry", [deployer.address]);
+    const reputation = await ethers.deployContract("ReputationToken", [deployer.address]);
+    const escrow = await ethers.deployContract("Escrow", [deployer.address, await usdc.getAddress(), deployer.address]);
+    const orderBook = await ethers.deployContract("OrderBook", [deployer.address, await jobRegistry.getAddress()]);
+
+    await Promise.all([
+      jobRegistry.setOrderBook(orderBook.target),
+      escrow.setOrderBook(orderBook.target),
+      escrow.setReputation(reputation.target),
+      reputation.setEscrow(escrow.target),
+      reputation.setAgentRegistry(agentRegistry.target),
+      agentRegistry.setReputationOracle(reputation.target),
+      orderBook.setEscrow(escrow.target),
+      orderBook.setReputationToken(reputation.target),
+      orderBook.setAgentRegistry(agentRegistry.target)
+    ]);
+
+    await agentRegistry.connect(agent).registerAgent("Research Agent", "ipfs://agent", ["research"]);
+    await agentRegistry.connect(other).registerAgent("Other Agent", "ipfs://other", ["research"]);
+    await agentRegistry.connect(third).registerAgent("Third Agent", "ipfs://third", ["research"]);
+
+    const jobIds: bigint[] = [];
+    for (let i = 0; i < 3; i++) {
+      const jobId = await orderBook
+        .connect(poster)
+        .postJob.staticCall(`Job ${i}`, `ipfs://job-${i}`, ["restaurant"], 0);
+      await orderBook.connect(poster).postJob(`Job ${i}`, `ipfs://job-${i}`, ["restaurant"], 0);
+      jobIds.push(jobId);
+    }
+
+    return { poster, agent, other, third, usdc, escrow, orderBook, jobIds };
+  }
+
+  it("returns the same data from getJobs as from getJob", async () => {
+    const { agent, orderBook, jobIds } = await deployMarket();
+    const price = ethers.parseUnits("10", 6);
+    await orderBook.connect(agent).placeBid(jobIds[1], price, 3600, "ipfs://bid");
+
+    const [jobs, jobBids] = await orderBook.getJobs([...jobIds, 999n]);
+    expect(jobs.length).to.equal(4);
+    for (let i = 0; i < jobIds.length; i++) {
+      const [job, bids] = await orderBook.getJob(jobIds[i]);
+      expect(jobs[i].poster).to.equal(job.poster);
+      expect(jobs[i].status).to.equal(job.status);
+      expect(jobBids[i].length).to.equal(bids.length);
+    }
+    expect(jobBids[1][0].price).to.equal(price);
+    expect(jobs[3].poster).to.equal(ethers.ZeroAddress);
+    expect(jobBids[3].length).to.equal(0);
+  });
+
+  it("pages open jobs and drops accepted ones", async () => {
+    const { poster, agent, usdc, escrow, orderBook, jobIds } = await deployMarket();
+
+    let [ids, jobs, total] = await orderBook.getOpenJobs(0, 2);
+    expect(total).to.equal(3n);
+    expect(ids).to.deep.equal(jobIds.slice(0, 2));
+    expect(jobs[0].status).to.equal(0); // OPEN
+
+    [ids, , total] = await orderBook.getOpenJobs(2, 10);
+    expect(ids).to.deep.equal([jobIds[2]]);
+    [ids] = await orderBook.getOpenJobs(5, 10);
+    expect(ids.length).to.equal(0);
+
+    const price = ethers.parseUnits("10", 6);
+    const bidId = await orderBook.connect(agent).placeBid.staticCall(jobIds[0], price, 3600, "ipfs://bid");
+    await orderBook.connect(agent).placeBid(jobIds[0], price, 3600, "ipfs://bid");
+    await usdc.mint(poster.address, price);
+    await usdc.connect(poster).approve(escrow.target, price);
+    await orderBook.connect(poster).acceptBid(jobIds[0], bidId, "ipfs://answers");
+
+    [ids, , total] = await orderBook.getOpenJobs(0, 10);
+    expect(total).to.equal(2n);
+    expect([...ids].sort()).to.deep.equal([jobIds[1], jobIds[2]].sort());
+  });
+
+  it("pages a job's bids in placement order", async () => {
+    const { agent, other, third, orderBook, jobIds } = await deployMarket();
+    const prices = [30n, 20n, 10n].map((p) => ethers.parseUnits(p.toString(), 6));
+    await orderBook.connect(agent).placeBid(jobIds[0], prices[0], 3600, "ipfs://bid-0");
+    await orderBook.connect(other).placeBid(jobIds[0], prices[1], 3600, "ipfs://bid-1");
+    await orderBook.connect(third).placeBid(jobIds[0], prices[2], 3600, "ipfs://bid-2");
+
+    let [page, total] = await orderBook.getBidsPage(jobIds[0], 0, 2);
+    expect(total).to.equal(3n);
+    expect(page.map((b) => b.price)).to.deep.equal(prices.slice(0, 2));
+
+    [page] = await orderBook.getBidsPage(jobIds[0], 2, 2);
+    expect(page.map((b) => b.price)).to.deep.equal([prices[2]]);
+
+    [page, total] = await orderBook.getBidsPage(jobIds[1], 0, 10);
+    expect(total).to.equal(0n);
+    expect(page.length).to.equal(0);
+  });
+});
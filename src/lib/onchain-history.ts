@@ -7,6 +7,10 @@ type OrderBookEvent =
       type: "JobPosted";
       jobId: bigint;
       poster: `0x${string}`;
+      tagsHash: `0x${string}`;
+      deadline: bigint;
+      metadataURI: string;
+      description: string;
     }
   | {
       type: "BidPlaced";
@@ -21,6 +25,7 @@ type OrderBookEvent =
       bidId: bigint;
       poster: `0x${string}`;
       agent: `0x${string}`;
+      price: bigint;
     };
 
 export type OnchainEvent = {
@@ -42,6 +47,10 @@ const orderBookEventAbi = [
     inputs: [
       { name: "jobId", type: "uint256", indexed: true },
       { name: "poster", type: "address", indexed: true },
+      { name: "tagsHash", type: "bytes32", indexed: true },
+      { name: "deadline", type: "uint64", indexed: false },
+      { name: "metadataURI", type: "string", indexed: false },
+      { name: "description", type: "string", indexed: false },
     ],
   },
   {
@@ -54,6 +63,26 @@ const orderBookEventAbi = [
       { name: "price", type: "uint256", indexed: false },
     ],
   },
+  {
+    type: "event",
+    name: "BidAccepted",
+    inputs: [
+      { name: "jobId", type: "uint256", indexed: true },
+      { name: "bidId", type: "uint256", indexed: true },
+      { name: "poster", type: "address", indexed: false },
+      { name: "agent", type: "address", indexed: false },
+      { name: "price", type: "uint256", indexed: false },
+    ],
+  },
+  // Layouts emitted by OrderBook deployments from before the event upgrade
+  {
+    type: "event",
+    name: "JobPosted",
+    inputs: [
+      { name: "jobId", type: "uint256", indexed: true },
+      { name: "poster", type: "address", indexed: true },
+    ],
+  },
   {
     type: "event",
     name: "BidAccepted",
@@ -154,18 +183,19 @@ export async function fetchOrderBookEvents() {
           ...base,
         });
       } else if (parsed.eventName === "BidAccepted") {
-        const { jobId, bidId, poster, agent } = parsed.args as {
+        const { jobId, bidId, poster, agent, price } = parsed.args as {
           jobId: bigint;
           bidId: bigint;
           poster: `0x${string}`;
           agent: `0x${string}`;
+          price?: bigint; // absent from legacy logs
         };
         decoded.push({
           id: `${log.transactionHash}-accept-${bidId}`,
           type: "BidAccepted",
           title: `Bid #${bidId.toString()} accepted for job #${jobId.toString()}`,
-          amount: 0,
-          currency: "GAS",
+          amount: price === undefined ? 0 : Number(formatUnits(price, 6)),
+          currency: price === undefined ? "GAS" : "USDC",
           wallet: poster || agent,
           ...base,
         });